@@ -0,0 +1,62 @@
+"""
+Local HTTP stand-in for the two GitHub endpoints used by a remote update:
+
+    GET /api/repos/<owner>/<repo>/releases/latest            -> {"tag_name": ...}
+    GET /web/<owner>/<repo>/archive/refs/tags/<tag>.zip      -> the release zip
+
+Point the application at it with TROWMOD_GITHUB_API_URL and TROWMOD_GITHUB_URL
+(see config.py) before importing rotwk_trowmod_switcher.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHUNK_SIZE = 256 * 1024
+
+
+def _make_handler(repo_full_name: str, tag: str, zip_path: str):
+    latest_path = f"/api/repos/{repo_full_name}/releases/latest"
+    zip_url_path = f"/web/{repo_full_name}/archive/refs/tags/{tag}.zip"
+
+    class GitHubStubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == latest_path:
+                body = json.dumps({"tag_name": tag, "body": "Synthetic release", "assets": []}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == zip_url_path:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(os.path.getsize(zip_path)))
+                self.end_headers()
+                with open(zip_path, "rb") as f:
+                    while chunk := f.read(CHUNK_SIZE):
+                        self.wfile.write(chunk)
+            else:
+                self.send_error(404)
+
+        def log_message(self, format, *args):
+            # Keep the benchmark output clean
+            pass
+
+    return GitHubStubHandler
+
+
+@contextmanager
+def serve_github_stub(repo_full_name: str, tag: str, zip_path: str):
+    """Serves the release on a free local port. Yields (api_url, web_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(repo_full_name, tag, zip_path))
+    thread = threading.Thread(target=server.serve_forever, name="github-stub", daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield f"{base_url}/api", f"{base_url}/web"
+    finally:
+        server.shutdown()
+        server.server_close()
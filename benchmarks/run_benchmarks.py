@@ -0,0 +1,329 @@
+"""
+Benchmarks of the build pipeline on synthetic TROWMod trees.
+
+Usage (from the repository root, with the package installed: pip install -e .):
+
+    python -m benchmarks.run_benchmarks --preset small --output bench-before.json
+    python -m benchmarks.run_benchmarks --preset small --compare bench-before.json
+
+Benchmarks:
+    archiver       create_big_archives on the synthetic tree (AssetCacheBuilder.exe is only run on Windows)
+    str_checker    duplicate key check of lang/data/lotr.str
+    zip_extract    extraction of the release zip
+    remote_update  full update_rotwk_with_latest_mod against a local GitHub stand-in
+    reproducible   builds the archives from the tree and from a copy created in shuffled order, checks they are byte-identical
+    ini_scan       summaries of data/ini with scripts/sage_ini/scanner.py, for 1, 2, 4... worker processes, and with
+                   the hero byte prefilters (--ini-tree scans a real TROWMod data/ini checkout instead of the synthetic one)
+
+Every run writes comparable JSON (median/min seconds and throughput); --compare exits
+with status 1 when a benchmark is slower than the baseline by more than --threshold.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+from benchmarks.github_stub import serve_github_stub
+from benchmarks.synthetic_tree import TreeSpec, generate_mod_tree, make_release_zip, spec_as_dict
+
+PRESETS = {
+    "tiny": TreeSpec(ini_count=50, texture_count=20, texture_kb=4, w3d_count=10, string_count=500, script_count=5),
+    "small": TreeSpec(ini_count=300, texture_count=150, texture_kb=16, w3d_count=60, string_count=3000, script_count=10),
+    "medium": TreeSpec(),
+    "large": TreeSpec(ini_count=8000, texture_count=4000, texture_kb=128, w3d_count=2000, string_count=80000, script_count=200),
+}
+BENCHMARKS = ["archiver", "str_checker", "zip_extract", "remote_update", "reproducible", "ini_scan"]
+
+BENCH_REPO = "bench/TROWMod"
+BENCH_TAG = "0.0.0-bench"
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def tree_size(root: str) -> tuple[int, int]:
+    files = 0
+    size = 0
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            files += 1
+            size += os.path.getsize(os.path.join(dir_path, file_name))
+    return files, size
+
+
+def new_game_dir(work_dir: str) -> str:
+    game_dir = tempfile.mkdtemp(prefix="game_", dir=work_dir)
+    os.makedirs(os.path.join(game_dir, "lang"))
+    return game_dir
+
+
+def measure(func: Callable[[], dict | None], repeat: int) -> dict:
+    """Runs func `repeat` times. func returns extra fields for the result (from its last run)."""
+    durations = []
+    extra = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extra = func() or {}
+        durations.append(time.perf_counter() - start)
+    return {"runs_seconds": [round(d, 4) for d in durations], "median_seconds": round(statistics.median(durations), 4), "min_seconds": round(min(durations), 4), **extra}
+
+
+def add_throughput(result: dict, files: int, size: int) -> dict:
+    median = result["median_seconds"] or float("nan")
+    result.update(
+        {
+            "files": files,
+            "bytes": size,
+            "files_per_second": round(files / median, 1),
+            "mb_per_second": round(size / median / 1_048_576, 2),
+        }
+    )
+    return result
+
+
+def archive_digests(game_dir: str) -> dict[str, str]:
+    """SHA-256 of every .big archive installed in a game directory."""
+    digests = {}
+    for dir_path, _, file_names in os.walk(game_dir):
+        for file_name in file_names:
+            if file_name.lower().endswith(".big"):
+                path = os.path.join(dir_path, file_name)
+                with open(path, "rb") as f:
+                    digests[os.path.relpath(path, game_dir)] = hashlib.file_digest(f, "sha256").hexdigest()
+    return digests
+
+
+def shuffled_copy(source_dir: str, destination_dir: str, seed: int = 0) -> None:
+    """Copies a tree creating directories and files in a shuffled order, so their enumeration order differs."""
+    file_paths = [os.path.relpath(os.path.join(dir_path, file_name), source_dir) for dir_path, _, file_names in os.walk(source_dir) for file_name in file_names]
+    random.Random(seed).shuffle(file_paths)
+    for relative_path in file_paths:
+        destination = os.path.join(destination_dir, relative_path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(os.path.join(source_dir, relative_path), destination)
+
+
+def worker_counts() -> list[int]:
+    """1, 2, 4... up to the number of CPUs, which is always included."""
+    cpu_count = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpu_count:
+        counts.append(counts[-1] * 2)
+    return counts + [cpu_count] if cpu_count > 1 else counts
+
+
+def scan_scaling(ini_dir: str, repeat: int) -> dict:
+    """Cold scans (no cache) of ini_dir per worker count; the summaries must not depend on it."""
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    from sage_ini.heroes import HERO_BYTES, RESPAWN_RULES_BYTES
+    from sage_ini.parser import iter_ini_files
+    from sage_ini.scanner import scan_ini_files
+
+    paths = iter_ini_files(ini_dir)
+    size = sum(os.path.getsize(path) for path in paths)
+    scaling = {}
+    reference = None
+    identical = True
+    for workers in worker_counts():
+        summaries = {}
+
+        def scan() -> None:
+            summaries.update(scan_ini_files(paths, workers=workers))
+
+        scaling[workers] = add_throughput(measure(scan, repeat), len(paths), size)
+        current = [summary.as_dict() for summary in summaries.values()]
+        reference = reference if reference is not None else current
+        identical = identical and current == reference
+
+    # What the hero scripts scan: only the files with HERO and RespawnRules are decoded
+    heroes = measure(lambda: {"parsed_files": len(scan_ini_files(paths, workers=1, prefilters=(HERO_BYTES, RESPAWN_RULES_BYTES)))}, repeat)
+
+    single = scaling[1]["median_seconds"]
+    for result in scaling.values():
+        result["speedup"] = round(single / result["median_seconds"], 2) if result["median_seconds"] else None
+    # The fastest configuration is the one compared against baselines
+    best = min(scaling.values(), key=lambda result: result["median_seconds"])
+    return {**best, "workers": {str(workers): result for workers, result in scaling.items()}, "identical": identical, "hero_prefilter": heroes}
+
+
+def run_suite(selected: list[str], tree_dir: str, zip_path: str, work_dir: str, repeat: int, ini_tree: str | None = None) -> dict:
+    # Imported here: the environment (APPDATA and GitHub URLs) must be set before config.py is loaded
+    from rotwk_trowmod_switcher.core.big_archiver.archiver import create_big_archives
+    from rotwk_trowmod_switcher.core.big_archiver.utils import check_duplicate_keys_in_str_file
+    from rotwk_trowmod_switcher.core.jobs import ProgressReporter
+    from rotwk_trowmod_switcher.core.metrics import BuildMetrics
+    from rotwk_trowmod_switcher.core.mod_retriever import extract_zip, update_rotwk_with_latest_mod
+
+    bench_logger = logging.getLogger("benchmarks")
+    tree_files, tree_bytes = tree_size(tree_dir)
+    results = {}
+
+    def build_once(source_dir: str = tree_dir) -> dict:
+        game_dir = new_game_dir(work_dir)
+        metrics = BuildMetrics("bench_build")
+        if not create_big_archives(source_dir, game_dir, bench_logger, "BENCH", metrics=metrics):
+            raise RuntimeError("create_big_archives failed, see the log above")
+        digests = archive_digests(game_dir)
+        shutil.rmtree(game_dir)
+        return {"stages": metrics.report()["stages"], "digests": digests}
+
+    if "archiver" in selected:
+        result = measure(build_once, repeat)
+        result.pop("digests")
+        results["archiver"] = add_throughput(result, tree_files, tree_bytes)
+
+    if "str_checker" in selected:
+        str_path = os.path.join(tree_dir, "lang", "data", "lotr.str")
+
+        def check_strings() -> None:
+            if not check_duplicate_keys_in_str_file(str_path):
+                raise RuntimeError("Duplicate keys reported in the synthetic lotr.str")
+
+        results["str_checker"] = add_throughput(measure(check_strings, repeat), 1, os.path.getsize(str_path))
+
+    if "zip_extract" in selected:
+
+        def extract() -> None:
+            destination = tempfile.mkdtemp(prefix="extract_", dir=work_dir)
+            extract_zip(zip_path, destination, ProgressReporter())
+            shutil.rmtree(destination)
+
+        results["zip_extract"] = add_throughput(measure(extract, repeat), tree_files, tree_bytes)
+        results["zip_extract"]["zip_bytes"] = os.path.getsize(zip_path)
+
+    if "remote_update" in selected:
+
+        def remote_update() -> dict:
+            game_dir = new_game_dir(work_dir)
+            metrics = BuildMetrics("bench_remote_update")
+            if not update_rotwk_with_latest_mod(BENCH_REPO, game_dir, metrics=metrics):
+                raise RuntimeError("update_rotwk_with_latest_mod failed, see the log above")
+            shutil.rmtree(game_dir)
+            return {"stages": metrics.report()["stages"]}
+
+        results["remote_update"] = add_throughput(measure(remote_update, repeat), tree_files, os.path.getsize(zip_path))
+
+    if "reproducible" in selected:
+        shuffled_dir = os.path.join(work_dir, "tree_shuffled")
+        shuffled_copy(tree_dir, shuffled_dir)
+        first = build_once()["digests"]
+        second = build_once(shuffled_dir)["digests"]
+        shutil.rmtree(shuffled_dir)
+        results["reproducible"] = {"identical": first == second, "archives": first}
+
+    if "ini_scan" in selected:
+        results["ini_scan"] = scan_scaling(ini_tree or os.path.join(tree_dir, "data", "ini"), repeat)
+
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns a line per benchmark slower than the baseline by more than threshold."""
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name, {})
+        if "median_seconds" not in result or not old.get("median_seconds"):
+            continue
+        ratio = result["median_seconds"] / old["median_seconds"]
+        line = f"{name}: {old['median_seconds']:.3f}s -> {result['median_seconds']:.3f}s (x{ratio:.2f})"
+        print(("REGRESSION " if ratio > threshold else "") + line)
+        if ratio > threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of the TROWMod build pipeline on synthetic trees.")
+    parser.add_argument("--preset", choices=PRESETS, default="small", help="Size of the synthetic tree.")
+    parser.add_argument("--ini-count", type=int, help="Override the number of INI files.")
+    parser.add_argument("--texture-count", type=int, help="Override the number of textures.")
+    parser.add_argument("--string-count", type=int, help="Override the number of strings in lotr.str.")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS, help="Benchmarks to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark, the median is reported.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--compare", help="Baseline JSON to compare with.")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Slowdown ratio reported as a regression.")
+    parser.add_argument("--keep", action="store_true", help="Keep the working directory.")
+    parser.add_argument("--ini-tree", help="data/ini directory of a TROWMod checkout, scanned by the ini_scan benchmark.")
+    args = parser.parse_args()
+
+    spec = PRESETS[args.preset]
+    for field_name in ("ini_count", "texture_count", "string_count"):
+        if getattr(args, field_name) is not None:
+            setattr(spec, field_name, getattr(args, field_name))
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s - [%(name)s] %(message)s")
+    work_dir = tempfile.mkdtemp(prefix="trowmod_bench_")
+    # Keep logs, timing reports and config of the benchmarked code out of the user profile
+    os.environ["LOCALAPPDATA"] = os.path.join(work_dir, "appdata")
+
+    try:
+        tree_dir = os.path.join(work_dir, "tree")
+        start = time.perf_counter()
+        stats = generate_mod_tree(tree_dir, spec)
+        zip_path = os.path.join(work_dir, "release.zip")
+        make_release_zip(tree_dir, zip_path, f"TROWMod-{BENCH_TAG}")
+        print(f"Generated {stats.files} files ({stats.bytes / 1_048_576:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+        with serve_github_stub(BENCH_REPO, BENCH_TAG, zip_path) as (api_url, web_url):
+            os.environ["TROWMOD_GITHUB_API_URL"] = api_url
+            os.environ["TROWMOD_GITHUB_URL"] = web_url
+            results = run_suite(args.only, tree_dir, zip_path, work_dir, args.repeat, args.ini_tree)
+    finally:
+        if args.keep:
+            print(f"Working directory kept: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "preset": args.preset,
+        "tree": spec_as_dict(spec),
+        "results": results,
+    }
+
+    for name, result in results.items():
+        if "median_seconds" in result:
+            print(f"{name:<14} {result['median_seconds']:>8.3f}s  {result['files_per_second']:>10.1f} files/s  {result['mb_per_second']:>8.2f} MB/s")
+            for workers, scaled in result.get("workers", {}).items():
+                print(f"  {workers:>3} workers {scaled['median_seconds']:>8.3f}s  {scaled['files_per_second']:>10.1f} files/s  x{scaled['speedup']}")
+        else:
+            print(f"{name:<14} {json.dumps({k: v for k, v in result.items() if k != 'archives'})}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Generates synthetic TROWMod source trees with the same layout as the real mod:
+
+    data/ini/gamedata.ini, data/ini/objects/<faction>/*.ini
+    arts/textures/*.dds, arts/textures/*.tga, arts/w3d/*.w3d, arts/asset.dat
+    lang/data/lotr.str
+    scripts/*.scb
+
+Contents are deterministic for a given seed, so runs on different commits are comparable.
+"""
+
+import os
+import random
+import struct
+import zipfile
+from dataclasses import asdict, dataclass
+
+FACTIONS = ["gondor", "rohan", "isengard", "mordor", "elves", "dwarves", "men", "goblins", "angmar"]
+
+DDS_HEADER_SIZE = 128
+TGA_HEADER_SIZE = 18
+
+
+@dataclass
+class TreeSpec:
+    """Size of a synthetic tree."""
+
+    ini_count: int = 2000
+    texture_count: int = 1000
+    texture_kb: int = 64
+    w3d_count: int = 500
+    string_count: int = 20000
+    script_count: int = 50
+    seed: int = 1
+
+
+@dataclass
+class TreeStats:
+    files: int = 0
+    bytes: int = 0
+
+
+def dds_header(width: int, height: int, fourcc: bytes = b"DXT5") -> bytes:
+    """Minimal DDS header ('DDS ' + DDS_HEADER) for a compressed texture with one mip level."""
+    pixel_format = struct.pack("<II4s5I", 32, 0x4, fourcc, 0, 0, 0, 0, 0)
+    header = struct.pack("<7I44x", 124, 0x81007, height, width, max(1, width * height), 0, 1)
+    caps = struct.pack("<4I4x", 0x1000, 0, 0, 0)
+    return b"DDS " + header + pixel_format + caps
+
+
+def tga_header(width: int, height: int) -> bytes:
+    """Uncompressed 32-bit true-colour TGA header."""
+    return struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, width, height, 32, 8)
+
+
+def _write(path: str, data: bytes, stats: TreeStats) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    stats.files += 1
+    stats.bytes += len(data)
+
+
+def _ini_object(rng: random.Random, name: str, faction: str) -> str:
+    is_hero = rng.random() < 0.1
+    lines = [
+        f"; Synthetic object for {faction}",
+        f"Object {name}",
+        f"  DisplayName = OBJECT:{name}",
+        f"  Side = {faction.capitalize()}",
+        f"  BuildCost = {'HERO_BUILDCOST_' + name.upper() if is_hero else rng.randint(50, 1500)}",
+        f"  BuildTime = {'HERO_BUILDTIME_' + name.upper() if is_hero else rng.randint(5, 60)}",
+        f"  CommandPoints = {rng.randint(0, 40)}",
+        f"  KindOf = PRELOAD SELECTABLE CAN_ATTACK {'HERO' if is_hero else 'INFANTRY'}",
+    ]
+    if is_hero:
+        lines += ["  RespawnRules", "    AutoSpawn = No", f"    Cost = {rng.randint(500, 3000)}", "  End"]
+    for module in range(rng.randint(3, 12)):
+        lines += [
+            f"  Behavior = AIUpdateInterface ModuleTag_{module:02d}",
+            f"    AutoAcquireEnemiesWhenIdle = {rng.choice(['Yes', 'No'])}",
+            f"    MoodAttackCheckRate = {rng.randint(100, 1000)}",
+            "  End",
+        ]
+    lines += ["End", ""]
+    return "\n".join(lines)
+
+
+def generate_mod_tree(root: str, spec: TreeSpec) -> TreeStats:
+    """Writes a synthetic mod tree under root and returns the number of files and bytes written."""
+    rng = random.Random(spec.seed)
+    stats = TreeStats()
+
+    # --- data: INIs and the defines they use ---
+    defines = []
+    for index in range(spec.ini_count):
+        faction = FACTIONS[index % len(FACTIONS)]
+        name = f"{faction.capitalize()}Unit{index:05d}"
+        text = _ini_object(rng, name, faction)
+        if "HERO_BUILDCOST_" in text:
+            defines += [f"#define HERO_BUILDCOST_{name.upper()} {rng.randint(800, 4000)}", f"#define HERO_BUILDTIME_{name.upper()} {rng.randint(20, 90)}"]
+        _write(os.path.join(root, "data", "ini", "objects", faction, f"{name.lower()}.ini"), text.encode("cp1252"), stats)
+    _write(os.path.join(root, "data", "ini", "gamedata.ini"), ("\n".join(defines) + "\n").encode("cp1252"), stats)
+
+    # --- arts: textures, models and the asset cache ---
+    texture_payload = spec.texture_kb * 1024
+    for index in range(spec.texture_count):
+        size = 2 ** rng.randint(6, 10)
+        if index % 5 == 4:
+            data = tga_header(size, size) + rng.randbytes(texture_payload)
+            extension = "tga"
+        else:
+            data = dds_header(size, size, rng.choice([b"DXT1", b"DXT5"])) + rng.randbytes(texture_payload)
+            extension = "dds"
+        _write(os.path.join(root, "arts", "textures", f"tex_{index:05d}.{extension}"), data, stats)
+    for index in range(spec.w3d_count):
+        _write(os.path.join(root, "arts", "w3d", f"model_{index:05d}.w3d"), rng.randbytes(rng.randint(2, 32) * 1024), stats)
+    # Placeholder: the real asset.dat is produced by AssetCacheBuilder.exe
+    _write(os.path.join(root, "arts", "asset.dat"), rng.randbytes(spec.texture_count * 32), stats)
+
+    # --- lang: one big .str file without duplicate keys ---
+    entries = [f'OBJECT:Synthetic{index:06d}\n"Testo sintetico numero {index} - perché è così"\nEND\n' for index in range(spec.string_count)]
+    _write(os.path.join(root, "lang", "data", "lotr.str"), "\n".join(entries).encode("cp1252"), stats)
+
+    # --- scripts ---
+    for index in range(spec.script_count):
+        _write(os.path.join(root, "scripts", f"map_{index:03d}.scb"), rng.randbytes(rng.randint(8, 128) * 1024), stats)
+
+    return stats
+
+
+def make_release_zip(tree_root: str, zip_path: str, top_folder: str) -> int:
+    """
+    Zips a tree the way GitHub serves a tag archive: everything under a single
+    top-level folder (e.g. 'TROWMod-1.0.0'). Returns the zip size in bytes.
+    """
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+        for dir_path, _, file_names in os.walk(tree_root):
+            for file_name in sorted(file_names):
+                file_path = os.path.join(dir_path, file_name)
+                arcname = os.path.join(top_folder, os.path.relpath(file_path, tree_root))
+                zip_file.write(file_path, arcname)
+    return os.path.getsize(zip_path)
+
+
+def spec_as_dict(spec: TreeSpec) -> dict:
+    return asdict(spec)
@@ -0,0 +1,78 @@
+"""
+Per-faction hero cost curves across the runs stored by heroes_build_report.py.
+
+Each report run is a Parquet file of the history directory (one row per hero, tagged with
+the mod version and the fingerprint of the source tree). The whole history is loaded as one
+DataFrame and aggregated with groupby/pivot, one column per run in run order. A run is
+labelled with its mod version, plus the start of its fingerprint when several runs share
+the version (e.g. "unknown" outside of a git checkout):
+
+    python scripts/hero_costs_history.py --metric buildcost --stat median
+    python scripts/hero_costs_history.py --faction gondor mordor -o costs.json
+"""
+
+import argparse
+import sys
+
+import pandas as pd
+
+METRICS = ("buildcost", "buildtime", "command_points")
+STATS = ("count", "mean", "median", "min", "max")
+
+
+def load_history(history_dir):
+    """Rows of every run, with a `run` label column; each fingerprint (source tree) is one run."""
+    history = pd.read_parquet(history_dir)
+    runs = history.groupby("fingerprint", observed=True).agg(mod_version=("mod_version", "first"), run_at=("run_at", "min"))
+    versions = runs["mod_version"].astype(str)
+    shared = versions.duplicated(keep=False)
+    runs["run"] = versions.where(~shared, versions + " (" + runs.index.astype(str).str[:8] + ")")
+    history["run"] = pd.Categorical(history["fingerprint"].map(runs["run"]).astype(str), categories=runs.sort_values("run_at")["run"].tolist(), ordered=True)
+    return history
+
+
+def faction_stats(history, metrics=METRICS):
+    """count/mean/median/min/max of the metrics per (run, faction)."""
+    stats = history.groupby(["run", "faction"], observed=True)[list(metrics)].agg(list(STATS))
+    stats.columns = [f"{metric}_{stat}" for metric, stat in stats.columns]
+    return stats
+
+
+def cost_curves(history, metric="buildcost", stat="mean", factions=None):
+    """Faction x run table of one statistic of a metric, runs in the order they were made."""
+    if factions:
+        history = history[history["faction"].astype(str).str.lower().isin([faction.lower() for faction in factions])]
+    curves = faction_stats(history, (metric,))[f"{metric}_{stat}"].unstack("run")
+    curves.index = curves.index.astype(str)
+    curves.columns = curves.columns.astype(str)
+    return curves.sort_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-faction hero cost curves across the stored report runs.")
+    parser.add_argument("--history", default="hero_costs_history", help="History directory of heroes_build_report.py (default: hero_costs_history).")
+    parser.add_argument("--metric", choices=METRICS, default="buildcost", help="Value to aggregate (default: buildcost).")
+    parser.add_argument("--stat", choices=STATS, default="mean", help="Statistic per faction (default: mean).")
+    parser.add_argument("--faction", nargs="+", help="Only these factions (directory names, case-insensitive).")
+    parser.add_argument("-o", "--output", help="Output file, .csv or .json (default: table on standard output).")
+    args = parser.parse_args()
+
+    try:
+        history = load_history(args.history)
+    except (OSError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    curves = cost_curves(history, args.metric, args.stat, args.faction)
+    if args.output and args.output.lower().endswith(".json"):
+        curves.to_json(args.output, orient="index", indent=2)
+    elif args.output:
+        curves.to_csv(args.output, index_label="Faction")
+    else:
+        print(curves.to_string(na_rep="-"))
+    print(f"{len(curves)} factions, {len(curves.columns)} runs ({args.metric} {args.stat})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,95 +1,125 @@
+import argparse
 import csv
+import hashlib
 import os
-import re
+import subprocess
 from pathlib import Path
 
-
-def get_object_name(content):
-    match = re.search(r"^Object\s+([^\s;\n]+)", content, re.MULTILINE)
-    return match.group(1).strip() if match else None
-
-
-def read_gamedata_defines(gamedata_path):
-    defines = {}
-    if os.path.exists(gamedata_path):
-        with open(gamedata_path, encoding="ansi") as f:
-            for line in f:
-                if line.strip().startswith("#define"):
-                    parts = line.strip().split()
-                    if len(parts) >= 3:
-                        defines[parts[1]] = parts[2]
-    return defines
-
-
-def collect_hero_data(base_path):
+import pandas as pd
+from sage_ini.cache import ParseCache, content_digest
+from sage_ini.defines import DefineError, DefineResolver, format_number
+from sage_ini.heroes import HERO_BYTES, RESPAWN_RULES_BYTES
+from sage_ini.scanner import scan_ini_tree
+from sage_ini.summary import parse_errors
+
+# One Parquet file per report run, named after the fingerprint of the source tree
+DEFAULT_HISTORY_DIR = "hero_costs_history"
+HISTORY_CATEGORIES = ["mod_version", "fingerprint", "faction", "hero"]
+
+
+def resolve_value(resolver, expression):
+    """Numeric value of a field value (number, define or macro), None if it has none."""
+    if not expression:
+        return None
+    try:
+        return resolver.evaluate(expression)
+    except DefineError as e:
+        print(f"Warning: {e}")
+        return None
+
+
+def source_fingerprint(ini_root):
+    """Digest of the relative path and content of every file under data/ini: equal trees, equal reports."""
+    digest = hashlib.blake2b(digest_size=16)
+    for dir_path, dir_names, file_names in os.walk(ini_root):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            with open(path, "rb") as f:
+                digest.update(f"{os.path.relpath(path, ini_root).lower()}\0{content_digest(f.read())}\0".encode())
+    return digest.hexdigest()
+
+
+def mod_version_of(ini_root):
+    """`git describe` of the mod checkout, 'unknown' outside of a git checkout."""
+    try:
+        result = subprocess.run(["git", "-C", str(ini_root), "describe", "--tags", "--always", "--dirty"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip() or "unknown"
+
+
+def append_report_history(heroes_data, history_dir, mod_version, fingerprint):
+    """
+    Stores the rows of a report run as history_dir/<fingerprint>.parquet. A run on an unchanged
+    tree replaces its previous file instead of adding a duplicate.
+    """
+    run_at = pd.Timestamp.now(tz="UTC")
+    history = pd.DataFrame(
+        {
+            "run_at": [run_at] * len(heroes_data),
+            "mod_version": mod_version,
+            "fingerprint": fingerprint,
+            "faction": [hero["faction"] for hero in heroes_data],
+            "hero": [hero["name"] for hero in heroes_data],
+            "buildcost": pd.array([hero["buildcost"] for hero in heroes_data], dtype="Float64"),
+            "buildtime": pd.array([hero["buildtime"] for hero in heroes_data], dtype="Float64"),
+            "command_points": pd.array([hero["command_points_value"] for hero in heroes_data], dtype="Float64"),
+            "buildcost_define": [hero["buildcost_define"] for hero in heroes_data],
+            "buildtime_define": [hero["buildtime_define"] for hero in heroes_data],
+        }
+    ).astype({column: "category" for column in HISTORY_CATEGORIES})
+    os.makedirs(history_dir, exist_ok=True)
+    path = os.path.join(history_dir, f"{fingerprint}.parquet")
+    # Written then renamed, so a query never reads a half-written run; pyarrow skips files starting with '.'
+    temporary = os.path.join(history_dir, f".{fingerprint}.parquet.{os.getpid()}.tmp")
+    history.to_parquet(temporary, index=False)
+    os.replace(temporary, path)
+    return path
+
+
+def collect_hero_data(base_path, cache=None):
     heroes_data = []
 
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".ini"):
-                file_path = Path(root) / file
-                try:
-                    with open(file_path, encoding="ansi") as f:
-                        content = f.read()
-
-                        respawnrules_count = len(re.findall(r"^\s*RespawnRules", content, re.MULTILINE))
-                        hero_type = re.search(r"KindOf\s*=.*HERO", content, re.IGNORECASE)
-                        if respawnrules_count == 0 or not hero_type:
-                            continue
-
-                        object_name = get_object_name(content)
-                        if not object_name:
-                            continue
-
-                        # Extract faction from path
-                        faction = Path(root).parts[-1]  # Get the parent directory name
-
-                        # Extract BuildCost, BuildTime and CommandPoints
-                        buildcost_define = None
-                        buildtime_define = None
-                        command_points = None
-
-                        cost_match = re.search(r"BuildCost\s*=\s*([A-Z0-9_]+)", content)
-                        time_match = re.search(r"BuildTime\s*=\s*([A-Z0-9_]+)", content)
-                        points_match = re.search(r"CommandPoints\s*=\s*([A-Z0-9_]+|\d+)", content)
-
-                        if cost_match:
-                            buildcost_define = cost_match.group(1)
-                        if time_match:
-                            buildtime_define = time_match.group(1)
-                        if points_match:
-                            command_points = points_match.group(1)
-                            # If command_points looks like a define (all caps with underscores)
-                            if re.match(r"^[A-Z0-9_]+$", command_points) and not command_points.isdigit():
-                                # The actual value will be looked up in gamedata.ini later
-                                pass
-
-                        heroes_data.append(
-                            {
-                                "faction": faction,
-                                "name": object_name,
-                                "buildcost_define": buildcost_define,
-                                "buildtime_define": buildtime_define,
-                                "command_points": command_points,
-                                "file": str(file_path),
-                            }
-                        )
-
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+    summaries = scan_ini_tree(base_path, cache, prefilters=(HERO_BYTES, RESPAWN_RULES_BYTES))
+    for error in parse_errors(summaries):
+        print(f"Warning: {error}")
+    for file_path, summary in summaries.items():
+        for obj in summary.objects:
+            if obj.kind != "Object" or not obj.is_hero or not obj.respawn_rules:
+                continue
+
+            heroes_data.append(
+                {
+                    # Faction from path: the parent directory name
+                    "faction": Path(file_path).parent.name,
+                    "name": obj.name,
+                    "buildcost_define": obj.first("BuildCost"),
+                    "buildtime_define": obj.first("BuildTime"),
+                    "command_points": obj.first("CommandPoints"),
+                    "file": str(file_path),
+                }
+            )
 
     return heroes_data
 
 
-def create_hero_report(base_path, gamedata_path, output_csv):
-    # Leggi le definizioni da gamedata.ini
-    defines = read_gamedata_defines(gamedata_path)
-
+def create_hero_report(base_path, gamedata_path, output_csv, history_dir=DEFAULT_HISTORY_DIR, mod_version=None):
     # Raccogli i dati degli eroi
-    heroes_data = collect_hero_data(base_path)
+    # Only the files changed since the last run are parsed again
+    with ParseCache() as cache:
+        heroes_data = collect_hero_data(base_path, cache)
+        # Defines of every file of data/ini and of the files they include, not only gamedata.ini
+        resolver = DefineResolver.from_tree(os.path.dirname(gamedata_path), cache)
+    for error in resolver.errors:
+        print(f"Warning: {error}")
 
     # Ordina per fazione e nome
     heroes_data.sort(key=lambda x: (x["faction"], x["name"]))
+    for hero in heroes_data:
+        hero["buildcost"] = resolve_value(resolver, hero["buildcost_define"])
+        hero["buildtime"] = resolve_value(resolver, hero["buildtime_define"])
+        hero["command_points_value"] = resolve_value(resolver, hero["command_points"])
 
     # Scrivi il CSV
     with open(output_csv, "w", newline="", encoding="utf-8") as f:
@@ -97,34 +127,44 @@ def create_hero_report(base_path, gamedata_path, output_csv):
         writer.writerow(["Faction", "Hero Name", "BuildCost Value", "BuildTime Value", "Command Points", "BuildCost Define", "BuildTime Define"])
 
         for hero in heroes_data:
-            buildcost_value = defines.get(hero["buildcost_define"], "N/A")
-            buildtime_value = defines.get(hero["buildtime_define"], "N/A")
-
-            # Se command_points è una define, cerchiamo il valore in gamedata.ini
-            if re.match(r"^[A-Z0-9_]+$", hero["command_points"] or "") and not (hero["command_points"] or "").isdigit():
-                command_points = defines.get(hero["command_points"], "N/A")
-            else:
-                command_points = hero["command_points"] if hero["command_points"] else "N/A"
-
             writer.writerow(
                 [
                     hero["faction"],
                     hero["name"],
-                    buildcost_value,
-                    buildtime_value,
-                    command_points,
+                    format_number(hero["buildcost"]),
+                    format_number(hero["buildtime"]),
+                    format_number(hero["command_points_value"]),
                     hero["buildcost_define"] or "N/A",
                     hero["buildtime_define"] or "N/A",
                 ]
             )
 
+    if history_dir:
+        ini_root = os.path.dirname(gamedata_path)
+        mod_version = mod_version or mod_version_of(ini_root)
+        if mod_version == "unknown":
+            print("Warning: mod version unknown (not a git checkout), the run is told apart by its fingerprint only: pass --mod-version")
+        try:
+            path = append_report_history(heroes_data, history_dir, mod_version, source_fingerprint(ini_root))
+        except ImportError as e:
+            # to_parquet needs pyarrow (or fastparquet): the CSV is written anyway
+            print(f"Warning: history not updated, {e}")
+        else:
+            print(f"Storico aggiornato: {path}")
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Hero costs report, also appended to the Parquet history of the reports.")
+    parser.add_argument("--mod-version", help="Mod version of the run (default: git describe of the mod checkout).")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_DIR, help=f"History directory (default: {DEFAULT_HISTORY_DIR}).")
+    parser.add_argument("--no-history", action="store_true", help="Only write the CSV.")
+    args = parser.parse_args()
+
     base_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\object"
     gamedata_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\gamedata.ini"
     output_csv = "hero_costs_report.csv"
 
-    create_hero_report(base_path, gamedata_path, output_csv)
+    create_hero_report(base_path, gamedata_path, output_csv, None if args.no_history else args.history, args.mod_version)
     print(f"Report generato in: {output_csv}")
 
 
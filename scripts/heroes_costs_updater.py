@@ -1,8 +1,15 @@
+import argparse
 import os
-import re
-from pathlib import Path
+import sys
 
 import pandas as pd
+from sage_ini.cache import ParseCache
+from sage_ini.codemod import Codemod, CodemodError
+from sage_ini.heroes import is_hero, respawn_rule_values, respawn_rules
+from sage_ini.objects import ObjectGraph
+from sage_ini.parser import line_ending
+from sage_ini.scanner import scan_ini_tree
+from sage_ini.summary import parse_errors
 
 
 def read_csv_data(csv_path):
@@ -16,14 +23,15 @@ def read_csv_data(csv_path):
     return tier_df, heroes_df
 
 
-def update_gamedata_defines(gamedata_path, tier_df):
+def update_gamedata_defines(codemod, gamedata_path, tier_df):
     """Update or add cost defines in gamedata.ini."""
     if not os.path.exists(gamedata_path):
         print(f"Warning: {gamedata_path} not found")
         return
 
-    with open(gamedata_path, encoding="ansi") as f:
-        content = f.read()
+    ini = codemod.load(gamedata_path)
+    content = ini.text
+    newline = line_ending(content)
 
     # Create defines dictionary
     defines = {}
@@ -31,140 +39,164 @@ def update_gamedata_defines(gamedata_path, tier_df):
         tier_num = int(row["Tier"])
         defines.update({f"TIER_{tier_num}_HERO_BUILDCOST": int(row["Cost"]), f"TIER_{tier_num}_HERO_BUILDTIME": int(row["Time"]), f"TIER_{tier_num}_HERO_CP": int(row["Points"])})
 
-    # Update existing defines or prepare new ones
+    # Update existing defines in place or prepare new ones
+    existing = {directive.name: directive for directive in ini.directives if directive.kind == "define"}
     defines_str = ""
     for define_name, value in defines.items():
-        if f"#define {define_name}" in content:
-            content = re.sub(r"#define {define_name}\s+\d+", f"#define {define_name} {value}", content)
+        if define_name in existing:
+            codemod.replace(gamedata_path, existing[define_name].value_span, str(value))
         else:
-            defines_str += f"#define {define_name} {value}\n"
+            defines_str += f"#define {define_name} {value}{newline}"
 
     # Add new defines if any
     if defines_str:
         break_header = ";------------------------BALANCE DATA---------------------------- "
         new_header = ";------------------------HERO COST DEFINES---------------------------- "
-        parts = content.split(break_header)
-
-        if len(parts) == 2:
-            content = parts[0] + new_header + "\n" + defines_str + "\n" + break_header + parts[1]
-        else:
-            print("Warning: Could not find expected header in gamedata.ini")
-            exit(1)
-
-    with open(gamedata_path, "w", encoding="ansi") as f:
-        f.write(content)
-
-
-def update_hero_files(base_path, fell_beast_path, heroes_df, tier_df):
-    """Update hero files with tier-based define references."""
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".ini"):
-                file_path = Path(root) / file
-                try:
-                    with open(file_path, encoding="ansi") as f:
-                        content = f.read()
-
-                    # Check if this is a hero file
-                    if not re.search(r"KindOf\s*=.*HERO", content, re.IGNORECASE):
-                        continue
-
-                    # Get object name
-                    object_name = re.search(r"^Object\s+([^\s;\n]+)", content, re.MULTILINE)
-                    if not object_name:
-                        continue
-
-                    object_name = object_name.group(1).strip()
-
-                    # Find hero in dataframe
-                    hero_row = heroes_df[heroes_df["Hero Code Name"] == object_name]
-                    if not hero_row.empty:
-                        tier = int(hero_row["HeroTier"].iloc[0])
-                        tier_row = tier_df[tier_df["Tier"] == tier].iloc[0]
-
-                        # Get tier values
-                        cost = int(tier_row["Cost"])
-                        time = int(tier_row["Time"])
-
-                        # Calculate respawn values (75% rounded down to nearest 100)
-                        respawn_cost = str((cost * 75 // 100) // 100 * 100)
-                        respawn_time = str(((time * 1000) * 75 // 100) // 100 * 100)
-
-                        # Use tier-based defines
-                        cost_define = f"TIER_{tier}_HERO_BUILDCOST"
-                        time_define = f"TIER_{tier}_HERO_BUILDTIME"
-                        cp_define = f"TIER_{tier}_HERO_CP"
-
-                        # Update the values
-                        content = re.sub(r"(BuildCost\s*=\s*)[^\s\n]+", f"\\1{cost_define}", content)
-                        content = re.sub(r"(BuildTime\s*=\s*)[^\s\n]+", f"\\1{time_define}", content)
-                        content = re.sub(r"(CommandPoints\s*=\s*)[^\s\n]+", f"\\1{cp_define}", content)
-
-                        # Update RespawnRules if present
-                        respawn_pattern = r"(RespawnRules\s*=\s*AutoSpawn:No\s*Cost:)\d+(\s*Time:)\d+"
-                        if re.search(respawn_pattern, content):
-                            content = re.sub(respawn_pattern, f"\\g<1>{respawn_cost}\\g<2>{respawn_time}", content)
-
-                        # Write updated content
-                        with open(file_path, "w", encoding="ansi") as f:
-                            f.write(content)
-                        print(f"Updated {file_path}")
-
-                        # Handle fell beast updates if applicable
-                        try:
-                            fell_beast_name = hero_row["fell_beast_name"].iloc[0]
-                            if pd.notna(fell_beast_name):
-                                with open(fell_beast_path, encoding="ansi") as f:
-                                    fell_beast_content = f.read()
-
-                                # Find the section for this fell beast
-                                fell_beast_section = re.search(f"ChildObject\\s+{fell_beast_name}[\\s\\S]*?(?=\\s*(?:ChildObject|$))", fell_beast_content)
-                                if fell_beast_section:
-                                    updated_section = fell_beast_section.group(0)
-                                    updated_section = re.sub(r"(BuildCost\s*=\s*)[^\s\n]+", f"\\1{cost_define}", updated_section)
-                                    updated_section = re.sub(r"(BuildTime\s*=\s*)[^\s\n]+", f"\\1{time_define}", updated_section)
-                                    updated_section = re.sub(r"(CommandPoints\s*=\s*)[^\s\n]+", f"\\1{cp_define}", updated_section)
-
-                                    # Update RespawnRules if present
-                                    respawn_pattern = r"(RespawnRules\s*=\s*AutoSpawn:No\s*Cost:)\d+(\s*Time:)\d+"
-                                    if re.search(respawn_pattern, updated_section):
-                                        updated_section = re.sub(respawn_pattern, f"\\g<1>{respawn_cost}\\g<2>{respawn_time}", updated_section)
-
-                                    # Update the fell beast file
-                                    fell_beast_content = fell_beast_content.replace(fell_beast_section.group(0), updated_section)
-                                    with open(fell_beast_path, "w", encoding="ansi") as f:
-                                        f.write(fell_beast_content)
-                                    print(f"Updated fell beast {fell_beast_name} in {fell_beast_path}")
-                        except KeyError:
-                            print(f"No fell beast name found for {object_name}, skipping fell beast update.")
-                            exit(1)
-                        except FileNotFoundError:
-                            print(f"Fell beast file not found: {fell_beast_path}, skipping fell beast update.")
-                            exit(1)
-                        except Exception as e:
-                            print(f"Error updating fell beast {fell_beast_name}: {e}")
-                            exit(1)
-
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
-                    exit(1)
+        header_position = content.find(break_header)
+
+        if header_position < 0 or content.count(break_header) != 1:
+            raise CodemodError("Could not find expected header in gamedata.ini")
+        codemod.insert(gamedata_path, header_position, new_header + newline + defines_str + newline)
+
+
+def hero_cost_edits(block, tier, respawn_cost, respawn_time):
+    """Span edits pointing BuildCost/BuildTime/CommandPoints of an object to the tier defines and updating its respawn costs."""
+    tier_defines = {
+        "BuildCost": f"TIER_{tier}_HERO_BUILDCOST",
+        "BuildTime": f"TIER_{tier}_HERO_BUILDTIME",
+        "CommandPoints": f"TIER_{tier}_HERO_CP",
+    }
+    edits = []
+    for key, define_name in tier_defines.items():
+        for field in block.find_fields(key):
+            # Only the first word is the value, keep anything after it
+            value_start = field.value_span[0]
+            edits.append(((value_start, value_start + len(field.tokens[0]) if field.tokens else value_start), define_name))
+
+    # Update RespawnRules if present
+    for field in respawn_rules(block):
+        rules = respawn_rule_values(field)
+        if rules.get("AutoSpawn", ("",))[0] != "No" or not rules.get("Cost", ("",))[0].isdigit() or not rules.get("Time", ("",))[0].isdigit():
+            continue
+        edits.append((rules["Cost"][1], respawn_cost))
+        edits.append((rules["Time"][1], respawn_time))
+    return edits
+
+
+def hero_balance_table(heroes_df, tier_df):
+    """
+    Balance values of every hero of the sheet, computed in one pass: a DataFrame indexed by hero
+    code name with tier, cost, time, points, respawn_cost, respawn_time and fell_beast_name.
+    Heroes whose tier is not in the tier table are left out (and reported).
+    """
+    heroes = heroes_df.dropna(subset=["Hero Code Name", "HeroTier"]).drop_duplicates("Hero Code Name")
+    heroes = heroes.assign(tier=heroes["HeroTier"].astype(int))
+    # A tier listed twice uses its first row
+    tiers = tier_df.dropna(subset=["Tier"]).astype({"Tier": int, "Cost": int, "Time": int, "Points": int}).drop_duplicates("Tier")
+    table = heroes.merge(tiers, left_on="tier", right_on="Tier", how="left", validate="many_to_one")
+
+    missing = table["Tier"].isna()
+    for name, tier in table.loc[missing, ["Hero Code Name", "tier"]].itertuples(index=False):
+        print(f"Warning: tier {tier} of {name} is not in the tier table, skipping it.")
+    table = table[~missing]
+
+    cost = table["Cost"].astype(int)
+    time = table["Time"].astype(int)
+    return pd.DataFrame(
+        {
+            "tier": table["tier"].to_numpy(),
+            "cost": cost.to_numpy(),
+            "time": time.to_numpy(),
+            "points": table["Points"].astype(int).to_numpy(),
+            # Respawn values: 75% rounded down to nearest 100 (time in milliseconds)
+            "respawn_cost": ((cost * 75 // 100) // 100 * 100).to_numpy(),
+            "respawn_time": ((time * 1000 * 75 // 100) // 100 * 100).to_numpy(),
+            "fell_beast_name": table["fell_beast_name"].to_numpy(),
+        },
+        index=pd.Index(table["Hero Code Name"].to_numpy(), name="hero"),
+    )
+
+
+def update_hero_files(codemod, base_path, heroes_df, tier_df):
+    """Update hero files with tier-based define references. Returns the number of heroes and fell beasts updated."""
+    with ParseCache() as cache:
+        # Every object, the fell beasts are ChildObjects that do not say they are heroes themselves
+        summaries = scan_ini_tree(base_path, cache)
+    for error in parse_errors(summaries):
+        print(f"Warning: {error}")
+    graph = ObjectGraph(summaries)
+    balance = hero_balance_table(heroes_df, tier_df)
+
+    # Objects of the loaded files by name, built once per file
+    blocks_by_file = {}
+
+    def find_block(path, name, kind):
+        if path not in blocks_by_file:
+            blocks_by_file[path] = {block.name: block for block in codemod.load(path).objects}
+        block = blocks_by_file[path].get(name)
+        return block if block is not None and block.kind == kind else None
+
+    updated = 0
+    # Join of the balance table with the hero index of the graph: one row per hero, no per-file filtering
+    for hero in balance.itertuples():
+        ref = graph.get(hero.Index)
+        if ref is None or ref.summary.kind != "Object" or not graph.is_hero(ref.name):
+            continue
+        block = find_block(ref.path, ref.name, "Object")
+        if block is None or not is_hero(block):
+            continue
+        respawn_cost = str(hero.respawn_cost)
+        respawn_time = str(hero.respawn_time)
+        for span, text in hero_cost_edits(block, hero.tier, respawn_cost, respawn_time):
+            codemod.replace(ref.path, span, text)
+        updated += 1
+
+        # Handle fell beast updates if applicable
+        if pd.isna(hero.fell_beast_name):
+            continue
+        fell_beast = graph.get(hero.fell_beast_name)
+        fell_beast_block = find_block(fell_beast.path, fell_beast.name, "ChildObject") if fell_beast is not None else None
+        if fell_beast_block is None:
+            print(f"Fell beast {hero.fell_beast_name} of {hero.Index} not found, skipping fell beast update.")
+            continue
+        for span, text in hero_cost_edits(fell_beast_block, hero.tier, respawn_cost, respawn_time):
+            codemod.replace(fell_beast.path, span, text)
+        updated += 1
+
+    return updated
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Points hero costs to the tier defines of the balance sheet.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the changes as a unified diff instead of writing them.")
+    args = parser.parse_args()
+
     # Configuration paths
     csv_path = r"C:\Users\giuse\Downloads\BFMEhero.csv"
     base_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\object"
     gamedata_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\gamedata.ini"
-    fell_beast_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\object\evilfaction\units\mordor\fellbeast.ini"
 
     # Read hero data from CSV
     tier_df, heroes_df = read_csv_data(csv_path)
 
-    update_gamedata_defines(gamedata_path, tier_df)
-    update_hero_files(base_path, fell_beast_path, heroes_df, tier_df)
-
-    print("Hero costs update completed!")
+    # Every edit is collected first: on error nothing is written
+    codemod = Codemod()
+    try:
+        update_gamedata_defines(codemod, gamedata_path, tier_df)
+        updated = update_hero_files(codemod, base_path, heroes_df, tier_df)
+        if args.dry_run:
+            print(codemod.diff(os.path.dirname(gamedata_path)), end="")
+            return 0
+        written = codemod.commit()
+    except (OSError, KeyError, ValueError) as e:  # CodemodError included
+        print(f"Error: {e}. No file was changed.")
+        return 1
+
+    for path in written:
+        print(f"Updated {path}")
+    print(f"Hero costs update completed! {updated} objects updated in {len(written)} files.")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
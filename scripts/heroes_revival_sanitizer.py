@@ -1,130 +1,144 @@
+import argparse
 import os
-import re
+import sys
 from pathlib import Path
 
+from sage_ini.cache import ParseCache
+from sage_ini.codemod import Codemod
+from sage_ini.defines import DefineResolver
+from sage_ini.objects import ObjectGraph
+from sage_ini.parser import line_ending
+from sage_ini.scanner import scan_ini_tree
+from sage_ini.summary import parse_errors
 
-def get_object_name(content):
-    match = re.search(r"^Object\s+([^\s;\n]+)", content, re.MULTILINE)
-    return match.group(1).strip() if match else None
 
+def write_to_gamedata(codemod, defines, gamedata_path):
+    ini = codemod.load(gamedata_path)
+    newline = line_ending(ini.text)
+    # Appended after the last line
+    lines = "".join(f"#define {define_name}\t\t\t\t{value}{newline}" for define_name, value in defines.items() if define_name not in ini.defines)
+    if lines and ini.text and not ini.text.endswith("\n"):
+        lines = newline + lines
+    if lines:
+        codemod.insert(gamedata_path, len(ini.text), lines)
 
-def write_to_gamedata(defines, gamedata_path):
-    existing_defines = set()
 
-    if os.path.exists(gamedata_path):
-        with open(gamedata_path, encoding="ansi") as f:
-            for line in f:
-                if "#define" in line:
-                    define_name = line.split()[1] if len(line.split()) > 1 else ""
-                    existing_defines.add(define_name)
-
-    with open(gamedata_path, "a", encoding="ansi") as f:
-        for define_name, value in defines.items():
-            if define_name not in existing_defines:
-                f.write(f"#define {define_name}\t\t\t\t{value}\n")
+def object_build_edits(block, graph, defines, build_defines):
+    """
+    Span edits of an object of the file: numeric BuildCost/BuildTime become defines named after
+    the object, and a BuildTime define whose prefix differs from the BuildCost one is replaced.
+    Inherited values are only read, the edits always target fields the object sets itself.
 
+    Returns:
+        (edits, keys with numeric values, True if the prefixes were mismatched)
+    """
+    object_name = block.name
+    edits = []
+    numeric_keys = []
+    # Value of BuildCost and BuildTime once the edits are applied, inherited if the object does not set it
+    current = {}
+    for key in ("BuildCost", "BuildTime"):
+        fields = list(block.find_fields(key))
+        current[key] = fields[0].tokens[0] if fields and fields[0].tokens else graph.effective_first(object_name, key)
+        numeric_fields = [field for field in fields if field.tokens and field.tokens[0].isdigit()]
+        if not numeric_fields:
+            continue
+        define_name = f"{object_name.upper()}_{key.upper()}"
+        build_defines[define_name] = numeric_fields[0].tokens[0]
+        for field in numeric_fields:
+            edits.append(((field.value_span[0], field.value_span[0] + len(field.tokens[0])), define_name))
+        if current[key] and current[key].isdigit():
+            current[key] = define_name
+        numeric_keys.append(key)
 
-def read_gamedata_defines(gamedata_path):
-    defines = {}
-    if os.path.exists(gamedata_path):
-        with open(gamedata_path, encoding="ansi") as f:
-            for line in f:
-                if line.strip().startswith("#define"):
-                    parts = line.strip().split()
-                    if len(parts) >= 3:
-                        defines[parts[1]] = parts[2]
-    return defines
+    # Check for mismatched prefixes
+    buildcost_define = current["BuildCost"]
+    buildtime_define = current["BuildTime"]
+    if not buildcost_define or not buildtime_define or buildcost_define.isdigit() or buildtime_define.isdigit():
+        return edits, numeric_keys, False
+    cost_prefix = buildcost_define.rsplit("_", 1)[0]
+    time_prefix = buildtime_define.rsplit("_", 1)[0]
+    if cost_prefix == time_prefix:
+        return edits, numeric_keys, False
+    # Fix mismatch: prefer to fix BuildTime, using the value from gamedata
+    value = defines.raw(buildtime_define)
+    own_buildtimes = [field for field in block.find_fields("BuildTime") if field.tokens and not field.tokens[0].isdigit()]
+    if value and own_buildtimes:
+        # Create new define with correct prefix
+        new_define = f"{cost_prefix}_BUILDTIME"
+        build_defines[new_define] = value
+        for field in own_buildtimes:
+            edits.append(((field.value_span[0], field.value_span[0] + len(field.tokens[0])), new_define))
+    return edits, numeric_keys, True
 
 
-def find_build_patterns(base_path, gamedata_path):
+def find_build_patterns(codemod, base_path, gamedata_path):
     numeric_builds = []
     numeric_buildtime = []
     build_defines = {}
     mismatched_prefixes = []
-    skipped_childobject = []
+    unresolved_children = []
     factions = ["evilfaction", "goodfaction"]
-    gamedata_defines = read_gamedata_defines(gamedata_path)
+    with ParseCache() as cache:
+        # Defines of the whole data/ini tree and its includes, not only gamedata.ini
+        defines = DefineResolver.from_tree(os.path.dirname(gamedata_path), cache)
+        # Every object, so ChildObjects resolve what they inherit from parents in other files
+        summaries = scan_ini_tree(base_path, cache)
+    for error in parse_errors(summaries):
+        print(f"Warning: {error}")
+    graph = ObjectGraph(summaries)
 
     for faction in factions:
         faction_path = Path(base_path) / faction / "units"
         if not faction_path.exists():
             continue
-        for root, _, files in os.walk(faction_path):
-            for file in files:
-                if file.endswith(".ini"):
-                    file_path = Path(root) / file
-                    try:
-                        with open(file_path, encoding="ansi") as f:
-                            content = f.read()
-                            respawnrules_count = len(re.findall(r"^\s*RespawnRules", content, re.MULTILINE))
-                            childobject_count = len(re.findall(r"^\s*ChildObject\s+", content, re.MULTILINE))
-                            hero_type = re.search(r"KindOf\s*=.*HERO", content, re.IGNORECASE)
-                            if respawnrules_count == 0 or not hero_type:
-                                continue
-                            if childobject_count >= 1 and respawnrules_count > 1:
-                                rel_path = os.path.relpath(file_path, base_path)
-                                skipped_childobject.append(rel_path)
-                                continue
-                            rel_path = os.path.relpath(file_path, base_path)
-                            object_name = get_object_name(content)
-                            if object_name:
-                                modified = False
-                                # Check BuildCost
-                                buildcost_match = re.search(r"BuildCost\s*=\s*(\d+)", content)
-                                if buildcost_match:
-                                    numeric_value = buildcost_match.group(1)
-                                    define_name = f"{object_name.upper()}_BUILDCOST"
-                                    build_defines[define_name] = numeric_value
-                                    content = re.sub(r"(BuildCost\s*=\s*)\d+", f"\\1{define_name}", content)
-                                    modified = True
-                                    numeric_builds.append((rel_path, "BuildCost"))
-                                # Check BuildTime
-                                buildtime_match = re.search(r"BuildTime\s*=\s*(\d+)", content)
-                                if buildtime_match:
-                                    numeric_value = buildtime_match.group(1)
-                                    define_name = f"{object_name.upper()}_BUILDTIME"
-                                    build_defines[define_name] = numeric_value
-                                    content = re.sub(r"(BuildTime\s*=\s*)\d+", f"\\1{define_name}", content)
-                                    modified = True
-                                    numeric_builds.append((rel_path, "BuildTime"))
-                                    numeric_buildtime.append(rel_path)
-                                else:
-                                    # Check for string BuildTime (ignored for counting)
-                                    pass
-                                # Check for mismatched prefixes
-                                buildcost_define = re.search(r"BuildCost\s*=\s*([A-Z_]+)", content)
-                                buildtime_define = re.search(r"BuildTime\s*=\s*([A-Z_]+)", content)
-                                if buildcost_define and buildtime_define:
-                                    cost_prefix = buildcost_define.group(1).rsplit("_", 1)[0]
-                                    time_prefix = buildtime_define.group(1).rsplit("_", 1)[0]
-                                    if cost_prefix != time_prefix:
-                                        mismatched_prefixes.append(rel_path)
-                                        # Fix mismatch
-                                        # Determine which one is wrong (prefer to fix BuildTime)
-                                        correct_prefix = buildcost_define.group(1).rsplit("_", 1)[0]
-                                        wrong_define = buildtime_define.group(1)
-                                        # Get value from gamedata
-                                        value = gamedata_defines.get(wrong_define)
-                                        if value:
-                                            # Create new define with correct prefix
-                                            new_define = f"{correct_prefix}_BUILDTIME"
-                                            build_defines[new_define] = value
-                                            # Replace in content
-                                            content = re.sub(r"(BuildTime\s*=\s*)[A-Z_]+", f"\\1{new_define}", content)
-                                            modified = True
-                                if modified:
-                                    with open(file_path, "w", encoding="ansi") as f:
-                                        f.write(content)
-                    except Exception as e:
-                        print(f"Error processing {file_path}: {e}")
-    return numeric_builds, numeric_buildtime, build_defines, mismatched_prefixes, skipped_childobject
+        faction_prefix = os.path.join(faction_path, "")
+        for file_path, summary in summaries.items():
+            if not file_path.startswith(faction_prefix):
+                continue
+            # Heroes with RespawnRules, set on them or inherited; only their files are parsed in full
+            names = {obj.name for obj in summary.objects if graph.is_hero(obj.name) and graph.has_respawn_rules(obj.name)}
+            if not names:
+                continue
+            rel_path = os.path.relpath(file_path, base_path)
+            ini = codemod.load(file_path)
+            for block in ini.objects:
+                if block.name not in names:
+                    continue
+                if block.parent_name is not None and block.parent_name not in graph:
+                    unresolved_children.append(f"{rel_path} ({block.name})")
+                    continue
+                object_edits, numeric_keys, mismatched = object_build_edits(block, graph, defines, build_defines)
+                for span, text in object_edits:
+                    codemod.replace(file_path, span, text)
+                numeric_builds.extend((rel_path, key) for key in numeric_keys)
+                if "BuildTime" in numeric_keys:
+                    numeric_buildtime.append(rel_path)
+                if mismatched:
+                    mismatched_prefixes.append(rel_path)
+    return numeric_builds, numeric_buildtime, build_defines, mismatched_prefixes, unresolved_children
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Moves numeric hero BuildCost/BuildTime values to defines and fixes mismatched define prefixes.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the changes as a unified diff instead of writing them.")
+    args = parser.parse_args()
+
     base_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\object"
     gamedata_path = r"C:\Users\giuse\Documents\GitHub\TROWMod\data\ini\gamedata.ini"
-    numeric_builds, numeric_buildtime, build_defines, mismatched_prefixes, skipped_childobject = find_build_patterns(base_path, gamedata_path)
-    write_to_gamedata(build_defines, gamedata_path)
+    # Every edit is collected first: on error nothing is written
+    codemod = Codemod()
+    try:
+        numeric_builds, numeric_buildtime, build_defines, mismatched_prefixes, unresolved_children = find_build_patterns(codemod, base_path, gamedata_path)
+        write_to_gamedata(codemod, build_defines, gamedata_path)
+        if args.dry_run:
+            print(codemod.diff(os.path.dirname(gamedata_path)), end="")
+        else:
+            codemod.commit()
+    except (OSError, ValueError) as e:  # CodemodError included
+        print(f"Error: {e}. No file was changed.")
+        return 1
+
     print(f"\nProcessed {len(numeric_builds)} files with numeric Build values (with RespawnRules):")
     for file, build_type in numeric_builds:
         print(f"- {file} ({build_type})")
@@ -135,10 +149,11 @@ def main():
     for file in mismatched_prefixes:
         print(f"- {file}")
     print(f"\nAdded {len(build_defines)} new defines to gamedata.ini")
-    print(f"\nSkipped {len(skipped_childobject)} files with at least one ChildObject and more than one RespawnRules:")
-    for file in skipped_childobject:
+    print(f"\nSkipped {len(unresolved_children)} ChildObjects whose parent could not be found:")
+    for file in unresolved_children:
         print(f"- {file}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
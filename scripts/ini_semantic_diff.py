@@ -0,0 +1,348 @@
+"""
+Balance diff of the INI objects of two TROWMod versions.
+
+Each side is a source tree (the mod root or its data/ini), a git ref of a TROWMod checkout
+(--repo), or a built INI archive (.big). Objects are compared field by field (SUMMARY_FIELDS:
+BuildCost, BuildTime, CommandPoints, RespawnRules...), with the numeric value of each field
+resolved through the defines of its own side. A ChildObject or ObjectReskin that does not set
+a field is compared on the value it inherits, so a parent's change shows on its children too:
+
+    python scripts/ini_semantic_diff.py 1.2.0 1.3.0 --repo ../TROWMod -o balance_diff.csv
+    python scripts/ini_semantic_diff.py old/TROWMod_ini.big ../TROWMod --format json
+
+Files with the same content on both sides are not parsed, unless they use a define whose
+value changed or inherit from (or are inherited by) an object of a parsed file. Git refs and
+archives are extracted once under the cache directory, and parses go through the INI parse
+cache, so comparing the same versions again is fast.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+from sage_ini.cache import ParseCache, content_digest, default_cache_path
+from sage_ini.defines import DefineError, DefineResolver, format_number
+from sage_ini.objects import ObjectGraph
+from sage_ini.parser import iter_ini_files
+from sage_ini.scanner import scan_ini_files
+from sage_ini.summary import SUMMARY_FIELDS, parse_errors
+
+# Fields compared by default
+DIFF_FIELDS = SUMMARY_FIELDS
+# Fields whose first word is resolved to a number
+NUMERIC_FIELDS = ("BuildCost", "BuildTime", "CommandPoints", "MaxHealth")
+CSV_COLUMNS = ["Faction", "Object", "Kind", "Field", "Change", "Old Value", "New Value", "Old Resolved", "New Resolved", "Old File", "New File"]
+
+
+def trees_cache_dir():
+    """Extracted git refs and archives, next to the parse cache."""
+    return os.path.join(os.path.dirname(os.path.abspath(default_cache_path())), "trees")
+
+
+def _materialize(key, extract):
+    """Directory of an extracted version, extracting it on first use (to a temporary directory renamed when complete)."""
+    target = os.path.join(trees_cache_dir(), key)
+    if os.path.isdir(target):
+        return target
+    os.makedirs(trees_cache_dir(), exist_ok=True)
+    temporary = tempfile.mkdtemp(prefix=f".{key}.", dir=trees_cache_dir())
+    try:
+        extract(temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        shutil.rmtree(temporary, ignore_errors=True)
+        raise
+    return target
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", "-C", repo, *args], capture_output=True, check=True).stdout
+
+
+def git_ref_tree(repo, ref):
+    """data/ini of a git ref of a TROWMod checkout."""
+    commit = _git(repo, "rev-parse", "--verify", f"{ref}^{{commit}}").decode().strip()
+
+    def extract(destination):
+        process = subprocess.Popen(["git", "-C", repo, "archive", "--format=tar", commit, "data/ini"], stdout=subprocess.PIPE)
+        with tarfile.open(fileobj=process.stdout, mode="r|") as archive:
+            archive.extractall(destination, filter="data")
+        if process.wait() != 0:
+            raise RuntimeError(f"git archive {commit} failed")
+
+    return os.path.join(_materialize(f"git-{commit}", extract), "data", "ini")
+
+
+def archive_tree(archive_path):
+    """data/ini of a built INI archive."""
+    # Imported here: the package is only needed for archives
+    from rotwk_trowmod_switcher.core.big_archiver.reader import BigArchive, normalize_entry_name
+
+    stat = os.stat(archive_path)
+    key = hashlib.blake2b(f"{os.path.abspath(archive_path)}|{stat.st_size}|{stat.st_mtime_ns}".encode(), digest_size=16).hexdigest()
+
+    def extract(destination):
+        with BigArchive(archive_path) as archive:
+            names = [name for name in archive.names() if normalize_entry_name(name).startswith("data\\ini\\")]
+            archive.extract(destination, names)
+
+    # Entry names keep the case they were packed with
+    path = _materialize(f"big-{key}", extract)
+    for name in ("data", "ini"):
+        path = next((entry.path for entry in os.scandir(path) if entry.is_dir() and entry.name.lower() == name), os.path.join(path, name))
+        if not os.path.isdir(path):
+            raise ValueError(f"{archive_path} has no data/ini entries")
+    return path
+
+
+def resolve_side(spec, repo):
+    """data/ini directory of a side given as a directory, a .big archive or a git ref of repo."""
+    path = Path(spec)
+    if path.is_dir():
+        return str(path / "data" / "ini") if (path / "data" / "ini").is_dir() else str(path)
+    if path.is_file() and path.suffix.lower() == ".big":
+        return archive_tree(str(path))
+    return git_ref_tree(repo, spec)
+
+
+def relative_ini_files(ini_root):
+    """Lowercase relative path (the game is case-insensitive) -> path of every .ini file under ini_root."""
+    return {os.path.relpath(path, ini_root).replace(os.sep, "/").lower(): path for path in iter_ini_files(ini_root)}
+
+
+def changed_defines(old_resolver, new_resolver):
+    """Names of the defines whose expression or value differs between the two sides."""
+    changed = set()
+    for name in set(old_resolver.names) | set(new_resolver.names):
+        if old_resolver.raw(name) != new_resolver.raw(name):
+            changed.add(name)
+            continue
+        try:
+            if old_resolver.value(name) != new_resolver.value(name):
+                changed.add(name)
+        except DefineError:
+            changed.add(name)
+    return changed
+
+
+def _names_pattern(names):
+    """Alternation of the names, as bytes of the INI files."""
+    return b"|".join(re.escape(name.encode("cp1252", "replace")) for name in sorted(names))
+
+
+def files_to_compare(old_files, new_files, defines):
+    """
+    Relative paths whose objects may differ: files present on one side only, files whose content
+    differs, and identical files that use one of the changed defines.
+    """
+    selected = []
+    uses_define = re.compile(rb"\b(?:" + _names_pattern(defines) + rb")\b") if defines else None
+    for relative_path in sorted(set(old_files) | set(new_files)):
+        if relative_path not in old_files or relative_path not in new_files:
+            selected.append(relative_path)
+            continue
+        # Different sizes: changed, without reading the files
+        if os.path.getsize(old_files[relative_path]) != os.path.getsize(new_files[relative_path]):
+            selected.append(relative_path)
+            continue
+        old_data = Path(old_files[relative_path]).read_bytes()
+        if content_digest(old_data) != content_digest(Path(new_files[relative_path]).read_bytes()):
+            selected.append(relative_path)
+        elif uses_define is not None and uses_define.search(old_data):
+            selected.append(relative_path)
+    return selected
+
+
+def files_with_objects(files, relative_paths, names, inheriting=False):
+    """
+    Relative paths of the files defining one of the named objects, or with inheriting=True an object
+    whose parent is one of them. Matches the raw bytes: at worst a few more files are parsed.
+    """
+    if not names:
+        return []
+    declaration = rb"\b(?:ChildObject|ObjectReskin)\s+\S+\s+" if inheriting else rb"\b(?:Object|ChildObject|ObjectReskin)\s+"
+    pattern = re.compile(declaration + rb"(?:" + _names_pattern(names) + rb")\b", re.IGNORECASE)
+    return [relative_path for relative_path in relative_paths if pattern.search(Path(files[relative_path]).read_bytes())]
+
+
+def objects_in(relative_paths, old_files, old_summaries, new_files, new_summaries):
+    """Objects of both sides of the given files."""
+    return [
+        obj
+        for files, summaries in ((old_files, old_summaries), (new_files, new_summaries))
+        for path in relative_paths
+        if files.get(path) in summaries
+        for obj in summaries[files[path]].objects
+    ]
+
+
+def objects_by_name(summaries, ini_root):
+    objects = {}
+    for path, summary in summaries.items():
+        for obj in summary.objects:
+            objects[obj.name] = (os.path.relpath(path, ini_root), obj)
+    return objects
+
+
+def field_value(effective):
+    return "; ".join(value for value, _ in effective.values) if effective is not None else ""
+
+
+def resolve_field(resolver, effective, field):
+    """Numeric value of the first word of a field, '' for non-numeric fields and unresolvable values."""
+    if field not in NUMERIC_FIELDS or effective is None or effective.first() is None:
+        return ""
+    try:
+        return format_number(resolver.evaluate(effective.first()), "")
+    except DefineError:
+        return ""
+
+
+def diff_objects(old_objects, new_objects, old_graph, new_graph, old_resolver, new_resolver, fields=DIFF_FIELDS):
+    """
+    One row per field of an object that was added, removed or changed (value or resolved value).
+    Fields are compared on their effective values (see ObjectGraph): a change of a field the
+    object inherits on both sides is reported as "inherited".
+    """
+    rows = []
+    for name in sorted(set(old_objects) | set(new_objects)):
+        old_file, old = old_objects.get(name, ("", None))
+        new_file, new = new_objects.get(name, ("", None))
+        for field in fields:
+            old_effective = old_graph.effective_field(name, field) if old is not None else None
+            new_effective = new_graph.effective_field(name, field) if new is not None else None
+            old_value = field_value(old_effective)
+            new_value = field_value(new_effective)
+            old_resolved = resolve_field(old_resolver, old_effective, field)
+            new_resolved = resolve_field(new_resolver, new_effective, field)
+            if old_value == new_value and old_resolved == new_resolved:
+                continue
+            if old is None or (not old_value and new_value):
+                change = "added"
+            elif new is None or (old_value and not new_value):
+                change = "removed"
+            elif old_effective.owner.name != name and new_effective.owner.name != name:
+                change = "inherited"
+            else:
+                change = "changed"
+            current = new if new is not None else old
+            rows.append(
+                {
+                    "Faction": Path(new_file or old_file).parent.name,
+                    "Object": name,
+                    "Kind": current.kind,
+                    "Field": field,
+                    "Change": change,
+                    "Old Value": old_value,
+                    "New Value": new_value,
+                    "Old Resolved": old_resolved,
+                    "New Resolved": new_resolved,
+                    "Old File": old_file.replace(os.sep, "/"),
+                    "New File": new_file.replace(os.sep, "/"),
+                }
+            )
+    return rows
+
+
+def semantic_diff(old_root, new_root, cache=None, fields=DIFF_FIELDS):
+    """
+    Field diff of the objects of two data/ini directories.
+
+    Returns:
+        (rows, number of files compared, number of files in total)
+    """
+    old_resolver = DefineResolver.from_tree(old_root, cache)
+    new_resolver = DefineResolver.from_tree(new_root, cache)
+    old_files = relative_ini_files(old_root)
+    new_files = relative_ini_files(new_root)
+
+    compared = files_to_compare(old_files, new_files, changed_defines(old_resolver, new_resolver))
+    old_summaries = {}
+    new_summaries = {}
+    # Identical files are parsed too when they inherit from an object that may have changed (the
+    # change shows on them), or define the parent of a parsed object (for its inherited values).
+    # Only their old copy is searched, the new one is the same
+    unchanged = set(old_files) & set(new_files) - set(compared)
+    inheriting, parents = compared, []
+    while inheriting or parents:
+        batch = inheriting + parents
+        old_summaries.update(scan_ini_files([old_files[path] for path in batch if path in old_files], cache))
+        new_summaries.update(scan_ini_files([new_files[path] for path in batch if path in new_files], cache))
+        unchanged -= set(batch)
+
+        known = {obj.name for summary in (*old_summaries.values(), *new_summaries.values()) for obj in summary.objects}
+        missing_parents = {obj.parent for obj in objects_in(batch, old_files, old_summaries, new_files, new_summaries) if obj.parent is not None} - known
+        inheriting_names = {obj.name for obj in objects_in(inheriting, old_files, old_summaries, new_files, new_summaries)}
+        inheriting = files_with_objects(old_files, sorted(unchanged), inheriting_names, inheriting=True)
+        parents = files_with_objects(old_files, sorted(unchanged - set(inheriting)), missing_parents)
+        compared = compared + inheriting + parents
+
+    for error in parse_errors(old_summaries) + parse_errors(new_summaries):
+        print(f"Warning: {error}", file=sys.stderr)
+    rows = diff_objects(
+        objects_by_name(old_summaries, old_root),
+        objects_by_name(new_summaries, new_root),
+        ObjectGraph(old_summaries),
+        ObjectGraph(new_summaries),
+        old_resolver,
+        new_resolver,
+        fields,
+    )
+    return rows, len(compared), len(set(old_files) | set(new_files))
+
+
+def write_rows(rows, output, output_format):
+    if output_format == "json":
+        text = json.dumps(rows, indent=2, ensure_ascii=False)
+        if output:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+        return
+    f = open(output, "w", newline="", encoding="utf-8") if output else sys.stdout
+    try:
+        writer = csv.DictWriter(f, CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if output:
+            f.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balance diff of the INI objects of two TROWMod versions.")
+    parser.add_argument("old", help="Old version: source tree, data/ini directory, INI .big archive or git ref of --repo.")
+    parser.add_argument("new", help="New version, same forms as old.")
+    parser.add_argument("--repo", default=".", help="TROWMod checkout for git refs (default: current directory).")
+    parser.add_argument("-o", "--output", help="Output file (default: standard output).")
+    parser.add_argument("--format", choices=("csv", "json"), help="Output format (default: from the output extension, else csv).")
+    parser.add_argument("--fields", nargs="+", choices=DIFF_FIELDS, default=list(DIFF_FIELDS), help="Fields to compare.")
+    args = parser.parse_args()
+
+    output_format = args.format or ("json" if args.output and args.output.lower().endswith(".json") else "csv")
+    try:
+        old_root = resolve_side(args.old, args.repo)
+        new_root = resolve_side(args.new, args.repo)
+    except (OSError, subprocess.CalledProcessError, RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    with ParseCache() as cache:
+        rows, compared, total = semantic_diff(old_root, new_root, cache, args.fields)
+    write_rows(rows, args.output, output_format)
+    print(f"{len(rows)} field changes in {len({row['Object'] for row in rows})} objects ({compared} of {total} files compared)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
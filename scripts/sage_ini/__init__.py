@@ -0,0 +1,7 @@
+# scripts/sage_ini/__init__.py
+"""
+Shared toolchain of the scripts working on the TROWMod INI tree (data/ini).
+
+The scripts are run from the repository root (python scripts/<script>.py), which puts
+scripts/ on sys.path and makes this package importable.
+"""
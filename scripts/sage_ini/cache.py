@@ -0,0 +1,178 @@
+# scripts/sage_ini/cache.py
+"""
+Persistent cache of file summaries (see summary.py), in a SQLite database.
+
+An entry is keyed by the absolute path of the file and stamped with its size, mtime and
+BLAKE2b digest. An unchanged stamp is a hit without reading the file; a file whose mtime
+changed but whose content did not (a git checkout, a copy) is a hit after hashing it.
+Only the other files are parsed again.
+
+Files a scan left out because their bytes did not match its prefilters (see scanner.py)
+are recorded too, per set of prefilters, with the same stamp: the next scan with the same
+prefilters skips them without reading them again.
+
+The database lives outside the mod tree (which is packed into the archives), by default
+in ~/.cache/trowmod_scripts, or where SAGE_INI_CACHE points.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+from sage_ini.parser import decode_ini, parse_ini_text
+from sage_ini.summary import FileSummary, summarize_ini
+
+CACHE_ENV_VAR = "SAGE_INI_CACHE"
+# Bump when the parser or the summaries change, older entries are then dropped
+CACHE_VERSION = 3
+# Paths per SELECT ... IN (...), below SQLite's limit on query parameters
+LOOKUP_CHUNK_SIZE = 500
+
+
+def default_cache_path() -> str:
+    return os.environ.get(CACHE_ENV_VAR) or str(Path.home() / ".cache" / "trowmod_scripts" / "ini_parse_cache.sqlite")
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def prefilter_key(prefilters: tuple[re.Pattern[bytes], ...]) -> str:
+    """Identifies a set of prefilters in the cache: the order does not matter, the patterns and flags do."""
+    patterns = sorted(f"{prefilter.flags}:{prefilter.pattern!r}" for prefilter in prefilters)
+    return hashlib.blake2b("\n".join(patterns).encode(), digest_size=8).hexdigest()
+
+
+def summarize_bytes(path: str, data: bytes) -> FileSummary:
+    return summarize_ini(parse_ini_text(decode_ini(data), path))
+
+
+def _unchanged(path: str, stat: os.stat_result, stamp: tuple[int, int, str], digests: dict[str, str]) -> bool:
+    """Whether a file still matches a cached (size, mtime_ns, digest): a new mtime with the same content (checkout, copy) does."""
+    size, mtime_ns, digest = stamp
+    if size != stat.st_size:
+        return False
+    if mtime_ns == stat.st_mtime_ns:
+        return True
+    if path not in digests:
+        with open(path, "rb") as f:
+            digests[path] = content_digest(f.read())
+    return digests[path] == digest
+
+
+class ParseCache:
+    """Use as a context manager: changes are committed when leaving it."""
+
+    def __init__(self, db_path: str | None = None):
+        self.db_path = db_path or default_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.hits = 0
+        self.misses = 0
+        # Files skipped because they were recorded as not matching the prefilters
+        self.filtered = 0
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != CACHE_VERSION:
+            self.connection.execute("DROP TABLE IF EXISTS files")
+            self.connection.execute("DROP TABLE IF EXISTS filtered")
+            self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(CACHE_VERSION),))
+        self.connection.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT, summary TEXT)")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS filtered (path TEXT, prefilters TEXT, size INTEGER, mtime_ns INTEGER, digest TEXT, PRIMARY KEY (path, prefilters))")
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    def _select(self, query: str, keys: list[str], *params) -> dict[str, tuple]:
+        """Rows of the given paths only, `query` ending with WHERE (or AND) before the path condition."""
+        rows = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            chunk = keys[start : start + LOOKUP_CHUNK_SIZE]
+            for row in self.connection.execute(f"{query} path IN ({','.join('?' * len(chunk))})", (*params, *chunk)):
+                rows[row[0]] = row[1:]
+        return rows
+
+    def lookup(self, paths: list[str], prefilters: tuple[re.Pattern[bytes], ...] = ()) -> tuple[dict[str, FileSummary], list[str]]:
+        """
+        Cached summaries of the files that did not change. With prefilters, the unchanged files
+        recorded as not matching them are in neither list.
+
+        Returns:
+            (path -> summary for the hits, paths to parse again)
+        """
+        keys = {path: os.path.abspath(path) for path in paths}
+        rows = self._select("SELECT path, size, mtime_ns, digest, summary FROM files WHERE", list(keys.values()))
+        filter_key = prefilter_key(prefilters) if prefilters else None
+        filtered_rows = self._select("SELECT path, size, mtime_ns, digest FROM filtered WHERE prefilters = ? AND", list(keys.values()), filter_key) if prefilters else {}
+
+        hits = {}
+        misses = []
+        filtered = 0
+        for path in paths:
+            key = keys[path]
+            stat = os.stat(path)
+            # Digest of the file, computed at most once for both tables
+            digests: dict[str, str] = {}
+            row = rows.get(key)
+            if row is not None and _unchanged(path, stat, row[:3], digests):
+                if row[1] != stat.st_mtime_ns:
+                    self.connection.execute("UPDATE files SET mtime_ns = ? WHERE path = ?", (stat.st_mtime_ns, key))
+                summary = FileSummary.from_dict(json.loads(row[3]))
+                summary.path = path
+                hits[path] = summary
+                continue
+            row = filtered_rows.get(key)
+            if row is not None and _unchanged(path, stat, row, digests):
+                if row[1] != stat.st_mtime_ns:
+                    self.connection.execute("UPDATE filtered SET mtime_ns = ? WHERE path = ? AND prefilters = ?", (stat.st_mtime_ns, key, filter_key))
+                filtered += 1
+                continue
+            misses.append(path)
+        self.hits += len(hits)
+        self.misses += len(misses)
+        self.filtered += filtered
+        return hits, misses
+
+    def store(self, path: str, size: int, mtime_ns: int, digest: str, summary: FileSummary) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+            (os.path.abspath(path), size, mtime_ns, digest, json.dumps(summary.as_dict(), separators=(",", ":"))),
+        )
+
+    def store_filtered(self, path: str, size: int, mtime_ns: int, digest: str, prefilters: tuple[re.Pattern[bytes], ...]) -> None:
+        """Records that the file does not match the prefilters, until its content changes."""
+        self.connection.execute("INSERT OR REPLACE INTO filtered VALUES (?, ?, ?, ?, ?)", (os.path.abspath(path), prefilter_key(prefilters), size, mtime_ns, digest))
+
+
+def parse_and_summarize(path: str, prefilters: tuple[re.Pattern[bytes], ...] = ()) -> tuple[FileSummary | None, int, int, str]:
+    """
+    Reads, parses and summarizes a file. Returns (summary, size, mtime_ns, digest) for ParseCache.store;
+    the summary is None, and the file is not decoded, if its raw bytes do not match every prefilter.
+    """
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if not all(prefilter.search(data) for prefilter in prefilters):
+        return None, stat.st_size, stat.st_mtime_ns, content_digest(data)
+    return summarize_bytes(path, data), stat.st_size, stat.st_mtime_ns, content_digest(data)
+
+
+def load_summaries(paths: list[str], cache: ParseCache | None = None) -> dict[str, FileSummary]:
+    """Summaries of the files, in the order of paths, parsing only the files the cache does not have."""
+    hits, misses = cache.lookup(paths) if cache is not None else ({}, list(paths))
+    for path in misses:
+        summary, size, mtime_ns, digest = parse_and_summarize(path)
+        hits[path] = summary
+        if cache is not None:
+            cache.store(path, size, mtime_ns, digest, summary)
+    return {path: hits[path] for path in paths}
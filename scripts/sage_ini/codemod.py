@@ -0,0 +1,158 @@
+# scripts/sage_ini/codemod.py
+"""
+Batched, transactional edits of INI files.
+
+Scripts load the files they edit through a Codemod and add span replacements to it; nothing
+is written until commit(). Each file is then rendered once with all of its edits (see
+parser.replace_spans), written to a temporary file next to it, and the temporary files are
+renamed over the originals only when every file was rendered and written. diff() shows the
+same result as a unified diff without touching the tree (dry run).
+
+    codemod = Codemod()
+    ini = codemod.load(path)
+    codemod.replace(path, field.value_span, "TIER_1_HERO_BUILDCOST")
+    print(codemod.diff())  # or codemod.commit()
+"""
+
+import difflib
+import os
+import shutil
+import tempfile
+
+from sage_ini.model import IniFile, Span
+from sage_ini.parser import INI_ENCODING, decode_ini, parse_ini_text, replace_spans
+
+
+class CodemodError(ValueError):
+    """Edits that cannot be applied: conflicting spans, or a file changed on disk since it was loaded."""
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Codemod:
+    def __init__(self):
+        self._files: dict[str, IniFile] = {}
+        self._stamps: dict[str, tuple[int, int]] = {}
+        # path -> {span: new text}
+        self._edits: dict[str, dict[Span, str]] = {}
+
+    def load(self, path: str | os.PathLike) -> IniFile:
+        """Parsed file, read once per codemod: spans of every edit refer to this text."""
+        path = os.path.normpath(path)
+        ini = self._files.get(path)
+        if ini is None:
+            with open(path, "rb") as f:
+                ini = parse_ini_text(decode_ini(f.read()), path)
+            self._stamps[path] = _file_stamp(path)
+            self._files[path] = ini
+        return ini
+
+    def replace(self, path: str | os.PathLike, span: Span, text: str) -> None:
+        """
+        Replaces a span of a loaded file. The same edit added twice is applied once.
+
+        Raises:
+            CodemodError: If the span already has a different replacement.
+        """
+        path = os.path.normpath(path)
+        if path not in self._files:
+            raise CodemodError(f"{path} must be loaded before being edited")
+        edits = self._edits.setdefault(path, {})
+        previous = edits.get(span)
+        if previous is not None and previous != text:
+            raise CodemodError(f"{path}: conflicting edits at offset {span[0]}: '{previous}' and '{text}'")
+        edits[span] = text
+
+    def insert(self, path: str | os.PathLike, offset: int, text: str) -> None:
+        """Inserts text at an offset of a loaded file; several insertions at the same offset are concatenated."""
+        path = os.path.normpath(path)
+        if path not in self._files:
+            raise CodemodError(f"{path} must be loaded before being edited")
+        edits = self._edits.setdefault(path, {})
+        edits[(offset, offset)] = edits.get((offset, offset), "") + text
+
+    def render(self, path: str | os.PathLike) -> str:
+        """
+        New text of a file, with all its edits.
+
+        Raises:
+            CodemodError: If two edits overlap.
+        """
+        path = os.path.normpath(path)
+        try:
+            return replace_spans(self._files[path].text, list(self._edits.get(path, {}).items()))
+        except ValueError as e:
+            raise CodemodError(f"{path}: {e}") from None
+
+    def diff(self, base_path: str | os.PathLike | None = None) -> str:
+        """Unified diff of every changed file, paths relative to base_path if given."""
+        parts = []
+        for path, text in self._render_changed().items():
+            name = os.path.relpath(path, base_path) if base_path is not None else path
+            old = self._files[path].text.splitlines(keepends=True)
+            new = text.splitlines(keepends=True)
+            parts.extend(difflib.unified_diff(old, new, f"a/{name}", f"b/{name}"))
+        return "".join(line if line.endswith("\n") else line + "\n" for line in parts)
+
+    def commit(self) -> list[str]:
+        """
+        Writes every changed file: rendered and written to temporary files first, then renamed
+        over the originals. If a rename fails, the files already replaced are restored.
+
+        Returns:
+            The paths written.
+
+        Raises:
+            CodemodError: If edits conflict or a file changed on disk since it was loaded; nothing is written.
+            OSError: If writing fails; the tree is left as it was.
+        """
+        rendered = self._render_changed()
+        for path in rendered:
+            if _file_stamp(path) != self._stamps[path]:
+                raise CodemodError(f"{path} changed on disk since it was loaded")
+
+        temporaries: dict[str, str] = {}
+        replaced: list[str] = []
+        try:
+            for path, text in rendered.items():
+                temporaries[path] = self._write_temporary(path, text)
+            for path, temporary in temporaries.items():
+                os.replace(temporary, path)
+                replaced.append(path)
+        except OSError:
+            for path in replaced:
+                # Best effort: put back the original text of the files already replaced
+                os.replace(self._write_temporary(path, self._files[path].text), path)
+            for path, temporary in temporaries.items():
+                if path not in replaced and os.path.exists(temporary):
+                    os.remove(temporary)
+            raise
+
+        # Edited files are loaded again by later edits, including those whose edits changed nothing:
+        # their edits are applied, a later commit must not see them again
+        for path in list(self._edits):
+            del self._files[path], self._stamps[path], self._edits[path]
+        return list(rendered)
+
+    def _render_changed(self) -> dict[str, str]:
+        """New text of the files the edits change, sorted by path. Renders every file before returning."""
+        rendered = {path: self.render(path) for path in sorted(self._edits)}
+        return {path: text for path, text in rendered.items() if text != self._files[path].text}
+
+    @staticmethod
+    def _write_temporary(path: str, text: str) -> str:
+        """Writes text to a temporary file in the directory of path (same filesystem, so the rename is atomic)."""
+        descriptor, temporary = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(text.encode(INI_ENCODING, errors="surrogateescape"))
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(path, temporary)
+        except OSError:
+            os.remove(temporary)
+            raise
+        return temporary
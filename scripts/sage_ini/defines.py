@@ -0,0 +1,240 @@
+# scripts/sage_ini/defines.py
+"""
+Resolution of `#define`s across an INI tree.
+
+The game sees the defines of every file it loads and of the files they `#include`; values
+can reference other defines and use the SAGE arithmetic macros:
+
+    #define HERO_BASE_COST      1000
+    #define HERO_TIER_2_COST    #MULTIPLY( HERO_BASE_COST 1.5 )
+    #define HERO_TIER_2_REVIVE  #SUBTRACT( HERO_TIER_2_COST #DIVIDE( HERO_BASE_COST 4 ) )
+
+DefineResolver builds the include graph once (from the scanner summaries), evaluates
+values on demand and memoizes them: after the first evaluation a lookup is a dict access.
+refresh() drops everything read from files that changed since.
+"""
+
+import os
+import re
+from pathlib import Path
+
+from sage_ini.cache import ParseCache, load_summaries
+from sage_ini.parser import iter_ini_files
+from sage_ini.scanner import scan_ini_files
+
+
+class DefineError(ValueError):
+    """A define that cannot be evaluated: reference cycle or malformed macro expression."""
+
+
+# Files without any directive are not parsed to look for defines. Not anchored to the line start,
+# and any whitespace the parser splits on (cp1252 no-break space included) may follow the '#'
+DIRECTIVE_BYTES = re.compile(rb"#[\s\x1c-\x1f\xa0]*(?:define|include)\b", re.IGNORECASE)
+
+_TOKEN = re.compile(r"#\w+\(|\(|\)|[^\s()]+")
+
+MACROS = {
+    "ADD": lambda a, b: a + b,
+    "SUBTRACT": lambda a, b: a - b,
+    "MULTIPLY": lambda a, b: a * b,
+    "DIVIDE": lambda a, b: a / b,
+}
+
+
+def format_number(value: float | None, default: str = "N/A") -> str:
+    """1400.0 -> '1400', 1.25 -> '1.25', None -> default."""
+    if value is None:
+        return default
+    return str(int(value)) if value.is_integer() else f"{value:g}"
+
+
+def _parse_number(token: str) -> float | None:
+    try:
+        return float(token.rstrip("%"))
+    except ValueError:
+        return None
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DefineResolver:
+    """
+    Defines visible from a list of root files and, transitively, from the files they include.
+
+    Files are read in order, the includes of a file before its own defines; as in the game,
+    a later definition of a name replaces the earlier one.
+    """
+
+    def __init__(self, root_paths: list[str], ini_root: str | os.PathLike | None = None, cache: ParseCache | None = None):
+        self.root_paths = [str(path) for path in root_paths]
+        # Includes not found next to the including file are looked up from here (data/ini)
+        self.ini_root = str(ini_root) if ini_root is not None else None
+        self.cache = cache
+        self.errors: list[str] = []
+        self._raw: dict[str, str] = {}
+        self._origin: dict[str, str] = {}
+        self._stamps: dict[str, tuple[int, int] | None] = {}
+        self._values: dict[str, float | None] = {}
+        self._load()
+
+    @classmethod
+    def from_tree(cls, ini_root: str | os.PathLike, cache: ParseCache | None = None) -> "DefineResolver":
+        """Resolver of a data/ini directory: gamedata.ini first, then every other .ini file."""
+        paths = iter_ini_files(ini_root)
+        paths.sort(key=lambda path: Path(path).name.lower() != "gamedata.ini")
+        return cls(paths, ini_root, cache)
+
+    def _resolve_include(self, including_path: str, name: str) -> str | None:
+        name = name.replace("\\", os.sep)
+        for base in (os.path.dirname(including_path), self.ini_root):
+            if base is not None and os.path.isfile(os.path.join(base, name)):
+                return os.path.normpath(os.path.join(base, name))
+        return None
+
+    def _load(self) -> None:
+        self.errors = []
+        self._raw = {}
+        self._origin = {}
+        self._stamps = {}
+        self._values = {}
+        summaries = scan_ini_files([path for path in self.root_paths if os.path.isfile(path)], self.cache, prefilters=(DIRECTIVE_BYTES,))
+
+        roots = set(self.root_paths)
+        visiting: set[str] = set()
+
+        def visit(path: str) -> None:
+            if path in visiting or path in self._stamps:
+                if path in visiting:
+                    self.errors.append(f"{path}: #include cycle")
+                return
+            visiting.add(path)
+            self._stamps[path] = _file_stamp(path)
+            summary = summaries.get(path)
+            if summary is None:
+                if path in roots:
+                    # Left out by the prefilter: no directive
+                    visiting.discard(path)
+                    return
+                summary = load_summaries([path], self.cache)[path]
+            for name in summary.includes:
+                included = self._resolve_include(path, name)
+                if included is None:
+                    self.errors.append(f"{path}: included file '{name}' not found")
+                else:
+                    visit(included)
+            for name, value in summary.defines.items():
+                self._raw[name] = value
+                self._origin[name] = path
+            visiting.discard(path)
+
+        for path in self.root_paths:
+            if os.path.isfile(path):
+                visit(path)
+            else:
+                self.errors.append(f"{path}: not found")
+
+    def refresh(self) -> bool:
+        """Reloads the defines if a file of the graph changed (or was removed). Returns True if it did."""
+        if all(_file_stamp(path) == stamp for path, stamp in self._stamps.items()):
+            return False
+        self._load()
+        return True
+
+    @property
+    def files(self) -> list[str]:
+        """Files of the include graph, in reading order."""
+        return list(self._stamps)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._raw
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._raw)
+
+    def raw(self, name: str) -> str | None:
+        """Expression of a define as written, None if it is not defined."""
+        return self._raw.get(name)
+
+    def origin(self, name: str) -> str | None:
+        """File of the definition in effect."""
+        return self._origin.get(name)
+
+    def value(self, name: str) -> float | None:
+        """
+        Numeric value of a define, None if it is not defined or not numeric (a string, Yes/No...).
+
+        Raises:
+            DefineError: If the define references itself or has a malformed macro.
+        """
+        if name in self._values:
+            return self._values[name]
+        return self._evaluate_define(name, [])
+
+    def evaluate(self, expression: str) -> float | None:
+        """Numeric value of a field value or define expression: a number, a define name or a macro."""
+        return self._evaluate(expression, [])
+
+    def warm_up(self) -> list[str]:
+        """Evaluates every define, so later lookups are dict accesses. Returns the errors."""
+        errors = []
+        for name in self._raw:
+            try:
+                self.value(name)
+            except DefineError as e:
+                errors.append(str(e))
+        return errors
+
+    def _evaluate_define(self, name: str, chain: list[str]) -> float | None:
+        if name in self._values:
+            return self._values[name]
+        if name in chain:
+            raise DefineError(f"Define cycle: {' -> '.join(chain[chain.index(name) :] + [name])}")
+        raw = self._raw.get(name)
+        value = None if raw is None else self._evaluate(raw, chain + [name])
+        self._values[name] = value
+        return value
+
+    def _evaluate(self, expression: str, chain: list[str]) -> float | None:
+        tokens = _TOKEN.findall(expression)
+        if not tokens:
+            return None
+        value, position = self._evaluate_tokens(tokens, 0, chain, expression)
+        if position != len(tokens):
+            # `Cost = 100 ; ...` never gets here (comments are stripped), but `Value = 1 2` does
+            return None
+        return value
+
+    def _evaluate_tokens(self, tokens: list[str], position: int, chain: list[str], expression: str) -> tuple[float | None, int]:
+        token = tokens[position]
+        if token.startswith("#") and token.endswith("("):
+            macro = MACROS.get(token[1:-1].upper())
+            if macro is None:
+                raise DefineError(f"Unknown macro '{token[:-1]}' in '{expression}'")
+            arguments = []
+            position += 1
+            while position < len(tokens) and tokens[position] != ")":
+                argument, position = self._evaluate_tokens(tokens, position, chain, expression)
+                arguments.append(argument)
+            if position == len(tokens):
+                raise DefineError(f"Unbalanced parentheses in '{expression}'")
+            if len(arguments) != 2:
+                raise DefineError(f"{token[:-1]} takes 2 arguments, got {len(arguments)} in '{expression}'")
+            if None in arguments:
+                return None, position + 1
+            try:
+                return float(macro(*arguments)), position + 1
+            except ZeroDivisionError:
+                raise DefineError(f"Division by zero in '{expression}'") from None
+        if token in ("(", ")"):
+            raise DefineError(f"Unexpected '{token}' in '{expression}'")
+        number = _parse_number(token)
+        if number is not None:
+            return number, position + 1
+        return self._evaluate_define(token, chain), position + 1
@@ -0,0 +1,39 @@
+# scripts/sage_ini/heroes.py
+"""Hero-related queries on parsed objects, shared by the heroes_* scripts."""
+
+import re
+
+from sage_ini.model import Block, Field, Span
+
+HERO_KIND = "HERO"
+BUILD_FIELDS = ("BuildCost", "BuildTime", "CommandPoints")
+
+_RESPAWN_RULE = re.compile(r"(\w+)\s*:\s*(\S+)")
+
+# Byte prefilters for the scanner: a file matching neither cannot define a hero / respawn rules
+HERO_BYTES = re.compile(rb"\bHERO\b", re.IGNORECASE)
+RESPAWN_RULES_BYTES = re.compile(rb"\bRespawnRules\b", re.IGNORECASE)
+
+
+def is_hero(block: Block) -> bool:
+    """True if one of the KindOf fields of the object lists HERO."""
+    return any(HERO_KIND in field.value.upper().split() for field in block.find_fields("KindOf"))
+
+
+def respawn_rules(block: Block) -> list[Field]:
+    return list(block.find_fields("RespawnRules"))
+
+
+def respawn_rule_values(field: Field) -> dict[str, tuple[str, Span]]:
+    """
+    Parses `RespawnRules = AutoSpawn:No Cost:1500 Time:60000 ...` into
+    {'AutoSpawn': ('No', span), 'Cost': ('1500', span), ...}, spans being offsets in the file.
+    """
+    offset = field.value_span[0]
+    return {match.group(1): (match.group(2), (offset + match.start(2), offset + match.end(2))) for match in _RESPAWN_RULE.finditer(field.value)}
+
+
+def first_value(block: Block, key: str) -> str | None:
+    """First word of the first field with the key in the object, nested modules included."""
+    field = block.find_field(key)
+    return field.tokens[0] if field is not None and field.tokens else None
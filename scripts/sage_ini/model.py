@@ -0,0 +1,131 @@
+# scripts/sage_ini/model.py
+"""
+Object model of a parsed SAGE INI file.
+
+Every element keeps its span in the file text, (start, end) character offsets; INI files
+are decoded with a single-byte codec (cp1252), so they are byte offsets too. Edits can
+then be written back surgically, leaving the rest of the file untouched.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+Span = tuple[int, int]
+
+# Top-level blocks defining a game object
+OBJECT_KINDS = ("Object", "ChildObject", "ObjectReskin")
+
+
+@dataclass(slots=True)
+class Field:
+    """A `Key = Value` line. value excludes the trailing comment and whitespace."""
+
+    key: str
+    value: str
+    line: int
+    span: Span
+    value_span: Span
+
+    @property
+    def tokens(self) -> list[str]:
+        return self.value.split()
+
+
+@dataclass(slots=True)
+class Block:
+    """
+    A block closed by `End`: a top-level block (`Object Name`, `ChildObject Name Parent`,
+    `Weapon Name`...) or a nested one (`Behavior = RespawnUpdate ModuleTag_X`, `ArmorSet`...).
+
+    kind is the opening keyword, args the words following it (without the '=').
+    """
+
+    kind: str
+    args: list[str]
+    line: int
+    span: Span
+    header_span: Span
+    fields: list[Field] = field(default_factory=list)
+    blocks: list["Block"] = field(default_factory=list)
+    # Children in file order, for tools that need fields and blocks interleaved
+    items: list["Field | Block"] = field(default_factory=list)
+
+    @property
+    def name(self) -> str | None:
+        return self.args[0] if self.args else None
+
+    @property
+    def parent_name(self) -> str | None:
+        """Parent of a ChildObject or ObjectReskin."""
+        return self.args[1] if self.kind in OBJECT_KINDS[1:] and len(self.args) > 1 else None
+
+    @property
+    def is_object(self) -> bool:
+        return self.kind in OBJECT_KINDS
+
+    def get(self, key: str) -> Field | None:
+        """First field of this block (not of nested blocks) with the key, case-insensitive."""
+        key = key.lower()
+        return next((f for f in self.fields if f.key.lower() == key), None)
+
+    def iter_fields(self) -> Iterator[Field]:
+        """Fields of this block and of every nested block, in file order."""
+        for item in self.items:
+            if isinstance(item, Field):
+                yield item
+            else:
+                yield from item.iter_fields()
+
+    def find_fields(self, key: str) -> Iterator[Field]:
+        """Fields with the key in this block and every nested block, in file order."""
+        key = key.lower()
+        return (item for item in self.iter_fields() if item.key.lower() == key)
+
+    def find_field(self, key: str) -> Field | None:
+        return next(self.find_fields(key), None)
+
+    def find_blocks(self, kind: str, module_type: str | None = None) -> Iterator["Block"]:
+        """Nested blocks of a kind (e.g. 'Behavior'), optionally of a module type (e.g. 'RespawnUpdate')."""
+        kind = kind.lower()
+        for block in self.blocks:
+            if block.kind.lower() == kind and (module_type is None or (block.args and block.args[0].lower() == module_type.lower())):
+                yield block
+            yield from block.find_blocks(kind, module_type)
+
+
+@dataclass(slots=True)
+class Directive:
+    """A `#define NAME VALUE` or `#include "file"` line."""
+
+    kind: str  # 'define' or 'include'
+    name: str  # the define name, or the included path
+    value: str  # the define value (raw expression), empty for includes
+    line: int
+    span: Span
+    value_span: Span
+
+
+@dataclass(slots=True)
+class IniFile:
+    path: str
+    text: str
+    blocks: list[Block] = field(default_factory=list)
+    directives: list[Directive] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def objects(self) -> list[Block]:
+        """Object, ChildObject and ObjectReskin blocks, in file order."""
+        return [block for block in self.blocks if block.is_object]
+
+    @property
+    def defines(self) -> dict[str, str]:
+        """Raw values of the defines of this file. The last definition wins."""
+        return {d.name: d.value for d in self.directives if d.kind == "define"}
+
+    @property
+    def includes(self) -> list[str]:
+        return [d.name for d in self.directives if d.kind == "include"]
+
+    def line_of(self, offset: int) -> int:
+        return self.text.count("\n", 0, offset) + 1
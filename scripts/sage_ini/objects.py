@@ -0,0 +1,142 @@
+# scripts/sage_ini/objects.py
+"""
+Inheritance graph of the objects of an INI tree.
+
+`ChildObject Name Parent` and `ObjectReskin Name Parent` start from a copy of their
+parent and override some of its fields. ObjectGraph indexes every object by name with
+its parent and children, and resolves the effective value of a field: the object's own
+occurrences if it sets the field, otherwise its parent's, recursively. Resolutions are
+memoized per (object, field), so siblings share the resolution of their parent.
+
+The graph works on file summaries (see summary.py), so it only knows SUMMARY_FIELDS, and
+a field set anywhere in an object (nested modules included) overrides it as a whole.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from sage_ini.heroes import HERO_KIND
+from sage_ini.summary import FileSummary, ObjectSummary
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectRef:
+    path: str
+    summary: ObjectSummary
+
+    @property
+    def name(self) -> str:
+        return self.summary.name
+
+
+@dataclass(frozen=True, slots=True)
+class EffectiveField:
+    """The occurrences of a field in effect for an object, and the object that sets them."""
+
+    owner: ObjectRef
+    values: list[tuple[str, tuple[int, int]]]
+
+    def first(self) -> str | None:
+        tokens = self.values[0][0].split() if self.values else []
+        return tokens[0] if tokens else None
+
+
+class ObjectGraph:
+    """Objects of a set of file summaries, by name. Names are case-sensitive, as in the game."""
+
+    def __init__(self, summaries: dict[str, FileSummary]):
+        self.errors: list[str] = []
+        self._objects: dict[str, ObjectRef] = {}
+        self._children: dict[str, list[str]] = {}
+        self._fields: dict[tuple[str, str], EffectiveField | None] = {}
+        self._resolving: set[tuple[str, str]] = set()
+
+        for path, summary in summaries.items():
+            for obj in summary.objects:
+                previous = self._objects.get(obj.name)
+                if previous is not None:
+                    self.errors.append(f"{path}:{obj.line}: {obj.name} already defined in {previous.path}")
+                self._objects[obj.name] = ObjectRef(path, obj)
+        for name, ref in self._objects.items():
+            if ref.summary.parent is None:
+                continue
+            if ref.summary.parent not in self._objects:
+                self.errors.append(f"{ref.path}:{ref.summary.line}: parent {ref.summary.parent} of {name} not found")
+            self._children.setdefault(ref.summary.parent, []).append(name)
+        for name, ref in self._objects.items():
+            # Only in broken data: resolutions stop at the cycle, report it once per object in it
+            chain = [name]
+            parent = ref.summary.parent
+            while parent in self._objects and parent not in chain:
+                chain.append(parent)
+                parent = self._objects[parent].summary.parent
+            if parent == name:
+                self.errors.append(f"{ref.path}:{ref.summary.line}: parent cycle {' -> '.join(chain + [name])}")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._objects
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def get(self, name: str) -> ObjectRef | None:
+        return self._objects.get(name)
+
+    def parent(self, name: str) -> ObjectRef | None:
+        ref = self._objects.get(name)
+        return self._objects.get(ref.summary.parent) if ref is not None and ref.summary.parent else None
+
+    def children(self, name: str) -> list[ObjectRef]:
+        """ChildObjects and ObjectReskins whose parent is the object, in file order."""
+        return [self._objects[child] for child in self._children.get(name, ())]
+
+    def ancestors(self, name: str) -> Iterator[ObjectRef]:
+        """Parent, grandparent... up to the root Object. Stops at a missing parent or a cycle."""
+        seen = {name}
+        ref = self.parent(name)
+        while ref is not None and ref.name not in seen:
+            seen.add(ref.name)
+            yield ref
+            ref = self.parent(ref.name)
+
+    def descendants(self, name: str) -> Iterator[ObjectRef]:
+        """Every object inheriting from the object, depth first."""
+        pending = list(reversed(self._children.get(name, ())))
+        seen = {name}
+        while pending:
+            child = pending.pop()
+            if child in seen:
+                continue
+            seen.add(child)
+            yield self._objects[child]
+            pending.extend(reversed(self._children.get(child, ())))
+
+    def effective_field(self, name: str, key: str) -> EffectiveField | None:
+        """Occurrences of the field in effect for the object, None if neither it nor an ancestor sets it."""
+        cache_key = (name, key)
+        if cache_key in self._fields:
+            return self._fields[cache_key]
+        ref = self._objects.get(name)
+        result = None
+        if ref is not None:
+            if key in ref.summary.values:
+                result = EffectiveField(ref, ref.summary.values[key])
+            elif ref.summary.parent is not None and cache_key not in self._resolving:
+                # Through the parent's own memoized resolution; _resolving stops parent cycles in broken data
+                self._resolving.add(cache_key)
+                result = self.effective_field(ref.summary.parent, key)
+                self._resolving.discard(cache_key)
+        self._fields[cache_key] = result
+        return result
+
+    def effective_first(self, name: str, key: str) -> str | None:
+        """First word of the effective value of a field, e.g. the BuildCost of an object or of its parent."""
+        field = self.effective_field(name, key)
+        return field.first() if field is not None else None
+
+    def is_hero(self, name: str) -> bool:
+        field = self.effective_field(name, "KindOf")
+        return field is not None and any(HERO_KIND in value.upper().split() for value, _ in field.values)
+
+    def has_respawn_rules(self, name: str) -> bool:
+        return self.effective_field(name, "RespawnRules") is not None
@@ -0,0 +1,225 @@
+# scripts/sage_ini/parser.py
+"""
+Single-pass parser of SAGE INI files (data/ini/**/*.ini).
+
+Each line is read once: comments (';' and '//') are stripped, `#define`/`#include`
+become directives, `End` closes the innermost block, and every other line is either a
+`Key = Value` field or opens a block. A line opens a block when it has no '=' (`Object
+Name`, `ArmorSet`, `DefaultConditionState`...) or when its key is one of BLOCK_KEYS
+(`Behavior = RespawnUpdate ModuleTag_X`, `ConditionState = DAMAGED`, `Animation = Walk`...).
+The few keywords of SINGLE_LINE_KEYS are read as fields although they have no '='.
+
+`BeginScript` ... `EndScript` (the Lua of W3DScriptedModelDraw animation states) is kept
+as an opaque block: its lines are not INI, and Lua's own `end` must not close anything.
+
+The parser is tolerant: stray `End` lines and blocks left open at the end of the file are
+reported in IniFile.errors instead of raising.
+"""
+
+import os
+
+from sage_ini.model import Block, Directive, Field, IniFile
+
+# The game's INI files are Windows-1252, "ansi" only exists as a codec name on Windows
+INI_ENCODING = "cp1252"
+
+# Keys whose `Key = ...` line opens a block closed by End
+BLOCK_KEYS = frozenset(
+    key.lower()
+    for key in (
+        "Behavior",
+        "Draw",
+        "Body",
+        "ClientUpdate",
+        "ClientBehavior",
+        "ConditionState",
+        "ModelConditionState",
+        "AnimationState",
+        "TransitionState",
+        # Inside the (Idle)AnimationStates of W3DScriptedModelDraw
+        "Animation",
+    )
+)
+
+# Opaque block whose lines are skipped up to SCRIPT_END
+SCRIPT_START = "beginscript"
+SCRIPT_END = "endscript"
+
+# Keywords written without '=' that do not open a block (`RemoveModule ModuleTag_X` in ChildObjects)
+SINGLE_LINE_KEYS = frozenset(("removemodule",))
+
+
+def _strip_comment(line: str) -> str:
+    cut = len(line)
+    semicolon = line.find(";")
+    if semicolon >= 0:
+        cut = semicolon
+    slashes = line.find("//", 0, cut)
+    if slashes >= 0:
+        cut = slashes
+    return line[:cut]
+
+
+def parse_ini_text(text: str, path: str = "") -> IniFile:
+    """Parses the text of an INI file into its blocks and directives."""
+    ini = IniFile(path, text)
+    stack: list[Block] = []
+    # Open BeginScript block, its lines are skipped
+    script: Block | None = None
+    position = 0
+    line_number = 0
+    text_length = len(text)
+
+    while position < text_length:
+        line_end = text.find("\n", position)
+        if line_end < 0:
+            line_end = text_length
+        line_number += 1
+        line_start = position
+        position = line_end + 1
+
+        content = _strip_comment(text[line_start:line_end]).rstrip()
+        stripped = content.lstrip()
+        if not stripped:
+            continue
+        start = line_start + len(content) - len(stripped)
+        end = line_start + len(content)
+
+        if script is not None:
+            if stripped.split(None, 1)[0].lower() == SCRIPT_END:
+                script.span = (script.span[0], end)
+                script = None
+            continue
+
+        if stripped[0] == "#":
+            directive, *rest = stripped[1:].split(None, 1) or [""]
+            directive = directive.lower()
+            rest = rest[0] if rest else ""
+            if not directive or (directive == "define" and not rest):
+                ini.errors.append(f"{path}:{line_number}: incomplete directive '{stripped}'")
+            elif directive == "define":
+                name, *value = rest.split(None, 1)
+                value = value[0] if value else ""
+                value_start = end - len(value)
+                ini.directives.append(Directive("define", name, value, line_number, (start, end), (value_start, end)))
+            elif directive == "include":
+                ini.directives.append(Directive("include", rest.strip('"'), "", line_number, (start, end), (end - len(rest), end)))
+            else:
+                ini.errors.append(f"{path}:{line_number}: unknown directive '#{directive}'")
+            continue
+
+        key, equals, value = stripped.partition("=")
+        key = key.strip()
+        key_lower = key.lower()
+
+        if not equals:
+            words = stripped.split()
+            if key_lower == "end":
+                if not stack:
+                    ini.errors.append(f"{path}:{line_number}: 'End' outside of a block")
+                    continue
+                block = stack.pop()
+                block.span = (block.span[0], end)
+                continue
+            if words[0].lower() == SCRIPT_START:
+                script = Block(words[0], words[1:], line_number, (start, end), (start, end))
+                if stack:
+                    stack[-1].blocks.append(script)
+                    stack[-1].items.append(script)
+                else:
+                    ini.errors.append(f"{path}:{line_number}: '{words[0]}' outside of a block")
+                continue
+            if words[0].lower() in SINGLE_LINE_KEYS:
+                key = words[0]
+                value = stripped[len(key) :]
+                opens_block = False
+            else:
+                kind, args = words[0], words[1:]
+                opens_block = True
+        else:
+            kind, args = key, value.split()
+            opens_block = key_lower in BLOCK_KEYS
+
+        if opens_block:
+            block = Block(kind, args, line_number, (start, end), (start, end))
+            if stack:
+                parent = stack[-1]
+                parent.blocks.append(block)
+                parent.items.append(block)
+            else:
+                ini.blocks.append(block)
+            stack.append(block)
+            continue
+
+        value = value.strip()
+        value_start = end - len(value)
+        item = Field(key, value, line_number, (start, end), (value_start, end))
+        if stack:
+            stack[-1].fields.append(item)
+            stack[-1].items.append(item)
+        else:
+            ini.errors.append(f"{path}:{line_number}: field '{key}' outside of a block")
+
+    if script is not None:
+        ini.errors.append(f"{path}:{script.line}: '{script.kind}' is never closed by EndScript")
+        script.span = (script.span[0], text_length)
+    for block in stack:
+        ini.errors.append(f"{path}:{block.line}: '{block.kind}' block is never closed")
+        block.span = (block.span[0], text_length)
+    return ini
+
+
+def decode_ini(data: bytes) -> str:
+    # surrogateescape keeps the few bytes undefined in cp1252, so a file is written back unchanged
+    return data.decode(INI_ENCODING, errors="surrogateescape")
+
+
+def parse_ini_file(path: str | os.PathLike) -> IniFile:
+    """Reads and parses an INI file. Offsets of the model are offsets in the file."""
+    with open(path, "rb") as f:
+        return parse_ini_text(decode_ini(f.read()), str(path))
+
+
+def iter_ini_files(base_path: str | os.PathLike) -> list[str]:
+    """Paths of the .ini files under base_path, sorted, listed with os.scandir."""
+    paths = []
+    pending = [str(base_path)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(".ini"):
+                    paths.append(entry.path)
+    paths.sort()
+    return paths
+
+
+def line_ending(text: str) -> str:
+    """Line ending used by a file, for the lines added to it."""
+    return "\r\n" if "\r\n" in text else "\n"
+
+
+def write_ini_file(path: str | os.PathLike, text: str) -> None:
+    """Writes text back with the INI codec, keeping the line endings it already has."""
+    with open(path, "w", encoding=INI_ENCODING, errors="surrogateescape", newline="") as f:
+        f.write(text)
+
+
+def replace_spans(text: str, replacements: list[tuple[tuple[int, int], str]]) -> str:
+    """
+    Replaces spans of text, everything else is kept byte for byte.
+
+    Raises:
+        ValueError: If two spans overlap.
+    """
+    parts = []
+    position = 0
+    for (start, end), new_text in sorted(replacements, key=lambda replacement: replacement[0]):
+        if start < position:
+            raise ValueError(f"Overlapping edits at offset {start}")
+        parts.append(text[position:start])
+        parts.append(new_text)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
@@ -0,0 +1,99 @@
+# scripts/sage_ini/scanner.py
+"""
+Parallel scan of an INI tree into file summaries.
+
+Files are listed with os.scandir, cached summaries are looked up in the main process,
+and the files left to parse are sent in batches to a process pool. Workers send back the
+summaries in their dict form (see FileSummary.as_dict), cheaper to pickle than the
+dataclasses, and the results are merged in the order of the sorted paths, so the output
+never depends on which worker finished first.
+
+Scans looking for some objects only can pass byte prefilters (see heroes.HERO_BYTES):
+files to parse whose raw bytes do not match are left out without being decoded, and the
+cache records them so the next scan with the same prefilters does not read them again.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from sage_ini.cache import ParseCache, parse_and_summarize
+from sage_ini.parser import iter_ini_files
+from sage_ini.summary import FileSummary
+
+WORKERS_ENV_VAR = "SAGE_INI_WORKERS"
+# Files per task sent to a worker
+BATCH_SIZE = 64
+# Below this number of files to parse, starting the pool costs more than it saves
+PROCESS_POOL_MIN_FILES = 200
+
+
+def default_workers() -> int:
+    """Worker processes to use: SAGE_INI_WORKERS if set, otherwise one per CPU."""
+    value = os.environ.get(WORKERS_ENV_VAR, "").strip()
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    return os.cpu_count() or 1
+
+
+def _summarize_batch(paths: list[str], prefilters: tuple[re.Pattern[bytes], ...] = ()) -> list[tuple[dict | None, int | None, int | None, str | None]]:
+    """
+    Runs in a worker: (summary dict, size, mtime_ns, digest) per file, without stamp for unreadable
+    files, without summary for the files left out by the prefilters.
+    """
+    results = []
+    for path in paths:
+        try:
+            summary, size, mtime_ns, digest = parse_and_summarize(path, prefilters)
+        except OSError as e:
+            results.append((FileSummary(path, errors=[f"{path}: {e}"]).as_dict(), None, None, None))
+            continue
+        results.append((summary.as_dict() if summary is not None else None, size, mtime_ns, digest))
+    return results
+
+
+def scan_ini_files(
+    paths: list[str],
+    cache: ParseCache | None = None,
+    workers: int | None = None,
+    batch_size: int = BATCH_SIZE,
+    prefilters: tuple[re.Pattern[bytes], ...] = (),
+) -> dict[str, FileSummary]:
+    """
+    Summaries of the files, in the order of paths. Files the cache does not have are parsed
+    by `workers` processes (default_workers() if None, 1 parses in this process).
+
+    With prefilters, the files to parse whose bytes do not match every pattern are left out
+    of the result, and so are the unchanged files the cache recorded as not matching them;
+    cached summaries are always returned, they cost nothing to load.
+    An unreadable file gets an empty summary with the error, and is not cached.
+    """
+    hits, misses = cache.lookup(paths, prefilters) if cache is not None else ({}, list(paths))
+    workers = workers or default_workers()
+    batches = [misses[start : start + batch_size] for start in range(0, len(misses), batch_size)]
+    summarize_batch = partial(_summarize_batch, prefilters=prefilters)
+
+    if workers > 1 and len(misses) >= PROCESS_POOL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            results = [result for batch in executor.map(summarize_batch, batches) for result in batch]
+    else:
+        results = [result for batch in batches for result in summarize_batch(batch)]
+
+    for path, (data, size, mtime_ns, digest) in zip(misses, results, strict=True):
+        if data is None:
+            if cache is not None:
+                cache.store_filtered(path, size, mtime_ns, digest, prefilters)
+            continue
+        summary = FileSummary.from_dict(data)
+        hits[path] = summary
+        if cache is not None and digest is not None:
+            cache.store(path, size, mtime_ns, digest, summary)
+    return {path: hits[path] for path in paths if path in hits}
+
+
+def scan_ini_tree(
+    base_path: str | os.PathLike, cache: ParseCache | None = None, workers: int | None = None, prefilters: tuple[re.Pattern[bytes], ...] = ()
+) -> dict[str, FileSummary]:
+    """Summaries of the .ini files under base_path, sorted by path (see scan_ini_files for prefilters)."""
+    return scan_ini_files(iter_ini_files(base_path), cache, workers, prefilters=prefilters)
@@ -0,0 +1,88 @@
+# scripts/sage_ini/summary.py
+"""
+Compact summaries of parsed INI files: what the reports and codemods need to pick their
+objects (names, KindOf, costs, respawn rules, with their spans) without the full model.
+
+Summaries are plain data, so they can be cached on disk and sent between processes.
+"""
+
+from dataclasses import dataclass, field
+
+from sage_ini.model import IniFile, Span
+
+# Fields kept per object: every occurrence, nested modules included, in file order
+SUMMARY_FIELDS = ("KindOf", "BuildCost", "BuildTime", "CommandPoints", "RespawnRules", "MaxHealth", "DisplayName")
+_SUMMARY_KEYS = {key.lower(): key for key in SUMMARY_FIELDS}
+
+
+@dataclass(slots=True)
+class ObjectSummary:
+    name: str
+    kind: str  # Object, ChildObject or ObjectReskin
+    parent: str | None
+    line: int
+    span: Span
+    # Field name -> [(value, value span)]
+    values: dict[str, list[tuple[str, Span]]] = field(default_factory=dict)
+
+    def first(self, key: str) -> str | None:
+        """First word of the first value of a field, None if the object does not set it."""
+        occurrences = self.values.get(key)
+        if not occurrences or not occurrences[0][0].split():
+            return None
+        return occurrences[0][0].split()[0]
+
+    @property
+    def kind_of(self) -> list[str]:
+        return [word.upper() for value, _ in self.values.get("KindOf", ()) for word in value.split()]
+
+    @property
+    def is_hero(self) -> bool:
+        return "HERO" in self.kind_of
+
+    @property
+    def respawn_rules(self) -> list[str]:
+        return [value for value, _ in self.values.get("RespawnRules", ())]
+
+
+@dataclass(slots=True)
+class FileSummary:
+    path: str
+    objects: list[ObjectSummary] = field(default_factory=list)
+    defines: dict[str, str] = field(default_factory=dict)
+    includes: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "objects": [[o.name, o.kind, o.parent, o.line, list(o.span), {k: [[v, list(s)] for v, s in vs] for k, vs in o.values.items()}] for o in self.objects],
+            "defines": self.defines,
+            "includes": self.includes,
+            "errors": self.errors,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FileSummary":
+        objects = [
+            ObjectSummary(name, kind, parent, line, tuple(span), {k: [(v, tuple(s)) for v, s in vs] for k, vs in values.items()})
+            for name, kind, parent, line, span, values in data["objects"]
+        ]
+        return cls(data["path"], objects, data["defines"], data["includes"], data["errors"])
+
+
+def parse_errors(summaries: dict[str, FileSummary]) -> list[str]:
+    """Parse errors of every file, in the order of the summaries: a file with errors may be missing objects or fields."""
+    return [error for summary in summaries.values() for error in summary.errors]
+
+
+def summarize_ini(ini: IniFile) -> FileSummary:
+    summary = FileSummary(ini.path, defines=ini.defines, includes=ini.includes, errors=list(ini.errors))
+    for block in ini.objects:
+        values: dict[str, list[tuple[str, Span]]] = {}
+        for item in block.iter_fields():
+            key = _SUMMARY_KEYS.get(item.key.lower())
+            if key is not None:
+                values.setdefault(key, []).append((item.value, item.value_span))
+        summary.objects.append(ObjectSummary(block.name or "", block.kind, block.parent_name, block.line, block.span, values))
+    return summary
@@ -1,10 +1,10 @@
 # config.py
 import os
-
-import pkg_resources
+from importlib.metadata import version
 
 __APP_NAME__ = "rotwk-trowmod-switcher"
-__APP_VERSION__ = pkg_resources.require("rotwk_trowmod_switcher")[0].version
+# Only reads the installed metadata: unlike pkg_resources.require, it does not fail when a dependency is missing
+__APP_VERSION__ = version("rotwk_trowmod_switcher")
 UPDATER_GITHUB_REPO = "giuseppelagualano/rotwk-trowmod-switcher"
 GAME_EXE_NAME = "lotrbfme2ep1.exe"
 GAME_PROCESS_NAMES = ["lotrbfme2ep1.exe", "game.dat"]
@@ -13,6 +13,10 @@ GAME_PROCESS_NAMES = ["lotrbfme2ep1.exe", "game.dat"]
 REPO_OWNER = "SymoniusGit"
 REPO_NAME = "TROWMod"
 
+# GitHub endpoints, overridable to point the updaters at a local stand-in (e.g. the benchmarks)
+GITHUB_API_URL = os.getenv("TROWMOD_GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_URL = os.getenv("TROWMOD_GITHUB_URL", "https://github.com").rstrip("/")
+
 # --- Registry Settings ---
 REGISTRY_PATHS_ROTWK = [
     r"SOFTWARE\Wow6432Node\Electronic Arts\Electronic Arts\The Lord of the Rings, The Rise of the Witch-king",
@@ -20,13 +24,49 @@ REGISTRY_PATHS_ROTWK = [
 ]
 
 # LOCAL SAVINGS
-APPDATA_FOLDER = os.getenv("LOCALAPPDATA") + "/RotWKTROWModSwitcher/"
+# LOCALAPPDATA only exists on Windows, fall back to the XDG data folder elsewhere (build boxes, benchmarks)
+APPDATA_FOLDER = (os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "share")) + "/RotWKTROWModSwitcher/"
 UPDATE_INFO_FILE_NAME = "update_info.json"
 CONFIG_FILE_NAME = "config.ini"
 CONFIG_PATH_SECTION = "paths"
 LOCAL_CONTENT_KEY = "local_mod_path"
 ROTWK_CONTENT_KEY = "rotwk_game_path"
 VERSION_MARKER_FILENAME = "trowmod_version.json"
+JOB_HISTORY_FILE_NAME = "job_history.json"
+
+# Per-run log files, under APPDATA_FOLDER
+LOG_FOLDER_NAME = "logs"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # rotate a run log above this size
+LOG_BACKUP_COUNT = 3  # compressed segments kept per run
+LOG_RUNS_KEPT = 10  # previous runs kept besides the current one
+
+# Per-run timing reports, under APPDATA_FOLDER
+METRICS_FOLDER_NAME = "reports"
+METRICS_REPORTS_KEPT = 20
+
+# Opt-in profiling of the build entry points: TROWMOD_PROFILE=1 or "profile = true" in [debug]
+CONFIG_DEBUG_SECTION = "debug"
+PROFILE_KEY = "profile"
+PROFILE_ENV_VAR = "TROWMOD_PROFILE"
+PROFILE_RUNS_KEPT = 10
+PROFILE_ALLOCATIONS_TOP = 30
+
+# Build settings, [build] section of config.ini
+CONFIG_BUILD_SECTION = "build"
+# skip_vanilla_identical = true leaves out of the INI and arts archives the files the base game already ships
+SKIP_VANILLA_IDENTICAL_KEY = "skip_vanilla_identical"
+SKIP_VANILLA_IDENTICAL_ENV_VAR = "TROWMOD_SKIP_VANILLA_IDENTICAL"
+# deduplicate_entries = false writes every entry body even when the same bytes are already in the archive
+DEDUPLICATE_ENTRIES_KEY = "deduplicate_entries"
+DEDUPLICATE_ENTRIES_ENV_VAR = "TROWMOD_DEDUPLICATE_ENTRIES"
+CACHE_FOLDER_NAME = "cache"  # incremental indexes, under APPDATA_FOLDER
+
+# Last-known values painted at startup before live checks complete
+CONFIG_CACHE_SECTION = "startup_cache"
+CACHED_INSTALL_PATH_KEY = "install_path"
+CACHED_LATEST_TAG_KEY = "latest_mod_tag"
+CACHED_INSTALLED_VERSION_KEY = "installed_mod_version"
+CACHED_INSTALL_FINGERPRINT_KEY = "install_fingerprint"
 
 # Net requests settings
 REQUEST_TIMEOUT = 30  # seconds
@@ -1,60 +1,165 @@
 # core/archiver.py
+import contextvars
 import json
 import logging
 import os
 import shutil
 import subprocess
-import tempfile
-import time
+import sys
 from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
-from pyBIG import Archive
-
-from rotwk_trowmod_switcher.config import VERSION_MARKER_FILENAME
+from rotwk_trowmod_switcher.config import (
+    APPDATA_FOLDER,
+    CONFIG_BUILD_SECTION,
+    CONFIG_FILE_NAME,
+    DEDUPLICATE_ENTRIES_ENV_VAR,
+    DEDUPLICATE_ENTRIES_KEY,
+    SKIP_VANILLA_IDENTICAL_ENV_VAR,
+    SKIP_VANILLA_IDENTICAL_KEY,
+    VERSION_MARKER_FILENAME,
+)
 from rotwk_trowmod_switcher.core.big_archiver.costants import (
     DEFAULT_ARTS_ARCHIVE_NAME,
     DEFAULT_DATA1_ARCHIVE_NAME,
     DEFAULT_INI_ARCHIVE_NAME,
     DEFAULT_ITLANG_ARCHIVE_NAME,
+    PARTIAL_ARCHIVE_SUFFIX,
 )
+from rotwk_trowmod_switcher.core.big_archiver.load_order import analyze_load_order, default_load_order_index_path, log_load_order_report
+from rotwk_trowmod_switcher.core.big_archiver.reader import BigFormatError
 from rotwk_trowmod_switcher.core.big_archiver.utils import check_duplicate_keys_in_str_file
-from rotwk_trowmod_switcher.core.utils import remove_trailing_slashes
+from rotwk_trowmod_switcher.core.big_archiver.vanilla_index import VanillaIndex, default_vanilla_digests_path, default_vanilla_index_path
+from rotwk_trowmod_switcher.core.big_archiver.writer import write_big_archive
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, JobCancelledError, ProgressReporter, raise_if_cancelled
+from rotwk_trowmod_switcher.core.logging_setup import log_stage
+from rotwk_trowmod_switcher.core.metrics import (
+    OUTCOME_FAILED,
+    OUTCOME_SUCCEEDED,
+    STAGE_ASSET_CACHE,
+    STAGE_COPY,
+    STAGE_INSTALL,
+    STAGE_MARKER,
+    STAGE_PACK,
+    BuildMetrics,
+    count,
+    measure_run,
+    span,
+)
+from rotwk_trowmod_switcher.core.profiling import profiled
+from rotwk_trowmod_switcher.core.utils import TRUE_VALUES, load_setting, remove_trailing_slashes
 
 logger = logging.getLogger(__name__)
 
+# Counters of the build report
+COUNTER_DUPLICATE_ENTRIES = "duplicate_entries"
+COUNTER_DUPLICATE_BYTES = "duplicate_bytes_saved"
 
-def create_trowmod_ini_big_archive(source_dir_path: str, output_dir_path: str, archive_name: str) -> bool:
-    output_dir_path = remove_trailing_slashes(output_dir_path)
-    source_dir_path = remove_trailing_slashes(source_dir_path)
-    archive_path = output_dir_path + "/" + archive_name
+# Share of the whole job progress taken by packing when the archives are built after a download
+PACK_PROGRESS_WEIGHT = 60.0
 
-    try:
-        logger.info(f"Creating BIG archive from directory: {source_dir_path}")
 
-        with tempfile.TemporaryDirectory(prefix="pybig_ini_") as temp_staging_dir_str:
-            logger.debug(f"Using temporary directory for staging ini archive: {temp_staging_dir_str}")
+def collect_archive_files(source_dir_path: str, archive_prefix: str = "") -> list[tuple[str, str]]:
+    """
+    Lists the files to pack from a source directory, with their name inside the archive.
 
-            logger.info(f"Copying '{source_dir_path}' to '{temp_staging_dir_str}'...")
-            shutil.copytree(
-                source_dir_path + "/data",
-                temp_staging_dir_str + "/data",
-                dirs_exist_ok=True,
-            )
-            logger.debug("Copy complete.")
+    Args:
+        source_dir_path: The directory whose content is packed.
+        archive_prefix: Folder prepended to every name inside the archive (e.g. 'data').
+
+    Returns:
+        A list of (file path on disk, name in archive) tuples. Archive names use '\\' as separator.
+    """
+    files = []
+    for dir_name, _, file_names in os.walk(source_dir_path):
+        for file_name in file_names:
+            file_path = os.path.join(dir_name, file_name)
+            relative_name = os.path.relpath(file_path, source_dir_path)
+            if archive_prefix:
+                relative_name = os.path.join(archive_prefix, relative_name)
+            files.append((file_path, relative_name.replace("/", "\\").replace(os.sep, "\\")))
+    return files
+
+
+def is_deduplication_enabled() -> bool:
+    """Identical entry bodies are written once unless `deduplicate_entries = false` in config.ini [build] or DEDUPLICATE_ENTRIES_ENV_VAR says so."""
+    value = load_setting(APPDATA_FOLDER + CONFIG_FILE_NAME, CONFIG_BUILD_SECTION, DEDUPLICATE_ENTRIES_KEY, DEDUPLICATE_ENTRIES_ENV_VAR, "true")
+    return value.lower() in TRUE_VALUES
+
+
+def pack_files_into_archive(
+    files: list[tuple[str, str]],
+    archive_path: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> None:
+    """
+    Packs the given files into a BIG archive, reporting one progress step per entry.
+    The output is byte-reproducible, see writer.py.
 
-            logger.info(f"Creating INI BIG archive from directory: {temp_staging_dir_str}")
+    The archive is written to archive_path + PARTIAL_ARCHIVE_SUFFIX: the caller renames it
+    into place once every archive of the build is ready, so a cancelled or killed build
+    never leaves a half-written archive in the game directory.
 
-            archive = Archive.from_directory(temp_staging_dir_str)
+    Raises:
+        JobCancelledError: If the token is cancelled. The partial file is removed.
+    """
+    progress = progress or ProgressReporter()
+    stage = f"pack:{os.path.basename(archive_path)}"
+    partial_path = archive_path + PARTIAL_ARCHIVE_SUFFIX
+
+    progress.set_total(stage, len(files))
+    with span(STAGE_PACK) as pack_span:
+        logger.info(f"Saving archive to: {partial_path}")
+        try:
+            result = write_big_archive(files, partial_path, progress, stage, cancel_token, deduplicate=is_deduplication_enabled())
+        except BaseException:
+            remove_partial_archive(archive_path)
+            raise
+        pack_span.add(bytes_read=result.contents_size, bytes_written=result.archive_size, files=len(files))
+    count(COUNTER_DUPLICATE_ENTRIES, result.duplicate_entries)
+    count(COUNTER_DUPLICATE_BYTES, result.duplicate_bytes)
+    if result.duplicate_entries:
+        logger.info(f"{result.duplicate_entries} entries of {os.path.basename(archive_path)} reuse an identical body ({result.duplicate_bytes / 1_048_576:.1f} MB saved).")
+    progress.finish(stage)
+
+
+def remove_partial_archive(archive_path: str) -> None:
+    """Removes the partial file of an archive if a build left it behind."""
+    partial_path = archive_path + PARTIAL_ARCHIVE_SUFFIX
+    try:
+        os.remove(partial_path)
+        logger.debug(f"Removed partial archive: {partial_path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove partial archive '{partial_path}': {e}")
 
-            logger.info(f"Saving archive to: {archive_path}")
-            archive.save(archive_path)
 
-            logger.info(f"Archive created successfully: {archive_path}")
+def create_trowmod_ini_big_archive(
+    source_dir_path: str,
+    output_dir_path: str,
+    archive_name: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+    vanilla_index: VanillaIndex | None = None,
+) -> bool:
+    output_dir_path = remove_trailing_slashes(output_dir_path)
+    source_dir_path = remove_trailing_slashes(source_dir_path)
+    archive_path = output_dir_path + "/" + archive_name
 
+    try:
+        logger.info(f"Creating INI BIG archive from directory: {source_dir_path}/data")
+        files = collect_archive_files(source_dir_path + "/data", "data")
+        if vanilla_index is not None:
+            files = vanilla_index.filter_files(files, cancel_token)
+        pack_files_into_archive(files, archive_path, progress, cancel_token)
+        logger.info(f"Archive created successfully: {archive_path}")
         return True
 
+    except JobCancelledError:
+        raise
     except OSError as e:
         logger.error(f"OS error during archive creation: {e}", exc_info=True)
         return False
@@ -67,15 +172,23 @@ def build_asset_dat(source_dir_path: str) -> bool:
     exe_path = source_dir_path + "/arts/AssetCacheBuilder.exe"
     error_log_path = source_dir_path + "/arts/asseterrors.log"
 
+    if sys.platform != "win32":
+        logger.warning("AssetCacheBuilder.exe can only run on Windows, keeping the asset.dat found in arts.")
+        return False
+
     logger.info(f"Running AssetCacheBuilder.exe from: {exe_path}")
     try:
-        result = subprocess.run(
-            [exe_path],
-            capture_output=True,
-            text=True,
-            cwd=source_dir_path + "/arts",
-            creationflags=subprocess.CREATE_NO_WINDOW,
-        )
+        # Only the wall time is meaningful: the CPU time is spent in the child process
+        with span(STAGE_ASSET_CACHE) as asset_cache_span:
+            result = subprocess.run(
+                [exe_path],
+                capture_output=True,
+                text=True,
+                cwd=source_dir_path + "/arts",
+                creationflags=subprocess.CREATE_NO_WINDOW,
+            )
+            if os.path.isfile(source_dir_path + "/arts/asset.dat"):
+                asset_cache_span.add(bytes_written=os.path.getsize(source_dir_path + "/arts/asset.dat"), files=1)
         logger.info(f"AssetCacheBuilder.exe exited with return code: {result.returncode}")
         if result.stdout:
             logger.debug(f"AssetCacheBuilder stdout:\n{result.stdout.strip()}")
@@ -105,13 +218,10 @@ def build_asset_dat(source_dir_path: str) -> bool:
     return True
 
 
-def create_trowmod_arts_big_archive(source_dir_path: str, output_dir_path: str, archive_name: str) -> bool:
+def install_asset_dat(source_dir_path: str, output_dir_path: str) -> None:
+    """Disables the game's asset.dat and copies the one built for the mod in its place."""
     output_dir_path = remove_trailing_slashes(output_dir_path)
     source_dir_path = remove_trailing_slashes(source_dir_path)
-    archive_path = output_dir_path + "/" + archive_name
-
-    # Execute AssetCacheBuilder.exe
-    build_asset_dat(source_dir_path=source_dir_path)
 
     logger.info("Disable old asset.dat renaming it to asset.dat.disabled...")
     try:
@@ -120,29 +230,44 @@ def create_trowmod_arts_big_archive(source_dir_path: str, output_dir_path: str,
         logger.warning("asset.dat not found, skipping renaming.")
 
     logger.info("Insert new asset.dat from mod...")
-    shutil.copyfile(source_dir_path + "/arts/asset.dat", output_dir_path + "/asset.dat")
-
-    try:
-        logger.info(f"Creating BIG archive from directory: {source_dir_path}")
-
-        with tempfile.TemporaryDirectory(prefix="pybig_arts_") as temp_staging_dir_str:
-            logger.debug(f"Using temporary directory for staging arts archive: {temp_staging_dir_str}")
-
-            logger.info(f"Copying '{source_dir_path}' to '{temp_staging_dir_str}'...")
-            shutil.copytree(source_dir_path + "/arts", temp_staging_dir_str, dirs_exist_ok=True)
-            logger.debug("Copy complete.")
-
-            logger.info(f"Creating Arts BIG archive from directory: {temp_staging_dir_str}")
-
-            archive = Archive.from_directory(temp_staging_dir_str)
+    with span(STAGE_COPY) as copy_span:
+        shutil.copyfile(source_dir_path + "/arts/asset.dat", output_dir_path + "/asset.dat")
+        asset_size = os.path.getsize(output_dir_path + "/asset.dat")
+        copy_span.add(bytes_read=asset_size, bytes_written=asset_size, files=1)
+
+
+def create_trowmod_arts_big_archive(
+    source_dir_path: str,
+    output_dir_path: str,
+    archive_name: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+    vanilla_index: VanillaIndex | None = None,
+) -> bool:
+    output_dir_path = remove_trailing_slashes(output_dir_path)
+    source_dir_path = remove_trailing_slashes(source_dir_path)
+    archive_path = output_dir_path + "/" + archive_name
 
-            logger.info(f"Saving archive to: {archive_path}")
-            archive.save(archive_path)
+    # Execute AssetCacheBuilder.exe
+    build_asset_dat(source_dir_path=source_dir_path)
+    raise_if_cancelled(cancel_token)
 
-            logger.info(f"Archive created successfully: {archive_path}")
+    # asset.dat is installed with the archives, make sure it exists before packing
+    if not os.path.isfile(source_dir_path + "/arts/asset.dat"):
+        logger.error(f"asset.dat not found in '{source_dir_path}/arts'. Aborting arts archive creation.")
+        return False
 
+    try:
+        logger.info(f"Creating Arts BIG archive from directory: {source_dir_path}/arts")
+        files = collect_archive_files(source_dir_path + "/arts")
+        if vanilla_index is not None:
+            files = vanilla_index.filter_files(files, cancel_token)
+        pack_files_into_archive(files, archive_path, progress, cancel_token)
+        logger.info(f"Archive created successfully: {archive_path}")
         return True
 
+    except JobCancelledError:
+        raise
     except OSError as e:
         logger.error(f"OS error during archive creation: {e}", exc_info=True)
         return False
@@ -151,11 +276,9 @@ def create_trowmod_arts_big_archive(source_dir_path: str, output_dir_path: str,
         return False
 
 
-def create_trowmod_itlang_big_archive(source_dir_path: str, output_dir_path: str, archive_name: str) -> bool:
+def disable_other_italian_lang_files(output_dir_path: str) -> None:
+    """Renames the Italian language archives, except audio ones and the mod's, to *.disabled."""
     output_dir_path = remove_trailing_slashes(output_dir_path)
-    source_dir_path = remove_trailing_slashes(source_dir_path)
-    archive_path = output_dir_path + "/lang/" + archive_name
-
     logger.info("Disabling others Italian language files except audio-related ones and the trowmod file...")
 
     lang_dir_path = os.path.join(output_dir_path, "lang")
@@ -171,6 +294,18 @@ def create_trowmod_itlang_big_archive(source_dir_path: str, output_dir_path: str
     except OSError as e:
         logger.error(f"Error while renaming files in '{lang_dir_path}': {e}", exc_info=True)
 
+
+def create_trowmod_itlang_big_archive(
+    source_dir_path: str,
+    output_dir_path: str,
+    archive_name: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> bool:
+    output_dir_path = remove_trailing_slashes(output_dir_path)
+    source_dir_path = remove_trailing_slashes(source_dir_path)
+    archive_path = output_dir_path + "/lang/" + archive_name
+
     try:
         # Check for duplicate keys in the .str file
         str_file_path = os.path.join(source_dir_path, "lang", "data", "lotr.str")
@@ -181,26 +316,13 @@ def create_trowmod_itlang_big_archive(source_dir_path: str, output_dir_path: str
                 logger.error(f"Duplicate keys found in {str_file_path}. Aborting archive creation.")
                 return False
 
-        logger.info(f"Creating BIG archive from directory: {source_dir_path}")
-
-        with tempfile.TemporaryDirectory(prefix="pybig_lang_") as temp_staging_dir_str:
-            logger.debug(f"Using temporary directory for staging arts archive: {temp_staging_dir_str}")
-
-            logger.info(f"Copying '{source_dir_path}' to '{temp_staging_dir_str}'...")
-            shutil.copytree(source_dir_path + "/lang", temp_staging_dir_str, dirs_exist_ok=True)
-            logger.debug("Copy complete.")
-
-            logger.info(f"Creating IT Lang BIG archive from directory: {temp_staging_dir_str}")
-
-            archive = Archive.from_directory(temp_staging_dir_str)
-
-            logger.info(f"Saving archive to: {archive_path}")
-            archive.save(archive_path)
-
-            logger.info(f"Archive created successfully: {archive_path}")
-
+        logger.info(f"Creating IT Lang BIG archive from directory: {source_dir_path}/lang")
+        pack_files_into_archive(collect_archive_files(source_dir_path + "/lang"), archive_path, progress, cancel_token)
+        logger.info(f"Archive created successfully: {archive_path}")
         return True
 
+    except JobCancelledError:
+        raise
     except OSError as e:
         logger.error(f"OS error during archive creation: {e}", exc_info=True)
         return False
@@ -209,32 +331,25 @@ def create_trowmod_itlang_big_archive(source_dir_path: str, output_dir_path: str
         return False
 
 
-def create_trowmod_data1_big_archive(source_dir_path: str, output_dir_path: str, archive_name: str) -> bool:
+def create_trowmod_data1_big_archive(
+    source_dir_path: str,
+    output_dir_path: str,
+    archive_name: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> bool:
     output_dir_path = remove_trailing_slashes(output_dir_path)
     source_dir_path = remove_trailing_slashes(source_dir_path)
     archive_path = output_dir_path + "/" + archive_name
 
     try:
-        logger.info(f"Creating BIG archive from directory: {source_dir_path}")
-
-        with tempfile.TemporaryDirectory(prefix="pybig_data1_") as temp_staging_dir_str:
-            logger.debug(f"Using temporary directory for staging arts archive: {temp_staging_dir_str}")
-
-            logger.info(f"Copying '{source_dir_path}' to '{temp_staging_dir_str}'...")
-            shutil.copytree(source_dir_path + "/scripts", temp_staging_dir_str, dirs_exist_ok=True)
-            logger.debug("Copy complete.")
-
-            logger.info(f"Creating Data1 BIG archive from directory: {temp_staging_dir_str}")
-
-            archive = Archive.from_directory(temp_staging_dir_str)
-
-            logger.info(f"Saving archive to: {archive_path}")
-            archive.save(archive_path)
-
-            logger.info(f"Archive created successfully: {archive_path}")
-
+        logger.info(f"Creating Data1 BIG archive from directory: {source_dir_path}/scripts")
+        pack_files_into_archive(collect_archive_files(source_dir_path + "/scripts"), archive_path, progress, cancel_token)
+        logger.info(f"Archive created successfully: {archive_path}")
         return True
 
+    except JobCancelledError:
+        raise
     except OSError as e:
         logger.error(f"OS error during archive creation: {e}", exc_info=True)
         return False
@@ -297,39 +412,134 @@ def execute_and_log_operations(
     return all_successful
 
 
-def create_big_archives(source_content_path: str, game_path: str, logger: logging.Logger, mod_version: str) -> bool:
+def _submit_in_stage(executor: ThreadPoolExecutor, stage: str, func: Callable[..., bool], **kwargs: Any):
+    """Submits func with the caller's logging context (job id) and the given stage."""
+    context = contextvars.copy_context()
+
+    def run() -> bool:
+        with log_stage(stage):
+            return func(**kwargs)
+
+    return executor.submit(context.run, run)
+
+
+def is_skip_vanilla_identical_enabled() -> bool:
+    """The pack filter is enabled by `skip_vanilla_identical = true` in config.ini [build] or by SKIP_VANILLA_IDENTICAL_ENV_VAR."""
+    value = load_setting(APPDATA_FOLDER + CONFIG_FILE_NAME, CONFIG_BUILD_SECTION, SKIP_VANILLA_IDENTICAL_KEY, SKIP_VANILLA_IDENTICAL_ENV_VAR, "")
+    return value.lower() in TRUE_VALUES
+
+
+def open_vanilla_index(game_path: str) -> VanillaIndex | None:
+    """The index of the base game archives if the pack filter is enabled, None otherwise or if it cannot be built."""
+    if not is_skip_vanilla_identical_enabled():
+        return None
+    try:
+        return VanillaIndex(game_path, default_vanilla_digests_path(), index_path=default_vanilla_index_path())
+    except (OSError, BigFormatError) as e:
+        logger.warning(f"Packing every file, could not index the base game archives of '{game_path}': {e}")
+        return None
+
+
+def report_load_order(game_path: str) -> None:
+    """Logs the mod entries shadowed by other archives of the installation. Never fails the build."""
+    try:
+        with log_stage("load-order"):
+            log_load_order_report(analyze_load_order(game_path, index_path=default_load_order_index_path()))
+    except (OSError, BigFormatError) as e:
+        logger.warning(f"Could not analyze the load order of '{game_path}': {e}")
+
+
+def _count_files(dir_path: str) -> int:
+    return sum(len(file_names) for _, _, file_names in os.walk(dir_path))
+
+
+@profiled("create_big_archives")
+def create_big_archives(
+    source_content_path: str,
+    game_path: str,
+    logger: logging.Logger,
+    mod_version: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+    metrics: BuildMetrics | None = None,
+) -> bool:
     """
     Creates the necessary .big archives using the generic function, parallelizing the operations while keeping logs ordered.
+
+    Archives are first written as partial files. Only when all of them are ready (and the
+    job was not cancelled) they are renamed into place and asset.dat, the language files
+    and the version marker are installed.
+
+    Every stage is measured in metrics (or in the metrics of the enclosing run, e.g. a
+    remote update); a standalone build writes its own timing report.
+
+    Raises:
+        JobCancelledError: If the token is cancelled. Partial archives are removed and the
+                           game directory is left untouched.
     """
-    start_time = time.time()  # Start the timer
-    # Define the operations to execute
+    with measure_run("build", metrics) as run_metrics:
+        success = _create_big_archives(source_content_path, game_path, logger, mod_version, progress, cancel_token)
+        run_metrics.outcome = OUTCOME_SUCCEEDED if success else OUTCOME_FAILED
+    return success
+
+
+def _create_big_archives(
+    source_content_path: str,
+    game_path: str,
+    logger: logging.Logger,
+    mod_version: str,
+    progress: ProgressReporter | None,
+    cancel_token: CancellationToken | None,
+) -> bool:
+    progress = progress or ProgressReporter()
+    # Optional pack filter of the INI and arts archives, read before the archives are replaced
+    vanilla_index = open_vanilla_index(game_path)
+
+    # Define the operations to execute: (function, specific args, source folder, installed archive path)
     archive_operations = [
-        (create_trowmod_ini_big_archive, {"archive_name": DEFAULT_INI_ARCHIVE_NAME}),
-        (create_trowmod_arts_big_archive, {"archive_name": DEFAULT_ARTS_ARCHIVE_NAME}),
+        (create_trowmod_ini_big_archive, {"archive_name": DEFAULT_INI_ARCHIVE_NAME, "vanilla_index": vanilla_index}, "data", DEFAULT_INI_ARCHIVE_NAME),
+        (create_trowmod_arts_big_archive, {"archive_name": DEFAULT_ARTS_ARCHIVE_NAME, "vanilla_index": vanilla_index}, "arts", DEFAULT_ARTS_ARCHIVE_NAME),
         (
             create_trowmod_itlang_big_archive,
             {"archive_name": DEFAULT_ITLANG_ARCHIVE_NAME},
+            "lang",
+            "lang/" + DEFAULT_ITLANG_ARCHIVE_NAME,
         ),
         (
             create_trowmod_data1_big_archive,
             {"archive_name": DEFAULT_DATA1_ARCHIVE_NAME},
+            "scripts",
+            DEFAULT_DATA1_ARCHIVE_NAME,
         ),
     ]
+    archive_paths = [os.path.join(game_path, installed_path) for _, _, _, installed_path in archive_operations]
+
+    # Share the packing progress between the archives according to their number of entries
+    file_counts = {specific_args["archive_name"]: _count_files(os.path.join(source_content_path, source_folder)) for _, specific_args, source_folder, _ in archive_operations}
+    total_files = sum(file_counts.values()) or 1
+    for archive_name, file_count in file_counts.items():
+        progress.add_stage(f"pack:{archive_name}", PACK_PROGRESS_WEIGHT * max(file_count, 1) / total_files, "entries")
 
     # Define the common arguments
     common_arguments = {
         "source_dir_path": source_content_path,
         "output_dir_path": game_path,
+        "progress": progress,
+        "cancel_token": cancel_token,
     }
 
     logger.info("Proceeding to create the big archives...")
 
     results = []
     all_successful = True
+    cancelled = False
 
     # Use ThreadPoolExecutor for parallel execution
     with ThreadPoolExecutor() as executor:
-        future_to_operation = {executor.submit(func, **{**common_arguments, **specific_args}): (func, specific_args) for func, specific_args in archive_operations}
+        future_to_operation = {
+            _submit_in_stage(executor, f"pack:{specific_args['archive_name']}", func, **common_arguments, **specific_args): (func, specific_args)
+            for func, specific_args, _, _ in archive_operations
+        }
 
         for future in as_completed(future_to_operation):
             func, specific_args = future_to_operation[future]
@@ -341,36 +551,70 @@ def create_big_archives(source_content_path: str, game_path: str, logger: loggin
                 else:
                     logger.warning(f"Operation {func.__name__} failed.")
                     all_successful = False
+            except JobCancelledError:
+                logger.warning(f"Operation {func.__name__} cancelled.")
+                cancelled = True
+                all_successful = False
             except Exception as e:
                 logger.error(f"Exception during operation {func.__name__}: {e}", exc_info=True)
                 results.append(False)
                 all_successful = False
 
-    if all_successful:
-        logger.info("Archives creation reported success.")
-    else:
+    if vanilla_index is not None:
+        vanilla_index.close()
+
+    # Last safe point before touching the game directory
+    if not cancelled and cancel_token is not None and cancel_token.cancelled:
+        cancelled = True
+        all_successful = False
+
+    if not all_successful:
+        for archive_path in archive_paths:
+            remove_partial_archive(archive_path)
+        if cancelled:
+            logger.warning("Archives creation cancelled, the game directory was left untouched.")
+            raise JobCancelledError("Archives creation cancelled by the user.")
         logger.error("Archives creation reported failure.")
+        return False
 
-    if all_successful:
-        # --- Write the version marker file as JSON ---
-        marker_file_path = os.path.join(game_path, VERSION_MARKER_FILENAME)
-        logger.info(f"Writing version marker JSON to: {marker_file_path}")
-        try:
-            # Prepare data as a dictionary
-            version_data = {
-                "version": mod_version,
-            }
-            # Write dictionary as JSON
-            with open(marker_file_path, "w", encoding="utf-8") as f:
-                json.dump(version_data, f, indent=4, ensure_ascii=False)  # Use indent for readability
-            logger.info("Version marker JSON file written successfully.")
-        except OSError as e:
-            logger.error(f"Failed to write version marker JSON file '{marker_file_path}': {e}", exc_info=True)
-            return False
-        except Exception as e:
-            logger.error(f"An unexpected error occurred writing version marker JSON: {e}", exc_info=True)
-            return False
+    logger.info("Archives creation reported success.")
+
+    # --- Install the archives and the files that go with them ---
+    try:
+        with log_stage("install"):
+            with span(STAGE_INSTALL) as install_span:
+                for archive_path in archive_paths:
+                    logger.info(f"Installing archive: {archive_path}")
+                    os.replace(archive_path + PARTIAL_ARCHIVE_SUFFIX, archive_path)
+                    install_span.add(files=1)
+            install_asset_dat(source_content_path, game_path)
+            disable_other_italian_lang_files(game_path)
+    except OSError as e:
+        logger.error(f"Failed to install the archives in '{game_path}': {e}", exc_info=True)
+        for archive_path in archive_paths:
+            remove_partial_archive(archive_path)
+        return False
+
+    report_load_order(game_path)
+
+    # --- Write the version marker file as JSON ---
+    marker_file_path = os.path.join(game_path, VERSION_MARKER_FILENAME)
+    logger.info(f"Writing version marker JSON to: {marker_file_path}")
+    try:
+        # Prepare data as a dictionary
+        version_data = {
+            "version": mod_version,
+        }
+        # Write dictionary as JSON
+        with log_stage("marker"), span(STAGE_MARKER) as marker_span, open(marker_file_path, "w", encoding="utf-8") as f:
+            json.dump(version_data, f, indent=4, ensure_ascii=False)  # Use indent for readability
+            marker_span.add(bytes_written=f.tell(), files=1)
+        logger.info("Version marker JSON file written successfully.")
+    except OSError as e:
+        logger.error(f"Failed to write version marker JSON file '{marker_file_path}': {e}", exc_info=True)
+        return False
+    except Exception as e:
+        logger.error(f"An unexpected error occurred writing version marker JSON: {e}", exc_info=True)
+        return False
 
-    elapsed_time = time.time() - start_time  # Calculate elapsed time
-    logger.debug(f"Time elapsed for creating big archives: {elapsed_time:.2f} seconds")
     return all_successful
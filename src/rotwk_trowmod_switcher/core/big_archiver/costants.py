@@ -2,3 +2,6 @@ DEFAULT_INI_ARCHIVE_NAME = "!TROWMOD_INI.big"
 DEFAULT_ARTS_ARCHIVE_NAME = "!TROWMOD_Arts.big"
 DEFAULT_ITLANG_ARCHIVE_NAME = "Italian_TROWMOD.big"
 DEFAULT_DATA1_ARCHIVE_NAME = "!TROWMOD_Data1.big"
+
+# Archives are written next to their final path with this suffix, then renamed into place
+PARTIAL_ARCHIVE_SUFFIX = ".partial"
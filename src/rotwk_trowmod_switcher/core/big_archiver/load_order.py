@@ -0,0 +1,226 @@
+# core/big_archiver/load_order.py
+"""
+Load-order analysis of the .big archives of a RotWK installation.
+
+Every archive of the game directory and of lang/ is indexed with the memory-mapped
+reader, giving a map: entry path -> archives providing it, in load order. Entry lists
+are cached by archive size and mtime, so only new or rebuilt archives are re-read.
+
+The load order is ASSUMED to be the one of the '!' prefix convention used by the mod:
+archives are read by file name in ascending case-insensitive order (as listed by NTFS)
+and the first archive providing a path wins. Loose files in the game directory are not
+considered.
+
+Usage:
+    python -m rotwk_trowmod_switcher.core.big_archiver.load_order "<RotWK path>" [--json report.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from rotwk_trowmod_switcher.config import APPDATA_FOLDER, CACHE_FOLDER_NAME
+from rotwk_trowmod_switcher.core.big_archiver.costants import (
+    DEFAULT_ARTS_ARCHIVE_NAME,
+    DEFAULT_DATA1_ARCHIVE_NAME,
+    DEFAULT_INI_ARCHIVE_NAME,
+    DEFAULT_ITLANG_ARCHIVE_NAME,
+)
+from rotwk_trowmod_switcher.core.big_archiver.reader import BigArchive, BigFormatError, normalize_entry_name
+
+logger = logging.getLogger(__name__)
+
+MOD_ARCHIVE_NAMES = (DEFAULT_INI_ARCHIVE_NAME, DEFAULT_ARTS_ARCHIVE_NAME, DEFAULT_ITLANG_ARCHIVE_NAME, DEFAULT_DATA1_ARCHIVE_NAME)
+LOAD_ORDER_INDEX_FILE_NAME = "load_order_index.json"
+INDEX_VERSION = 1
+
+# Entries listed per category in the log, the JSON report has all of them
+LOGGED_ENTRIES_LIMIT = 20
+
+
+@dataclass
+class LoadOrderReport:
+    """
+    Result of analyze_load_order. Archives are named by their path relative to the game
+    directory (e.g. 'lang/Italian_TROWMOD.big').
+    """
+
+    archives: list[str]
+    providers: dict[str, list[str]]
+    mod_archives: list[str]
+    # Mod entry -> the archive loaded before it that provides the same path (the mod file is ignored)
+    shadowed: dict[str, str] = field(default_factory=dict)
+    # Mod entry -> the other archives whose version of the path it replaces
+    overrides: dict[str, list[str]] = field(default_factory=dict)
+    reindexed: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "archives": self.archives,
+            "mod_archives": self.mod_archives,
+            "entries": len(self.providers),
+            "shadowed": self.shadowed,
+            "overrides": self.overrides,
+        }
+
+
+def list_game_archives(game_path: str) -> list[str]:
+    """The .big archives of the game directory and of lang/, in load order, relative to game_path."""
+    archives = []
+    for folder in ("", "lang"):
+        try:
+            with os.scandir(os.path.join(game_path, folder)) as entries:
+                archives.extend(os.path.join(folder, entry.name).replace(os.sep, "/") for entry in entries if entry.is_file() and entry.name.lower().endswith(".big"))
+        except FileNotFoundError:
+            continue
+    archives.sort(key=lambda archive: (os.path.basename(archive).lower(), archive.lower()))
+    return archives
+
+
+def default_load_order_index_path() -> str:
+    return os.path.join(APPDATA_FOLDER, CACHE_FOLDER_NAME, LOAD_ORDER_INDEX_FILE_NAME)
+
+
+def _load_index(index_path: str | None) -> dict[str, dict]:
+    if not index_path or not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data["archives"] if data.get("version") == INDEX_VERSION else {}
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable load-order index '{index_path}': {e}")
+        return {}
+
+
+def _save_index(index_path: str, archives: dict[str, dict]) -> None:
+    try:
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "archives": archives}, f)
+    except OSError as e:
+        logger.warning(f"Could not save the load-order index '{index_path}': {e}")
+
+
+def read_entry_names(archive_path: str) -> list[str]:
+    """Normalized entry names of an archive. Only the index of the archive is read."""
+    with BigArchive(archive_path) as archive:
+        return [normalize_entry_name(name) for name in archive.names()]
+
+
+def index_game_archives(game_path: str, archives: list[str], index_path: str | None = None) -> tuple[dict[str, list[str]], int]:
+    """
+    Entry names of every archive, reusing the cached lists of unchanged archives.
+    Unreadable archives are logged and left out.
+
+    Returns:
+        (archive -> normalized entry names, number of archives actually read)
+    """
+    previous = _load_index(index_path)
+    cache: dict[str, dict] = {}
+    names: dict[str, list[str]] = {}
+    to_read: list[tuple[str, str, list[int]]] = []
+
+    for archive in archives:
+        archive_path = os.path.join(game_path, archive)
+        try:
+            stat = os.stat(archive_path)
+        except OSError as e:
+            logger.warning(f"Skipping archive '{archive}': {e}")
+            continue
+        key = os.path.abspath(archive_path).lower()
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        cached = previous.get(key)
+        if cached is not None and cached["stamp"] == stamp:
+            names[archive] = cached["names"]
+            cache[key] = cached
+        else:
+            to_read.append((archive, key, stamp))
+
+    def read(task: tuple[str, str, list[int]]) -> list[str] | None:
+        archive, _, _ = task
+        try:
+            return read_entry_names(os.path.join(game_path, archive))
+        except (OSError, BigFormatError) as e:
+            logger.warning(f"Skipping unreadable archive '{archive}': {e}")
+            return None
+
+    with ThreadPoolExecutor(thread_name_prefix="big-index") as executor:
+        for (archive, key, stamp), entry_names in zip(to_read, executor.map(read, to_read), strict=True):
+            if entry_names is not None:
+                names[archive] = entry_names
+                cache[key] = {"stamp": stamp, "names": entry_names}
+
+    if index_path:
+        # Entries of other installations are kept, the removed archives of this one drop out
+        game_prefix = os.path.join(os.path.abspath(game_path), "").lower()
+        _save_index(index_path, {**{key: value for key, value in previous.items() if not key.startswith(game_prefix)}, **cache})
+    return names, len(to_read)
+
+
+def analyze_load_order(game_path: str, mod_archive_names: tuple[str, ...] = MOD_ARCHIVE_NAMES, index_path: str | None = None) -> LoadOrderReport:
+    """
+    Builds the path -> [archives in load order] map of an installation and finds the mod
+    entries shadowed by an archive loaded earlier, or overriding other archives.
+    """
+    archives = list_game_archives(game_path)
+    names, reindexed = index_game_archives(game_path, archives, index_path)
+
+    providers: dict[str, list[str]] = {}
+    for archive in archives:
+        for name in names.get(archive, ()):
+            providers.setdefault(name, []).append(archive)
+
+    mod_names = {name.lower() for name in mod_archive_names}
+    mod_archives = [archive for archive in archives if os.path.basename(archive).lower() in mod_names]
+    report = LoadOrderReport(archives=[a for a in archives if a in names], providers=providers, mod_archives=mod_archives, reindexed=reindexed)
+
+    for mod_archive in mod_archives:
+        for name in names.get(mod_archive, ()):
+            archives_providing = providers[name]
+            winner = archives_providing[0]
+            if winner != mod_archive:
+                report.shadowed.setdefault(name, winner)
+            else:
+                others = [archive for archive in archives_providing[1:] if archive != mod_archive]
+                if others:
+                    report.overrides[name] = others
+    return report
+
+
+def log_load_order_report(report: LoadOrderReport, log: logging.Logger = logger) -> None:
+    log.info(
+        f"Load order: {len(report.archives)} archives, {len(report.providers)} entries, "
+        f"{len(report.overrides)} mod overrides, {len(report.shadowed)} shadowed mod entries ({report.reindexed} archives re-indexed)."
+    )
+    if not report.mod_archives:
+        log.info("No TROWMod archive found in the game directory.")
+    for name, winner in list(report.shadowed.items())[:LOGGED_ENTRIES_LIMIT]:
+        log.warning(f"Mod entry '{name}' is shadowed by '{winner}'.")
+    if len(report.shadowed) > LOGGED_ENTRIES_LIMIT:
+        log.warning(f"... and {len(report.shadowed) - LOGGED_ENTRIES_LIMIT} more shadowed mod entries.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reports the TROWMod entries shadowed by, or overriding, other .big archives of a RotWK installation.")
+    parser.add_argument("game_path", help="RotWK installation directory.")
+    parser.add_argument("--json", help="Write the full report to this file.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-read every archive instead of using the cached index.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    report = analyze_load_order(args.game_path, index_path=None if args.no_cache else default_load_order_index_path())
+    log_load_order_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, indent=2)
+        logger.info(f"Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
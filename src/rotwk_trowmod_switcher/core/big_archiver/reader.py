@@ -0,0 +1,220 @@
+# core/big_archiver/reader.py
+"""
+Zero-copy reader of BIG archives (BIGF/BIG4).
+
+Layout: 4-byte magic, uint32 LE archive size, uint32 BE entry count, uint32 BE end of
+the index, then per entry uint32 BE offset, uint32 BE size and a NUL-terminated name.
+
+The archive is memory-mapped; the index is parsed into parallel arrays (offset, size,
+name position in the map), names are only decoded when asked for, and contents are
+returned as memoryview slices of the map.
+"""
+
+import logging
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, ProgressReporter, raise_if_cancelled
+
+logger = logging.getLogger(__name__)
+
+BIG_MAGICS = (b"BIGF", b"BIG4")
+BIG_HEADER_SIZE = 16
+NAME_ENCODING = "latin-1"  # byte-preserving, the format does not define an encoding
+
+_HEADER = struct.Struct(">4sIII")
+_ENTRY = struct.Struct(">II")
+
+
+class BigFormatError(ValueError):
+    """Raised when a file is not a valid BIG archive."""
+
+
+class BigEntry(NamedTuple):
+    name: str
+    offset: int
+    size: int
+
+
+def normalize_entry_name(name: str) -> str:
+    """Canonical form used for lookups: lowercase with backslashes, as the game resolves paths."""
+    return name.replace("/", "\\").lower()
+
+
+class BigArchive:
+    """
+    Read-only, memory-mapped BIG archive.
+
+    Use as a context manager. Memoryviews returned by read() point into the map: release
+    them (or copy with bytes()) before closing the archive.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            self._file.close()
+            raise BigFormatError(f"'{path}' is empty") from e
+        self._view = memoryview(self._map)
+        self._lookup: dict[str, int] | None = None
+        try:
+            self._parse_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse_index(self) -> None:
+        data = self._map
+        if len(data) < BIG_HEADER_SIZE:
+            raise BigFormatError(f"'{self.path}' is too small to be a BIG archive")
+        magic, _, count, _ = _HEADER.unpack_from(data, 0)
+        if magic not in BIG_MAGICS:
+            raise BigFormatError(f"'{self.path}' has an unknown magic {magic!r}")
+        self.magic = magic.decode("ascii")
+
+        self._offsets = array("I")
+        self._sizes = array("I")
+        self._name_starts = array("I")
+        self._name_ends = array("I")
+        file_size = len(data)
+        position = BIG_HEADER_SIZE
+        for _ in range(count):
+            if position + _ENTRY.size > file_size:
+                raise BigFormatError(f"'{self.path}' has a truncated index: entry at byte {position} is past the end of the file")
+            offset, size = _ENTRY.unpack_from(data, position)
+            name_start = position + _ENTRY.size
+            name_end = data.find(b"\0", name_start)
+            if name_end < 0:
+                raise BigFormatError(f"'{self.path}' has an unterminated entry name at byte {name_start}")
+            if offset + size > file_size:
+                raise BigFormatError(f"'{self.path}' has an entry past the end of the file at byte {position}")
+            self._offsets.append(offset)
+            self._sizes.append(size)
+            self._name_starts.append(name_start)
+            self._name_ends.append(name_end)
+            position = name_end + 1
+
+    # --- Lifecycle ---
+    def close(self) -> None:
+        if self._map is None:
+            return
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            logger.warning(f"'{self.path}' closed while entry views are still in use.")
+            return
+        self._file.close()
+        self._map = None
+
+    def __enter__(self) -> "BigArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Listing and lookup ---
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def name_at(self, index: int) -> str:
+        return bytes(self._map[self._name_starts[index] : self._name_ends[index]]).decode(NAME_ENCODING)
+
+    def names(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self.name_at(index)
+
+    def entries(self) -> Iterator[BigEntry]:
+        for index in range(len(self)):
+            yield BigEntry(self.name_at(index), self._offsets[index], self._sizes[index])
+
+    def index_of(self, name: str) -> int | None:
+        """Index of an entry by path (case and separator insensitive). The first entry wins on duplicates."""
+        if self._lookup is None:
+            lookup: dict[str, int] = {}
+            for index, entry_name in enumerate(self.names()):
+                lookup.setdefault(normalize_entry_name(entry_name), index)
+            self._lookup = lookup
+        return self._lookup.get(normalize_entry_name(name))
+
+    def __contains__(self, name: str) -> bool:
+        return self.index_of(name) is not None
+
+    def size_of(self, index: int) -> int:
+        return self._sizes[index]
+
+    # --- Contents ---
+    def read_at(self, index: int) -> memoryview:
+        offset = self._offsets[index]
+        return self._view[offset : offset + self._sizes[index]]
+
+    def read(self, name: str) -> memoryview:
+        """
+        Contents of an entry, without copying.
+
+        Raises:
+            KeyError: If the archive has no such entry.
+        """
+        index = self.index_of(name)
+        if index is None:
+            raise KeyError(name)
+        return self.read_at(index)
+
+    def extract(
+        self,
+        destination: str,
+        names: list[str] | None = None,
+        max_workers: int | None = None,
+        progress: ProgressReporter | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> int:
+        """
+        Extracts entries (all by default) under destination, in parallel.
+
+        Entry names escaping destination (absolute or with '..') are skipped.
+
+        Returns:
+            The number of files written.
+
+        Raises:
+            KeyError: If one of the requested names is not in the archive.
+            JobCancelledError: If the token is cancelled between two entries.
+        """
+        if names is None:
+            indexes = list(range(len(self)))
+        else:
+            indexes = []
+            for name in names:
+                index = self.index_of(name)
+                if index is None:
+                    raise KeyError(name)
+                indexes.append(index)
+
+        progress = progress or ProgressReporter()
+        progress.set_total("extract", len(indexes))
+        root = os.path.abspath(destination)
+
+        def extract_one(index: int) -> bool:
+            raise_if_cancelled(cancel_token)
+            relative_path = self.name_at(index).replace("\\", os.sep).replace("/", os.sep)
+            target = os.path.abspath(os.path.join(root, relative_path))
+            if os.path.commonpath([root, target]) != root:
+                logger.warning(f"Skipping entry outside of the destination: {self.name_at(index)}")
+                return False
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with self.read_at(index) as contents, open(target, "wb") as f:
+                f.write(contents)
+            progress.advance("extract")
+            return True
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="big-extract") as executor:
+            written = sum(executor.map(extract_one, indexes))
+        progress.finish("extract")
+        return written
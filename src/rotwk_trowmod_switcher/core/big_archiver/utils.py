@@ -12,7 +12,8 @@ def check_duplicate_keys_in_str_file(str_path: str) -> bool:
     key_occurrences = defaultdict(list)
 
     try:
-        with open(str_path, encoding="ansi") as str_file:
+        # The game reads .str files in the Windows-1252 code page ("ansi" only exists on Windows)
+        with open(str_path, encoding="cp1252") as str_file:
             lines = str_file.readlines()
 
         current_key = None
@@ -0,0 +1,169 @@
+# core/big_archiver/vanilla_index.py
+"""
+Pack filter leaving out of the mod archives the files the base game already ships.
+
+A mod file is omitted only if the archive the game would otherwise load it from (the
+first non-mod archive providing the path, see load_order.py) has a byte-identical
+entry. Archives of lang/ are never relied on: the build disables some of them.
+
+Entry digests are computed on demand, only for entries with the same size as a mod
+file, and cached per archive by size and mtime. The entry lists of the base game archives
+have their own index file: the load-order index also holds the mod archives, and an
+index_game_archives call without them would drop their entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from rotwk_trowmod_switcher.config import APPDATA_FOLDER, CACHE_FOLDER_NAME
+from rotwk_trowmod_switcher.core.big_archiver.load_order import MOD_ARCHIVE_NAMES, index_game_archives, list_game_archives
+from rotwk_trowmod_switcher.core.big_archiver.reader import BigArchive, BigFormatError, normalize_entry_name
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, raise_if_cancelled
+from rotwk_trowmod_switcher.core.metrics import STAGE_VANILLA_FILTER, count, span
+
+logger = logging.getLogger(__name__)
+
+VANILLA_DIGESTS_FILE_NAME = "vanilla_digests.json"
+VANILLA_INDEX_FILE_NAME = "vanilla_archive_index.json"
+DIGESTS_VERSION = 1
+
+# Counters of the build report
+COUNTER_VANILLA_SKIPPED_FILES = "vanilla_skipped_files"
+COUNTER_VANILLA_SKIPPED_BYTES = "vanilla_skipped_bytes"
+
+
+def default_vanilla_digests_path() -> str:
+    return os.path.join(APPDATA_FOLDER, CACHE_FOLDER_NAME, VANILLA_DIGESTS_FILE_NAME)
+
+
+def default_vanilla_index_path() -> str:
+    return os.path.join(APPDATA_FOLDER, CACHE_FOLDER_NAME, VANILLA_INDEX_FILE_NAME)
+
+
+def file_digest(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+class VanillaIndex:
+    """
+    Entries of the base game archives of an installation. Shared by the pack threads of a
+    build: call close() at the end to release the archives and save the digests.
+    """
+
+    def __init__(self, game_path: str, digests_path: str | None = None, mod_archive_names: tuple[str, ...] = MOD_ARCHIVE_NAMES, index_path: str | None = None):
+        self.game_path = game_path
+        self.digests_path = digests_path
+        self._lock = threading.Lock()
+        self._archives: dict[str, BigArchive] = {}
+        self._stamps: dict[str, list[int]] = {}
+
+        mod_names = {name.lower() for name in mod_archive_names}
+        archives = [archive for archive in list_game_archives(game_path) if os.path.basename(archive).lower() not in mod_names]
+        names, _ = index_game_archives(game_path, archives, index_path)
+        # Path -> archive the game loads it from once the mod entry is gone (first wins)
+        self._providers: dict[str, str] = {}
+        for archive in archives:
+            for name in names.get(archive, ()):
+                self._providers.setdefault(name, archive)
+
+        self._previous = previous = self._load_digests()
+        self._digests: dict[str, dict[str, str]] = {}
+        for archive in names:
+            stamp = self._stamp(archive)
+            cached = previous.get(self._key(archive))
+            self._stamps[archive] = stamp
+            self._digests[archive] = cached["digests"] if cached is not None and cached["stamp"] == stamp else {}
+
+    def _key(self, archive: str) -> str:
+        return os.path.abspath(os.path.join(self.game_path, archive)).lower()
+
+    def _stamp(self, archive: str) -> list[int]:
+        stat = os.stat(os.path.join(self.game_path, archive))
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _load_digests(self) -> dict[str, dict]:
+        if not self.digests_path or not os.path.exists(self.digests_path):
+            return {}
+        try:
+            with open(self.digests_path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data["archives"] if data.get("version") == DIGESTS_VERSION else {}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable vanilla digests '{self.digests_path}': {e}")
+            return {}
+
+    def _open(self, archive: str) -> BigArchive:
+        with self._lock:
+            opened = self._archives.get(archive)
+            if opened is None:
+                opened = self._archives[archive] = BigArchive(os.path.join(self.game_path, archive))
+            return opened
+
+    def _entry_digest(self, archive: str, name: str) -> str:
+        with self._lock:
+            digest = self._digests[archive].get(name)
+        if digest is None:
+            with self._open(archive).read(name) as contents:
+                digest = hashlib.blake2b(contents).hexdigest()
+            with self._lock:
+                self._digests[archive][name] = digest
+        return digest
+
+    def is_identical(self, file_path: str, archive_name: str) -> bool:
+        """True if the game ships the same bytes under archive_name, in an archive it keeps loading."""
+        archive = self._providers.get(normalize_entry_name(archive_name))
+        # Archives of lang/ ('lang/...') may be disabled by the build
+        if archive is None or "/" in archive:
+            return False
+        opened = self._open(archive)
+        index = opened.index_of(archive_name)
+        if index is None or opened.size_of(index) != os.path.getsize(file_path):
+            return False
+        return file_digest(file_path) == self._entry_digest(archive, normalize_entry_name(archive_name))
+
+    def filter_files(self, files: list[tuple[str, str]], cancel_token: CancellationToken | None = None) -> list[tuple[str, str]]:
+        """Removes from (file path, archive name) pairs the files identical to the base game."""
+        kept = []
+        skipped_bytes = 0
+        with span(STAGE_VANILLA_FILTER) as filter_span:
+            for file_path, archive_name in files:
+                raise_if_cancelled(cancel_token)
+                try:
+                    identical = self.is_identical(file_path, archive_name)
+                except (OSError, BigFormatError) as e:
+                    logger.debug(f"Keeping '{archive_name}', could not compare it with the base game: {e}")
+                    identical = False
+                if identical:
+                    skipped_bytes += os.path.getsize(file_path)
+                else:
+                    kept.append((file_path, archive_name))
+            filter_span.add(files=len(files))
+
+        skipped = len(files) - len(kept)
+        count(COUNTER_VANILLA_SKIPPED_FILES, skipped)
+        count(COUNTER_VANILLA_SKIPPED_BYTES, skipped_bytes)
+        if skipped:
+            logger.info(f"Skipped {skipped} files identical to the base game ({skipped_bytes / 1_048_576:.1f} MB).")
+        return kept
+
+    def close(self) -> None:
+        with self._lock:
+            for archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
+            digests = {self._key(archive): {"stamp": self._stamps[archive], "digests": entries} for archive, entries in self._digests.items()}
+        # Digests of other installations are kept
+        game_prefix = os.path.join(os.path.abspath(self.game_path), "").lower()
+        digests = {**{key: value for key, value in self._previous.items() if not key.startswith(game_prefix)}, **digests}
+        if not self.digests_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.digests_path), exist_ok=True)
+            with open(self.digests_path, "w", encoding="utf-8") as f:
+                json.dump({"version": DIGESTS_VERSION, "archives": digests}, f)
+        except OSError as e:
+            logger.warning(f"Could not save the vanilla digests '{self.digests_path}': {e}")
@@ -0,0 +1,139 @@
+# core/big_archiver/writer.py
+"""
+Deterministic writer of BIG archives.
+
+The same files always give the same bytes, whatever the order they were listed or
+created in: entry names are normalized (lowercase, backslashes) and sorted by their
+encoded bytes, and the layout is fixed. It is the one written by pyBIG, which the
+game is known to load: BIG4 header, index, the 'L253' marker and a NUL byte, then
+the contents in index order. No timestamp or other environment data is written.
+
+Contents are streamed from disk, an archive is never held in memory. With
+deduplication (the default), contents are hashed while they are copied and an entry
+whose bytes were already written points at the earlier body instead: the index only
+depends on the names, so it is written last, once every offset is known.
+"""
+
+import hashlib
+import logging
+import os
+import struct
+from typing import NamedTuple
+
+from rotwk_trowmod_switcher.core.big_archiver.reader import NAME_ENCODING, normalize_entry_name
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, ProgressReporter, raise_if_cancelled
+
+logger = logging.getLogger(__name__)
+
+BIG_MAGIC = b"BIG4"
+INDEX_END_MARKER = b"L253\0"
+MAX_ARCHIVE_SIZE = 0xFFFFFFFF
+COPY_BUFFER_SIZE = 1024 * 1024
+
+_HEADER = struct.Struct("<4sI")
+_COUNTS = struct.Struct(">II")
+_ENTRY = struct.Struct(">II")
+
+
+class BigWriteError(ValueError):
+    """Raised when files cannot be written as a BIG archive (name collision, size limit)."""
+
+
+class BigWriteResult(NamedTuple):
+    archive_size: int
+    contents_size: int  # bytes read from the files
+    duplicate_entries: int  # entries sharing the body of an earlier one
+    duplicate_bytes: int  # bytes not written thanks to them
+
+
+def canonical_entries(files: list[tuple[str, str]]) -> list[tuple[bytes, str, int]]:
+    """
+    Canonical index of (file path, name in archive) pairs.
+
+    Returns:
+        (encoded normalized name, file path, size) tuples sorted by name.
+
+    Raises:
+        BigWriteError: If two files have the same normalized name or a name cannot be encoded.
+        OSError: If a file cannot be read.
+    """
+    entries = {}
+    for file_path, archive_name in files:
+        try:
+            name = normalize_entry_name(archive_name).encode(NAME_ENCODING)
+        except UnicodeEncodeError as e:
+            raise BigWriteError(f"Entry name '{archive_name}' cannot be stored in a BIG archive: {e}") from e
+        if name in entries:
+            raise BigWriteError(f"'{file_path}' and '{entries[name][0]}' are both packed as '{archive_name}'")
+        entries[name] = (file_path, os.path.getsize(file_path))
+    return [(name, file_path, size) for name, (file_path, size) in sorted(entries.items())]
+
+
+def write_big_archive(
+    files: list[tuple[str, str]],
+    archive_path: str,
+    progress: ProgressReporter | None = None,
+    progress_stage: str = "pack",
+    cancel_token: CancellationToken | None = None,
+    deduplicate: bool = True,
+) -> BigWriteResult:
+    """
+    Writes files into a BIG archive, reporting one progress step per entry.
+
+    Raises:
+        BigWriteError: If the files cannot be stored in one archive.
+        OSError: If a file cannot be read (or changed size while packing) or the archive cannot be written.
+        JobCancelledError: If the token is cancelled. The caller removes the incomplete file.
+    """
+    progress = progress or ProgressReporter()
+    entries = canonical_entries(files)
+
+    index_end = _HEADER.size + _COUNTS.size + sum(_ENTRY.size + len(name) + 1 for name, _, _ in entries) + len(INDEX_END_MARKER) - 1
+    contents_size = sum(size for _, _, size in entries)
+    if index_end + 1 + contents_size > MAX_ARCHIVE_SIZE and not deduplicate:
+        raise BigWriteError(f"{index_end + 1 + contents_size} bytes do not fit in a BIG archive")
+
+    offsets = []
+    bodies: dict[tuple[bytes, int], int] = {}
+    duplicate_entries = 0
+    duplicate_bytes = 0
+    with open(archive_path, "w+b") as archive:
+        archive.seek(index_end + 1)
+        for _, file_path, size in entries:
+            raise_if_cancelled(cancel_token)
+            offset = archive.tell()
+            digest = hashlib.blake2b() if deduplicate and size else None
+            with open(file_path, "rb") as f:
+                while chunk := f.read(COPY_BUFFER_SIZE):
+                    archive.write(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+            if archive.tell() - offset != size:
+                raise OSError(f"'{file_path}' changed while being packed")
+
+            if digest is not None:
+                key = (digest.digest(), size)
+                if key in bodies:
+                    # Same bytes already in the archive: drop this copy and point at the first one
+                    archive.seek(offset)
+                    archive.truncate()
+                    offset = bodies[key]
+                    duplicate_entries += 1
+                    duplicate_bytes += size
+                else:
+                    bodies[key] = offset
+            offsets.append(offset)
+            progress.advance(progress_stage)
+
+        archive_size = archive.seek(0, os.SEEK_END)
+        if archive_size > MAX_ARCHIVE_SIZE:
+            raise BigWriteError(f"{archive_size} bytes do not fit in a BIG archive")
+
+        index = [_HEADER.pack(BIG_MAGIC, archive_size), _COUNTS.pack(len(entries), index_end)]
+        for (name, _, size), offset in zip(entries, offsets, strict=True):
+            index.append(_ENTRY.pack(offset, size) + name + b"\0")
+        index.append(INDEX_END_MARKER)
+        archive.seek(0)
+        archive.write(b"".join(index))
+
+    return BigWriteResult(archive_size, contents_size, duplicate_entries, duplicate_bytes)
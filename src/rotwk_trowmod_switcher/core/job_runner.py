@@ -0,0 +1,340 @@
+# core/job_runner.py
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, JobCancelledError, JobProgress, ProgressReporter
+from rotwk_trowmod_switcher.core.logging_setup import job_context
+
+logger = logging.getLogger(__name__)
+
+# Job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# What to do when a submitted job uses a resource held by a running or queued job
+CONFLICT_QUEUE = "queue"
+CONFLICT_REJECT = "reject"
+# Cancels the conflicting jobs; the new job starts once the running ones reach a safe point
+CONFLICT_REPLACE = "replace"
+
+# Resource held by every job that writes to the game installation directory
+RESOURCE_GAME_INSTALL = "game_install"
+
+# Number of finished jobs kept in the duration history
+JOB_HISTORY_SIZE = 100
+
+
+class JobConflictError(Exception):
+    """Raised when a job is rejected because a conflicting job is running or queued."""
+
+
+@dataclass
+class Job:
+    """A long-running operation owned by the JobRunner."""
+
+    job_id: int
+    kind: str
+    func: Callable[[ProgressReporter, CancellationToken], Any]
+    resources: frozenset[str]
+    on_progress: Callable[["Job", JobProgress], None] | None = None
+    on_done: Callable[["Job"], None] | None = None
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    status: str = JOB_QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    last_progress: JobProgress | None = None
+    result: Any = None
+    error: BaseException | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+@dataclass(frozen=True)
+class JobInfo:
+    """Read-only snapshot of a job, safe to hand to the GUI or a CLI."""
+
+    job_id: int
+    kind: str
+    status: str
+    resources: tuple[str, ...]
+    submitted_at: float
+    started_at: float | None
+    fraction: float | None
+    cancel_requested: bool
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """Entry of the duration history."""
+
+    kind: str
+    status: str
+    duration: float
+    finished_at: float
+
+
+class JobRunner:
+    """
+    Owns every long-running operation (builds, downloads, mod removal).
+
+    Jobs run on a fixed number of worker slots. A job declares the resources it uses:
+    two jobs sharing a resource never run together, the second one is queued, rejected
+    with JobConflictError or replaces the first one. Durations of finished jobs are kept
+    in a bounded history, optionally persisted as JSON.
+    """
+
+    def __init__(self, worker_slots: int = 1, history_path: str | None = None):
+        self.worker_slots = max(1, worker_slots)
+        self.history_path = history_path
+        self._condition = threading.Condition()
+        self._queue: deque[Job] = deque()
+        self._running: dict[int, Job] = {}
+        self._history: deque[JobRecord] = deque(self._load_history(), maxlen=JOB_HISTORY_SIZE)
+        self._ids = itertools.count(1)
+        self._workers: list[threading.Thread] = []
+        self._stopping = False
+
+    # --- Submission and control ---
+    def submit(
+        self,
+        kind: str,
+        func: Callable[[ProgressReporter, CancellationToken], Any],
+        resources: Iterable[str] = (),
+        conflict_policy: str = CONFLICT_QUEUE,
+        on_progress: Callable[[Job, JobProgress], None] | None = None,
+        on_done: Callable[[Job], None] | None = None,
+    ) -> Job:
+        """
+        Queues a job. func is called as func(progress, cancel_token) in a worker thread.
+        With CONFLICT_REPLACE, the conflicting queued jobs are dropped and the running ones
+        cancelled.
+
+        Raises:
+            JobConflictError: If conflict_policy is CONFLICT_REJECT and a running or queued
+                              job uses one of the same resources.
+        """
+        resources = frozenset(resources)
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("The job runner has been shut down.")
+
+            conflicting = [job for job in itertools.chain(self._running.values(), self._queue) if job.resources & resources]
+            if conflicting and conflict_policy == CONFLICT_REJECT:
+                names = ", ".join(f"{job.kind} #{job.job_id}" for job in conflicting)
+                raise JobConflictError(f"Cannot start '{kind}': conflicting job(s) running or queued: {names}.")
+
+            replaced = []
+            if conflict_policy == CONFLICT_REPLACE:
+                for other in conflicting:
+                    other.cancel_token.cancel()
+                    if other.job_id not in self._running:
+                        self._queue.remove(other)
+                        self._finish(other, JOB_CANCELLED)
+                        replaced.append(other)
+
+            job = Job(next(self._ids), kind, func, resources, on_progress, on_done)
+            self._queue.append(job)
+            logger.info(f"Job {job.kind} #{job.job_id} queued" + (f" behind {len(conflicting)} conflicting job(s)." if conflicting else "."))
+            self._ensure_workers()
+            self._condition.notify_all()
+
+        # The replaced queued jobs never started: notify outside the lock
+        for other in replaced:
+            self._notify_done(other)
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancels a queued job or asks a running one to stop at its next safe point."""
+        with self._condition:
+            for job in self._queue:
+                if job.job_id == job_id:
+                    self._queue.remove(job)
+                    job.cancel_token.cancel()
+                    self._finish(job, JOB_CANCELLED)
+                    break
+            else:
+                job = self._running.get(job_id)
+                if job is None:
+                    return False
+                job.cancel_token.cancel()
+                logger.info(f"Cancellation requested for job {job.kind} #{job.job_id}.")
+                return True
+
+        # A queued job never started: notify outside the lock
+        self._notify_done(job)
+        return True
+
+    def cancel_all(self) -> None:
+        for info in self.queued_jobs() + self.current_jobs():
+            self.cancel(info.job_id)
+
+    def shutdown(self, wait: bool = False, cancel_running: bool = True) -> None:
+        """Stops accepting jobs, drops the queue and optionally cancels the running jobs."""
+        with self._condition:
+            self._stopping = True
+            queued = list(self._queue)
+            self._queue.clear()
+            if cancel_running:
+                for job in self._running.values():
+                    job.cancel_token.cancel()
+            self._condition.notify_all()
+        for job in queued:
+            job.cancel_token.cancel()
+            with self._condition:
+                self._finish(job, JOB_CANCELLED)
+            self._notify_done(job)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    # --- Introspection ---
+    def current_jobs(self) -> list[JobInfo]:
+        with self._condition:
+            return [self._info(job) for job in self._running.values()]
+
+    def queued_jobs(self) -> list[JobInfo]:
+        with self._condition:
+            return [self._info(job) for job in self._queue]
+
+    def is_busy(self) -> bool:
+        with self._condition:
+            return bool(self._running or self._queue)
+
+    def duration_history(self, kind: str | None = None) -> list[JobRecord]:
+        with self._condition:
+            return [record for record in self._history if kind is None or record.kind == kind]
+
+    def average_duration(self, kind: str) -> float | None:
+        """Average duration of the successful jobs of a kind, None if none finished yet."""
+        durations = [record.duration for record in self.duration_history(kind) if record.status == JOB_SUCCEEDED]
+        return sum(durations) / len(durations) if durations else None
+
+    # --- Workers ---
+    def _ensure_workers(self) -> None:
+        # Called with the condition held: workers are started lazily
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.worker_slots:
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{len(self._workers) + 1}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_runnable(self) -> Job | None:
+        # First queued job whose resources are free, keeping the submission order otherwise
+        held = frozenset().union(*(job.resources for job in self._running.values()))
+        for job in self._queue:
+            if not job.resources & held:
+                return job
+        return None
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._condition:
+                job = self._next_runnable()
+                while job is None and not self._stopping:
+                    self._condition.wait()
+                    job = self._next_runnable()
+                if job is None:
+                    return
+                self._queue.remove(job)
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                self._running[job.job_id] = job
+
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        # Every record logged by the job carries its id
+        with job_context(f"{job.kind}#{job.job_id}"):
+            self._execute(job)
+
+        with self._condition:
+            self._running.pop(job.job_id, None)
+            self._finish(job, job.status)
+            self._condition.notify_all()
+        self._notify_done(job)
+
+    def _execute(self, job: Job) -> None:
+        logger.info(f"Job {job.kind} #{job.job_id} started.")
+
+        def report(update: JobProgress) -> None:
+            job.last_progress = update
+            if job.on_progress:
+                job.on_progress(job, update)
+
+        status = JOB_FAILED
+        try:
+            job.result = job.func(ProgressReporter(report), job.cancel_token)
+            status = JOB_FAILED if job.result is False else JOB_SUCCEEDED
+        except JobCancelledError:
+            status = JOB_CANCELLED
+        except Exception as e:
+            logger.error(f"Job {job.kind} #{job.job_id} raised an unexpected error: {e}", exc_info=True)
+            job.error = e
+        job.status = status
+
+    def _finish(self, job: Job, status: str) -> None:
+        # Called with the condition held
+        job.status = status
+        job.finished_at = time.time()
+        if job.started_at is not None:
+            self._history.append(JobRecord(job.kind, status, job.finished_at - job.started_at, job.finished_at))
+            self._save_history()
+        logger.info(f"Job {job.kind} #{job.job_id} {status}" + (f" in {job.duration:.2f} seconds." if job.duration is not None else "."))
+
+    def _notify_done(self, job: Job) -> None:
+        if job.on_done:
+            try:
+                job.on_done(job)
+            except Exception as e:
+                logger.error(f"Error in the completion callback of job {job.kind} #{job.job_id}: {e}", exc_info=True)
+
+    @staticmethod
+    def _info(job: Job) -> JobInfo:
+        return JobInfo(
+            job.job_id,
+            job.kind,
+            job.status,
+            tuple(sorted(job.resources)),
+            job.submitted_at,
+            job.started_at,
+            job.last_progress.fraction if job.last_progress else None,
+            job.cancel_token.cancelled,
+        )
+
+    # --- Persistence ---
+    def _load_history(self) -> list[JobRecord]:
+        if not self.history_path or not os.path.exists(self.history_path):
+            return []
+        try:
+            with open(self.history_path, encoding="utf-8") as f:
+                return [JobRecord(**record) for record in json.load(f)][-JOB_HISTORY_SIZE:]
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Could not read the job history '{self.history_path}': {e}")
+            return []
+
+    def _save_history(self) -> None:
+        # Called with the condition held, the history is small
+        if not self.history_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            with open(self.history_path, "w", encoding="utf-8") as f:
+                json.dump([record.__dict__ for record in self._history], f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not save the job history '{self.history_path}': {e}")
@@ -0,0 +1,173 @@
+# core/jobs.py
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Minimum delay between two progress callbacks, finished stages are always reported
+PROGRESS_MIN_INTERVAL = 0.1  # seconds
+
+
+class JobCancelledError(Exception):
+    """Raised at a safe point when the job's cancellation token has been cancelled."""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag shared between the requester (e.g. the GUI) and a job.
+
+    Jobs call raise_if_cancelled() at safe points: between download chunks, zip members,
+    archive entries and before installing files into the game directory.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelledError("Operation cancelled by the user.")
+
+
+def raise_if_cancelled(cancel_token: CancellationToken | None) -> None:
+    """Checks an optional token, so stages can be called without one."""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+
+@dataclass(frozen=True)
+class JobProgress:
+    """
+    Structured progress of a job.
+
+    Attributes:
+        stage: The stage reporting, e.g. 'download', 'extract' or 'pack:!TROWMOD_INI.big'.
+        done: Units processed in the stage.
+        total: Units expected in the stage, None if unknown.
+        unit: What is counted: 'bytes', 'members' or 'entries'.
+        fraction: Overall progress of the job between 0 and 1.
+        eta_seconds: Estimated remaining time of the job, None until it can be estimated.
+    """
+
+    stage: str
+    done: int
+    total: int | None
+    unit: str
+    fraction: float
+    eta_seconds: float | None
+
+
+class _StageState:
+    __slots__ = ("weight", "unit", "done", "total", "finished")
+
+    def __init__(self, weight: float, unit: str):
+        self.weight = weight
+        self.unit = unit
+        self.done = 0
+        self.total = None
+        self.finished = False
+
+    def fraction(self) -> float:
+        if self.finished:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+
+class ProgressReporter:
+    """
+    Aggregates the progress of weighted stages into JobProgress updates.
+
+    Stages can run in parallel threads (one per archive), the reporter is thread-safe.
+    Callbacks are throttled to PROGRESS_MIN_INTERVAL and run in the reporting thread.
+    """
+
+    def __init__(self, callback: Callable[[JobProgress], None] | None = None):
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._stages: dict[str, _StageState] = {}
+        self._started_at = time.monotonic()
+        self._last_emit = 0.0
+
+    def add_stage(self, stage: str, weight: float, unit: str) -> None:
+        """Declares a stage and its share of the whole job. Declare all stages up front for a stable ETA."""
+        with self._lock:
+            self._stages.setdefault(stage, _StageState(weight, unit))
+
+    def set_total(self, stage: str, total: int | None) -> None:
+        with self._lock:
+            self._stage(stage).total = total
+        self._emit(stage, force=True)
+
+    def advance(self, stage: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stage(stage).done += amount
+        self._emit(stage)
+
+    def finish(self, stage: str) -> None:
+        with self._lock:
+            self._stage(stage).finished = True
+        self._emit(stage, force=True)
+
+    def fraction(self) -> float:
+        with self._lock:
+            return self._fraction()
+
+    def _stage(self, stage: str) -> _StageState:
+        # Undeclared stages are accepted with a neutral weight
+        state = self._stages.get(stage)
+        if state is None:
+            state = self._stages[stage] = _StageState(1.0, "items")
+        return state
+
+    def _fraction(self) -> float:
+        total_weight = sum(state.weight for state in self._stages.values())
+        if not total_weight:
+            return 0.0
+        return sum(state.weight * state.fraction() for state in self._stages.values()) / total_weight
+
+    def _emit(self, stage: str, force: bool = False) -> None:
+        if self.callback is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_emit < PROGRESS_MIN_INTERVAL:
+                return
+            self._last_emit = now
+            state = self._stages[stage]
+            fraction = self._fraction()
+            elapsed = now - self._started_at
+            eta = elapsed * (1 - fraction) / fraction if 0.01 < fraction < 1 else None
+            update = JobProgress(stage, state.done, state.total, state.unit, fraction, eta)
+
+        try:
+            self.callback(update)
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
+
+
+def format_progress(update: JobProgress) -> str:
+    """Human readable one-line description of a progress update."""
+    if update.unit == "bytes":
+        done = f"{update.done / 1_048_576:.1f}"
+        total = f"{update.total / 1_048_576:.1f}" if update.total else "?"
+        counter = f"{done}/{total} MB"
+    else:
+        counter = f"{update.done}/{update.total if update.total else '?'} {update.unit}"
+
+    text = f"{update.stage}: {counter} ({update.fraction:.0%})"
+    if update.eta_seconds is not None:
+        minutes, seconds = divmod(int(update.eta_seconds), 60)
+        text += f" - ETA {minutes}:{seconds:02d}"
+    return text
@@ -0,0 +1,229 @@
+# core/logging_setup.py
+import atexit
+import contextvars
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from rotwk_trowmod_switcher.config import (
+    APPDATA_FOLDER,
+    LOG_BACKUP_COUNT,
+    LOG_FOLDER_NAME,
+    LOG_MAX_BYTES,
+    LOG_RUNS_KEPT,
+)
+
+logger = logging.getLogger(__name__)
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - [%(name)s] %(message)s"
+RUN_LOG_PREFIX = "run-"
+RUN_LOG_EXTENSION = ".log"
+RUN_JSONL_EXTENSION = ".jsonl"
+
+# Job and stage of the code currently logging, set by the job runner and the build stages
+current_job_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_job_id", default=None)
+current_stage: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_stage", default=None)
+
+_listener: logging.handlers.QueueListener | None = None
+_run_log_path: str | None = None
+
+
+@contextmanager
+def job_context(job_id: str) -> Iterator[None]:
+    """Tags every record logged in this context with the given job id."""
+    token = current_job_id.set(job_id)
+    try:
+        yield
+    finally:
+        current_job_id.reset(token)
+
+
+@contextmanager
+def log_stage(stage: str) -> Iterator[None]:
+    """Tags every record logged in this context with the given stage (e.g. 'download', 'pack:!TROWMOD_INI.big')."""
+    token = current_stage.set(stage)
+    try:
+        yield
+    finally:
+        current_stage.reset(token)
+
+
+class JobContextFilter(logging.Filter):
+    """
+    Copies the job id and stage from the context variables onto the record.
+
+    It must run in the thread that logs, so it is attached to the QueueHandler and not
+    to the handlers of the listener thread.
+    """
+
+    def filter(self, record):
+        record.job_id = current_job_id.get()
+        record.stage = current_stage.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "created": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "job_id": getattr(record, "job_id", None),
+            "stage": getattr(record, "stage", None),
+            "message": record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Rotator of the file handlers: compresses the rotated segment."""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _rotating_handler(path: str, formatter: logging.Formatter) -> logging.Handler:
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+    handler.rotator = _gzip_rotator
+    handler.namer = _gzip_namer
+    handler.setFormatter(formatter)
+    return handler
+
+
+def _run_id(file_name: str) -> str:
+    """'run-20250101-120000-1234.log.1.gz' -> 'run-20250101-120000-1234'."""
+    return file_name.split(".", 1)[0]
+
+
+def tidy_previous_runs(log_dir: str, current_run_id: str, runs_kept: int = LOG_RUNS_KEPT) -> None:
+    """
+    Compresses the logs left uncompressed by previous runs (e.g. after a crash) and
+    deletes the oldest runs, keeping `runs_kept` of them besides the current one.
+    """
+    try:
+        file_names = [name for name in os.listdir(log_dir) if name.startswith(RUN_LOG_PREFIX)]
+    except OSError as e:
+        logger.warning(f"Could not list the log folder '{log_dir}': {e}")
+        return
+
+    previous_runs = sorted({_run_id(name) for name in file_names} - {current_run_id}, reverse=True)
+    expired_runs = set(previous_runs[runs_kept:])
+
+    for name in file_names:
+        run_id = _run_id(name)
+        if run_id == current_run_id:
+            continue
+        path = os.path.join(log_dir, name)
+        try:
+            if run_id in expired_runs:
+                os.remove(path)
+            elif not name.endswith(".gz"):
+                _gzip_rotator(path, path + ".gz")
+        except OSError as e:
+            logger.warning(f"Could not tidy the log file '{path}': {e}")
+
+
+def configure_logging(level: int = logging.INFO, log_dir: str | None = None) -> str | None:
+    """
+    Configures the logging pipeline once for the whole application.
+
+    The root logger only has a QueueHandler: logging from the build workers is a
+    non-blocking queue put. A single listener thread writes the records to the console,
+    to a rotating per-run log file and to a JSON-lines file carrying job id and stage.
+    Rotated segments and the logs of previous runs are gzip-compressed.
+
+    Args:
+        level: The level of the root logger.
+        log_dir: Where the run logs are written. Defaults to APPDATA_FOLDER/logs.
+
+    Returns:
+        The path of the plain-text log of this run, None if the files could not be opened.
+    """
+    global _listener, _run_log_path
+    if _listener is not None:
+        return _run_log_path
+
+    handlers: list[logging.Handler] = []
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers.append(console_handler)
+
+    log_dir = log_dir or os.path.join(APPDATA_FOLDER, LOG_FOLDER_NAME)
+    run_id = f"{RUN_LOG_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    file_error = None
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        _run_log_path = os.path.join(log_dir, run_id + RUN_LOG_EXTENSION)
+        handlers.append(_rotating_handler(_run_log_path, logging.Formatter(LOG_FORMAT)))
+        handlers.append(_rotating_handler(os.path.join(log_dir, run_id + RUN_JSONL_EXTENSION), JsonLinesFormatter()))
+    except OSError as e:
+        # Logging to the console is still better than not starting at all
+        _run_log_path = None
+        file_error = e
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(JobContextFilter())
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    if file_error is not None:
+        logger.warning(f"Could not open the run log files in '{log_dir}': {file_error}")
+    else:
+        logger.info(f"Logging this run to: {_run_log_path}")
+        # Compressing old runs can take a moment, do not delay the startup
+        threading.Thread(target=tidy_previous_runs, args=(log_dir, run_id), name="log-tidy", daemon=True).start()
+    return _run_log_path
+
+
+def attach_handler(handler: logging.Handler) -> None:
+    """
+    Adds a handler (e.g. the GUI console sink) to the listener thread.
+
+    Falls back to the root logger if the pipeline was not configured.
+    """
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+        return
+    # The listener reads this tuple for every record, replacing it is atomic
+    _listener.handlers = (*_listener.handlers, handler)
+
+
+def get_run_log_path() -> str | None:
+    """Path of the plain-text log of this run, None if logging to files is not active."""
+    return _run_log_path
+
+
+def shutdown_logging() -> None:
+    """Flushes the queued records and stops the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
@@ -0,0 +1,250 @@
+# core/metrics.py
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from rotwk_trowmod_switcher.config import APPDATA_FOLDER, METRICS_FOLDER_NAME, METRICS_REPORTS_KEPT
+from rotwk_trowmod_switcher.core.jobs import JobCancelledError
+
+logger = logging.getLogger(__name__)
+
+# Stages measured during an update, in execution order
+STAGE_DOWNLOAD = "download"
+STAGE_EXTRACT = "extract"
+STAGE_ASSET_CACHE = "asset-cache"
+STAGE_PACK = "pack"
+STAGE_INSTALL = "install"
+STAGE_COPY = "copy"
+STAGE_MARKER = "marker"
+STAGE_REMOVE = "remove"
+STAGE_VANILLA_FILTER = "vanilla-filter"
+
+# Outcomes of a measured run
+OUTCOME_SUCCEEDED = "succeeded"
+OUTCOME_FAILED = "failed"
+OUTCOME_CANCELLED = "cancelled"
+OUTCOME_ERROR = "error"
+
+REPORT_PREFIX = "report-"
+
+# Metrics of the run executing in this context, None when nothing is measured
+current_metrics: contextvars.ContextVar["BuildMetrics | None"] = contextvars.ContextVar("current_metrics", default=None)
+
+
+class Span:
+    """Counters of one measured block. Spans are cheap no-ops when no run is measured."""
+
+    __slots__ = ("stage", "bytes_read", "bytes_written", "files")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files = 0
+
+    def add(self, bytes_read: int = 0, bytes_written: int = 0, files: int = 0) -> None:
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+        self.files += files
+
+
+class StageMetrics:
+    """Totals of every span of a stage. Spans of a stage can run in parallel threads."""
+
+    __slots__ = ("spans", "busy_seconds", "cpu_seconds", "bytes_read", "bytes_written", "files", "first_start", "last_end")
+
+    def __init__(self):
+        self.spans = 0
+        self.busy_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files = 0
+        self.first_start = None
+        self.last_end = None
+
+    @property
+    def wall_seconds(self) -> float:
+        """Time between the start of the first span and the end of the last one."""
+        if self.first_start is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def as_dict(self) -> dict:
+        wall = self.wall_seconds
+        return {
+            "spans": self.spans,
+            "wall_seconds": round(wall, 4),
+            "busy_seconds": round(self.busy_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "files": self.files,
+            "read_mb_per_second": round(self.bytes_read / wall / 1_048_576, 2) if wall else None,
+            "written_mb_per_second": round(self.bytes_written / wall / 1_048_576, 2) if wall else None,
+        }
+
+
+class BuildMetrics:
+    """
+    Per-stage wall time, thread CPU time, bytes read/written and file counts of one run
+    (a remote update, a local build or a mod removal).
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.outcome: str | None = None
+        self.report_path: str | None = None
+        self._lock = threading.Lock()
+        self._stages: dict[str, StageMetrics] = {}
+        self._counters: dict[str, int] = {}
+        self._started_at = time.time()
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._wall_seconds: float | None = None
+        self._cpu_seconds: float | None = None
+
+    def record(self, span: Span, start: float, end: float, cpu_seconds: float) -> None:
+        with self._lock:
+            stage = self._stages.get(span.stage)
+            if stage is None:
+                stage = self._stages[span.stage] = StageMetrics()
+            stage.spans += 1
+            stage.busy_seconds += end - start
+            stage.cpu_seconds += cpu_seconds
+            stage.bytes_read += span.bytes_read
+            stage.bytes_written += span.bytes_written
+            stage.files += span.files
+            stage.first_start = start if stage.first_start is None else min(stage.first_start, start)
+            stage.last_end = end if stage.last_end is None else max(stage.last_end, end)
+
+    def add_count(self, name: str, value: int) -> None:
+        """Adds to a named counter of the run (e.g. bytes saved by a pack filter)."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def close(self, outcome: str) -> None:
+        """Stops the run clock. Only the first call counts."""
+        if self._wall_seconds is None:
+            self.outcome = outcome
+            self._wall_seconds = time.perf_counter() - self._start
+            self._cpu_seconds = time.process_time() - self._cpu_start
+
+    def report(self) -> dict:
+        """Machine-readable report of the run."""
+        wall = self._wall_seconds if self._wall_seconds is not None else time.perf_counter() - self._start
+        with self._lock:
+            stages = {name: stage.as_dict() for name, stage in self._stages.items()}
+            counters = dict(self._counters)
+        return {
+            "operation": self.operation,
+            "outcome": self.outcome,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._started_at)),
+            "wall_seconds": round(wall, 4),
+            "process_cpu_seconds": round(self._cpu_seconds, 4) if self._cpu_seconds is not None else None,
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def summary(self) -> str:
+        """One line for the GUI, e.g. 'Done in 42.1s: download 20.3s, pack 15.2s'."""
+        report = self.report()
+        stages = sorted(report["stages"].items(), key=lambda item: item[1]["wall_seconds"], reverse=True)
+        parts = ", ".join(f"{name} {stage['wall_seconds']:.1f}s" for name, stage in stages)
+        return f"{report['wall_seconds']:.1f}s" + (f": {parts}" if parts else "")
+
+    def write_report(self, report_dir: str | None = None) -> str | None:
+        """
+        Writes the report as JSON, keeping the last METRICS_REPORTS_KEPT reports.
+
+        Returns:
+            The path of the report, None if it could not be written.
+        """
+        report_dir = report_dir or os.path.join(APPDATA_FOLDER, METRICS_FOLDER_NAME)
+        file_name = f"{REPORT_PREFIX}{time.strftime('%Y%m%d-%H%M%S', time.localtime(self._started_at))}-{self.operation}.json"
+        report_path = os.path.join(report_dir, file_name)
+        try:
+            os.makedirs(report_dir, exist_ok=True)
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write the timing report '{report_path}': {e}")
+            return None
+
+        _prune_reports(report_dir)
+        self.report_path = report_path
+        logger.info(f"Timing report written to: {report_path}")
+        return report_path
+
+
+def _prune_reports(report_dir: str) -> None:
+    try:
+        reports = sorted(name for name in os.listdir(report_dir) if name.startswith(REPORT_PREFIX) and name.endswith(".json"))
+        for name in reports[:-METRICS_REPORTS_KEPT]:
+            os.remove(os.path.join(report_dir, name))
+    except OSError as e:
+        logger.debug(f"Could not prune the timing reports in '{report_dir}': {e}")
+
+
+@contextmanager
+def measure_run(operation: str, metrics: BuildMetrics | None = None) -> Iterator[BuildMetrics]:
+    """
+    Measures a run. Nested runs (e.g. the build inside a remote update) reuse the active
+    metrics; the outermost run closes them and writes the report.
+
+    The caller sets metrics.outcome (OUTCOME_SUCCEEDED or OUTCOME_FAILED) before leaving;
+    cancellation and unexpected errors are recorded automatically.
+    """
+    active = current_metrics.get()
+    if active is not None:
+        yield active
+        return
+
+    metrics = metrics or BuildMetrics(operation)
+    token = current_metrics.set(metrics)
+    outcome = None
+    try:
+        yield metrics
+    except JobCancelledError:
+        outcome = OUTCOME_CANCELLED
+        raise
+    except Exception:
+        outcome = OUTCOME_ERROR
+        raise
+    finally:
+        current_metrics.reset(token)
+        metrics.close(outcome or metrics.outcome or OUTCOME_FAILED)
+        logger.info(f"{operation} {metrics.outcome} in {metrics.summary()}")
+        metrics.write_report()
+
+
+def count(name: str, value: int) -> None:
+    """Adds to a counter of the run measured in this context, if any."""
+    metrics = current_metrics.get()
+    if metrics is not None:
+        metrics.add_count(name, value)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[Span]:
+    """
+    Measures a block of a stage: wall time, CPU time of the calling thread, and the
+    bytes and files added to the yielded Span.
+    """
+    current = Span(stage)
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield current
+        return
+
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield current
+    finally:
+        metrics.record(current, start, time.perf_counter(), time.thread_time() - cpu_start)
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import logging
 import os
 
@@ -8,6 +10,8 @@ from rotwk_trowmod_switcher.core.big_archiver.costants import (
     DEFAULT_INI_ARCHIVE_NAME,
     DEFAULT_ITLANG_ARCHIVE_NAME,
 )
+from rotwk_trowmod_switcher.core.metrics import OUTCOME_FAILED, OUTCOME_SUCCEEDED, STAGE_REMOVE, BuildMetrics, Span, measure_run, span
+from rotwk_trowmod_switcher.core.profiling import profiled
 
 MOD_FILES_TO_REMOVE = [
     DEFAULT_INI_ARCHIVE_NAME,
@@ -17,8 +21,84 @@ MOD_FILES_TO_REMOVE = [
     VERSION_MARKER_FILENAME,
 ]
 
+# Status values returned by read_installed_mod_version
+MOD_VERSION_OK = "ok"
+MOD_VERSION_MISSING = "missing"
+MOD_VERSION_INVALID_PATH = "invalid_path"
+MOD_VERSION_CORRUPT = "corrupt"
+MOD_VERSION_ERROR = "error"
 
-def remove_mod_files(game_path: str, logger: logging.Logger) -> bool:
+logger = logging.getLogger(__name__)
+
+
+def read_installed_mod_version(game_path: str) -> tuple[str, str | None]:
+    """
+    Reads the version marker written by the archiver in the game directory.
+
+    Args:
+        game_path: The RotWK installation directory.
+
+    Returns:
+        A (status, version) tuple. The status is one of the MOD_VERSION_* constants,
+        the version is only set when the status is MOD_VERSION_OK.
+    """
+    if not game_path or game_path == "NOT FOUND!" or not os.path.isdir(game_path):
+        logger.debug(f"Invalid game directory path for version check: {game_path}")
+        return MOD_VERSION_INVALID_PATH, None
+
+    version_file_path = os.path.join(game_path, VERSION_MARKER_FILENAME)
+    logger.debug(f"Checking for mod version file at: {version_file_path}")
+
+    try:
+        with open(version_file_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        logger.info(f"Mod version file not found at {version_file_path}.")
+        return MOD_VERSION_MISSING, None
+    except json.JSONDecodeError:
+        logger.error(f"Error decoding JSON from {version_file_path}.", exc_info=True)
+        return MOD_VERSION_CORRUPT, None
+    except OSError as e:
+        logger.error(f"Error reading version file {version_file_path}: {e}", exc_info=True)
+        return MOD_VERSION_ERROR, None
+
+    version = data.get("version") if isinstance(data, dict) else None
+    if not version:
+        logger.error(f"'version' key missing in {version_file_path}")
+        return MOD_VERSION_CORRUPT, None
+
+    logger.info(f"Found installed mod version: {version}")
+    return MOD_VERSION_OK, version
+
+
+def compute_install_fingerprint(game_path: str) -> str | None:
+    """
+    Computes a cheap fingerprint of the installed mod files from their size and mtime.
+
+    Only stat() calls are performed, so the fingerprint can be compared with a cached one
+    to know whether the installed version changed without opening any file.
+
+    Args:
+        game_path: The RotWK installation directory.
+
+    Returns:
+        A short hex digest, or None if the game path is not a directory.
+    """
+    if not game_path or not os.path.isdir(game_path):
+        return None
+
+    digest = hashlib.sha1()
+    for relative_path in MOD_FILES_TO_REMOVE:
+        try:
+            stat_result = os.stat(os.path.join(game_path, relative_path))
+            digest.update(f"{relative_path}:{stat_result.st_size}:{stat_result.st_mtime_ns};".encode())
+        except OSError:
+            digest.update(f"{relative_path}:-;".encode())
+    return digest.hexdigest()[:16]
+
+
+@profiled("remove_mod_files")
+def remove_mod_files(game_path: str, logger: logging.Logger, metrics: BuildMetrics | None = None) -> bool:
     """
     Removes the specific files associated with the TROW Mod from the game installation directory.
 
@@ -30,12 +110,21 @@ def remove_mod_files(game_path: str, logger: logging.Logger) -> bool:
         game_path: The absolute path to the main Rise of the Witch-king
                    installation directory.
         logger: The logger instance to use for logging messages.
+        metrics: Receives the duration and the number of removed files. A timing
+                 report is written at the end of the run.
 
     Returns:
         True if all target files were successfully removed
         or were already absent. False if an error occurred during
         the removal of any target file/folder (e.g., PermissionError).
     """
+    with measure_run("remove_mod", metrics) as run_metrics, span(STAGE_REMOVE) as remove_span:
+        success = _remove_mod_files(game_path, logger, remove_span)
+        run_metrics.outcome = OUTCOME_SUCCEEDED if success else OUTCOME_FAILED
+    return success
+
+
+def _remove_mod_files(game_path: str, logger: logging.Logger, remove_span: Span) -> bool:
     if not game_path or not os.path.isdir(game_path):
         logger.error(f"Invalid game path provided for removal: '{game_path}'")
         return False
@@ -52,6 +141,7 @@ def remove_mod_files(game_path: str, logger: logging.Logger) -> bool:
             try:
                 logger.info(f"Removing file: '{full_path}'")
                 os.remove(full_path)
+                remove_span.add(files=1)
                 logger.info(f"Successfully removed file: '{full_path}'")
 
             except FileNotFoundError:
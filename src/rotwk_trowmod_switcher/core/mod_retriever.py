@@ -1,7 +1,6 @@
 import json
 import logging
 import os
-import shutil
 import ssl
 import tempfile
 import urllib.error
@@ -10,14 +9,30 @@ import zipfile
 
 import certifi
 
-from rotwk_trowmod_switcher.config import REQUEST_TIMEOUT
+from rotwk_trowmod_switcher.config import GITHUB_API_URL, GITHUB_URL, REQUEST_TIMEOUT
 from rotwk_trowmod_switcher.core.big_archiver.archiver import create_big_archives
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, JobCancelledError, ProgressReporter, raise_if_cancelled
+from rotwk_trowmod_switcher.core.logging_setup import log_stage
+from rotwk_trowmod_switcher.core.metrics import (
+    OUTCOME_FAILED,
+    OUTCOME_SUCCEEDED,
+    STAGE_DOWNLOAD,
+    STAGE_EXTRACT,
+    BuildMetrics,
+    measure_run,
+    span,
+)
+from rotwk_trowmod_switcher.core.profiling import profiled
 
 # --- Logger Setup ---
-# Configure logging for informative output
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Download buffer size, cancellation is checked between two chunks
+DOWNLOAD_CHUNK_SIZE = 256 * 1024  # bytes
+# Share of the whole job progress taken by the download and the extraction
+DOWNLOAD_PROGRESS_WEIGHT = 30.0
+EXTRACT_PROGRESS_WEIGHT = 10.0
+
 
 def get_latest_release_tag(repo_full_name: str) -> str:
     """
@@ -31,7 +46,7 @@ def get_latest_release_tag(repo_full_name: str) -> str:
         The tag name string if successful, None otherwise.
     """
     # Construct the GitHub API URL for the latest release
-    api_url = f"https://api.github.com/repos/{repo_full_name}/releases/latest"
+    api_url = f"{GITHUB_API_URL}/repos/{repo_full_name}/releases/latest"
     logger.info(f"Fetching latest release info from: {api_url}")
 
     try:
@@ -87,7 +102,72 @@ def get_latest_release_tag(repo_full_name: str) -> str:
         return None
 
 
-def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
+def download_file(
+    response,
+    out_file,
+    progress: ProgressReporter,
+    cancel_token: CancellationToken | None = None,
+) -> int:
+    """
+    Copies an HTTP response to a file in chunks, reporting the downloaded bytes.
+
+    Returns:
+        The number of bytes written.
+
+    Raises:
+        JobCancelledError: If the token is cancelled between two chunks.
+    """
+    content_length = response.headers.get("Content-Length")
+    progress.set_total("download", int(content_length) if content_length and content_length.isdigit() else None)
+
+    downloaded = 0
+    with span(STAGE_DOWNLOAD) as download_span:
+        while True:
+            raise_if_cancelled(cancel_token)
+            chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            out_file.write(chunk)
+            downloaded += len(chunk)
+            progress.advance("download", len(chunk))
+        download_span.add(bytes_read=downloaded, bytes_written=downloaded, files=1)
+    progress.finish("download")
+    return downloaded
+
+
+def extract_zip(
+    zip_file_path: str,
+    destination: str,
+    progress: ProgressReporter,
+    cancel_token: CancellationToken | None = None,
+) -> None:
+    """
+    Extracts a zip archive member by member, reporting the extracted members.
+
+    Raises:
+        JobCancelledError: If the token is cancelled between two members.
+        zipfile.BadZipFile: If the file is not a valid zip archive.
+    """
+    with span(STAGE_EXTRACT) as extract_span, zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+        members = zip_ref.infolist()
+        progress.set_total("extract", len(members))
+        for member in members:
+            raise_if_cancelled(cancel_token)
+            zip_ref.extract(member, destination)
+            if not member.is_dir():
+                extract_span.add(bytes_read=member.compress_size, bytes_written=member.file_size, files=1)
+            progress.advance("extract")
+    progress.finish("extract")
+
+
+@profiled("update_rotwk_with_latest_mod")
+def update_rotwk_with_latest_mod(
+    repo_full_name: str,
+    game_path: str,
+    progress: ProgressReporter | None = None,
+    cancel_token: CancellationToken | None = None,
+    metrics: BuildMetrics | None = None,
+) -> bool:
     """
     Downloads the latest release source code of a GitHub mod, extracts it,
     and processes it using standard Python libraries.
@@ -95,10 +175,34 @@ def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
     Args:
         repo_full_name: The repository name in 'owner/repo' format.
         game_path: The path where the final archive should be placed.
+        progress: Receives the downloaded bytes, extracted members and packed entries.
+        cancel_token: Checked between chunks, members and entries. Temporary files are
+                      always removed and the game directory is only modified at the end.
+        metrics: Receives the timings of every stage, from download to marker. A timing
+                 report is written at the end of the run.
 
     Returns:
         True if the update and archiving process was successful, False otherwise.
+
+    Raises:
+        JobCancelledError: If the token is cancelled.
     """
+    with measure_run("remote_update", metrics) as run_metrics:
+        success = _update_rotwk_with_latest_mod(repo_full_name, game_path, progress, cancel_token)
+        run_metrics.outcome = OUTCOME_SUCCEEDED if success else OUTCOME_FAILED
+    return success
+
+
+def _update_rotwk_with_latest_mod(
+    repo_full_name: str,
+    game_path: str,
+    progress: ProgressReporter | None,
+    cancel_token: CancellationToken | None,
+) -> bool:
+    progress = progress or ProgressReporter()
+    progress.add_stage("download", DOWNLOAD_PROGRESS_WEIGHT, "bytes")
+    progress.add_stage("extract", EXTRACT_PROGRESS_WEIGHT, "members")
+
     try:
         # 1. Get the latest release tag using the GitHub API
         latest_tag = get_latest_release_tag(repo_full_name)
@@ -108,7 +212,7 @@ def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
 
         # 2. Construct the download URL for the zip archive of the tagged release
         # GitHub provides zip archives at this standard URL format
-        zip_url = f"https://github.com/{repo_full_name}/archive/refs/tags/{latest_tag}.zip"
+        zip_url = f"{GITHUB_URL}/{repo_full_name}/archive/refs/tags/{latest_tag}.zip"
         logger.info(f"Attempting to download source code archive from: {zip_url}")
 
         # 3. Create a temporary directory to download and extract the archive
@@ -133,12 +237,14 @@ def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
                     urllib.request.urlopen(request, context=ssl_context) as response,
                     open(zip_file_path, "wb") as out_file,
                 ):
-                    # Copy the content from the response to the local file
-                    # shutil.copyfileobj reads in chunks, efficient for large files
-                    shutil.copyfileobj(response, out_file)
+                    # Copy the content from the response to the local file in chunks
+                    with log_stage("download"):
+                        downloaded_bytes = download_file(response, out_file, progress, cancel_token)
 
-                logger.info(f"Successfully downloaded archive to: {zip_file_path}")
+                logger.info(f"Successfully downloaded archive to: {zip_file_path} ({downloaded_bytes} bytes)")
 
+            except JobCancelledError:
+                raise
             except urllib.error.HTTPError as e:
                 logger.error(f"HTTP Error downloading archive from '{zip_url}': {e.code} {e.reason}")
                 return False
@@ -157,9 +263,11 @@ def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
             # 5. Extract the contents of the downloaded zip file
             try:
                 logger.info(f"Extracting archive '{zip_file_path}' to '{temp_dir}'")
-                with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+                with log_stage("extract"):
+                    extract_zip(zip_file_path, temp_dir, progress, cancel_token)
                 logger.info(f"Successfully extracted archive in: {temp_dir}")
+            except JobCancelledError:
+                raise
             except zipfile.BadZipFile:
                 # Handle cases where the downloaded file is corrupted or not a zip file
                 logger.error(f"Downloaded file '{zip_file_path}' is not a valid zip archive.")
@@ -205,6 +313,8 @@ def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
                     game_path=game_path,
                     logger=logger,
                     mod_version=latest_tag,
+                    progress=progress,
+                    cancel_token=cancel_token,
                 )
 
             else:
@@ -212,6 +322,9 @@ def update_rotwk_with_latest_mod(repo_full_name: str, game_path: str) -> bool:
                 logger.error("Failed to determine source content path for archiving.")
                 return False
 
+    except JobCancelledError:
+        logger.warning("Mod update cancelled. Temporary files have been removed.")
+        raise
     except Exception as e:
         # Catch-all for any unexpected errors during the overall process
         logger.error(
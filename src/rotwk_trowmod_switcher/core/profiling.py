@@ -0,0 +1,121 @@
+# core/profiling.py
+import contextvars
+import cProfile
+import functools
+import logging
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from rotwk_trowmod_switcher.config import (
+    APPDATA_FOLDER,
+    CONFIG_DEBUG_SECTION,
+    CONFIG_FILE_NAME,
+    LOG_FOLDER_NAME,
+    PROFILE_ALLOCATIONS_TOP,
+    PROFILE_ENV_VAR,
+    PROFILE_KEY,
+    PROFILE_RUNS_KEPT,
+)
+from rotwk_trowmod_switcher.core.logging_setup import get_run_log_path
+from rotwk_trowmod_switcher.core.utils import TRUE_VALUES, load_setting
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PREFIX = "profile-"
+
+# Set while a profiled call runs: nested entry points (the build inside a remote update) are part of the outer profile
+_profiling_active: contextvars.ContextVar[bool] = contextvars.ContextVar("profiling_active", default=False)
+
+
+def is_profiling_enabled() -> bool:
+    """
+    Profiling is enabled by the PROFILE_ENV_VAR environment variable or by
+    `profile = true` in the [debug] section of config.ini. The environment wins.
+    """
+    value = load_setting(APPDATA_FOLDER + CONFIG_FILE_NAME, CONFIG_DEBUG_SECTION, PROFILE_KEY, PROFILE_ENV_VAR, "")
+    return value.lower() in TRUE_VALUES
+
+
+# Read once at import: when disabled, the decorator returns the function itself
+PROFILING_ENABLED = is_profiling_enabled()
+
+
+def _profile_dir() -> str:
+    """Next to the run log, or in the default log folder if logging to files is not active."""
+    run_log_path = get_run_log_path()
+    if run_log_path:
+        return os.path.dirname(run_log_path)
+    return os.path.join(APPDATA_FOLDER, LOG_FOLDER_NAME)
+
+
+def _prune_profiles(profile_dir: str) -> None:
+    """Keeps the files of the last PROFILE_RUNS_KEPT profiled calls."""
+    try:
+        names = [name for name in os.listdir(profile_dir) if name.startswith(PROFILE_PREFIX)]
+        # 'profile-<time>-<name>.prof' and '...-alloc.txt' share the same stem
+        stems = sorted({name.rsplit(".", 1)[0].removesuffix("-alloc") for name in names})
+        expired = set(stems[:-PROFILE_RUNS_KEPT])
+        for name in names:
+            if name.rsplit(".", 1)[0].removesuffix("-alloc") in expired:
+                os.remove(os.path.join(profile_dir, name))
+    except OSError as e:
+        logger.debug(f"Could not prune the profiles in '{profile_dir}': {e}")
+
+
+def _save_profile(name: str, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot | None, elapsed: float) -> None:
+    profile_dir = _profile_dir()
+    stem = os.path.join(profile_dir, f"{PROFILE_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{name}")
+    try:
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(stem + ".prof")
+        if snapshot is not None:
+            top_stats = snapshot.statistics("lineno")[:PROFILE_ALLOCATIONS_TOP]
+            with open(stem + "-alloc.txt", "w", encoding="utf-8") as f:
+                f.write(f"Top {len(top_stats)} allocations still alive at the end of {name} ({elapsed:.2f} seconds)\n\n")
+                f.writelines(f"{stat}\n" for stat in top_stats)
+    except OSError as e:
+        logger.warning(f"Could not save the profile of {name}: {e}")
+        return
+
+    logger.info(f"Profile of {name} saved to: {stem}.prof")
+    _prune_profiles(profile_dir)
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """
+    Wraps a core entry point with cProfile and tracemalloc when profiling is enabled.
+
+    cProfile only sees the calling thread (e.g. not the parallel pack workers, which
+    show up as waits), tracemalloc covers the whole process.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if not PROFILING_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiling_active.get():
+                return func(*args, **kwargs)
+
+            token = _profiling_active.set(True)
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+                if started_tracing:
+                    tracemalloc.stop()
+                _profiling_active.reset(token)
+                _save_profile(name, profiler, snapshot, elapsed)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,165 @@
+# core/startup.py
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from rotwk_trowmod_switcher.config import (
+    CACHED_INSTALL_FINGERPRINT_KEY,
+    CACHED_INSTALL_PATH_KEY,
+    CACHED_INSTALLED_VERSION_KEY,
+    CACHED_LATEST_TAG_KEY,
+    CONFIG_CACHE_SECTION,
+)
+from rotwk_trowmod_switcher.core.mod_manager import (
+    MOD_VERSION_OK,
+    compute_install_fingerprint,
+    read_installed_mod_version,
+)
+from rotwk_trowmod_switcher.core.utils import load_config_section, save_config_values
+
+logger = logging.getLogger(__name__)
+
+# Names of the startup tasks, used as keys for the results
+STARTUP_TASK_INSTALL_PATH = "install_path"
+STARTUP_TASK_APP_UPDATE = "app_update"
+STARTUP_TASK_INSTALLED_VERSION = "installed_version"
+STARTUP_TASK_LATEST_MOD = "latest_mod"
+
+
+def load_startup_cache(config_file_path: str) -> dict[str, str]:
+    """
+    Loads the last-known startup values (install path, latest tag, installed version and fingerprint).
+
+    Args:
+        config_file_path: The path to the configuration file.
+
+    Returns:
+        A dictionary with the cached values, keyed by the CACHED_*_KEY constants.
+        Missing values are simply absent.
+    """
+    try:
+        return load_config_section(config_file_path, CONFIG_CACHE_SECTION)
+    except Exception as e:
+        # A corrupted cache must never prevent the application from starting
+        logger.warning(f"Could not read the startup cache: {e}")
+        return {}
+
+
+def save_startup_cache(config_file_path: str, values: dict[str, str | None]) -> None:
+    """
+    Stores the given last-known startup values in a single write.
+
+    Args:
+        config_file_path: The path to the configuration file.
+        values: The values to store, keyed by the CACHED_*_KEY constants.
+    """
+    try:
+        save_config_values(config_file_path, CONFIG_CACHE_SECTION, values)
+    except Exception as e:
+        logger.warning(f"Could not save the startup cache: {e}")
+
+
+def cached_installed_version(game_path: str, cache: dict[str, str], fingerprint: str | None = None) -> str | None:
+    """
+    Returns the cached installed mod version if the install fingerprint still matches the cached one.
+
+    Args:
+        game_path: The RotWK installation directory.
+        cache: The startup cache as returned by load_startup_cache.
+        fingerprint: The current install fingerprint, computed (stat calls only) if not given.
+
+    Returns:
+        The cached version, or None if there is none or the installed files changed since.
+    """
+    fingerprint = fingerprint or compute_install_fingerprint(game_path)
+    cached_version = cache.get(CACHED_INSTALLED_VERSION_KEY)
+    if fingerprint and fingerprint == cache.get(CACHED_INSTALL_FINGERPRINT_KEY) and cached_version:
+        return cached_version
+    return None
+
+
+def read_installed_version_with_cache(game_path: str, cache: dict[str, str]) -> dict[str, str | None]:
+    """
+    Reads the installed mod version, reusing the cached one when the install fingerprint did not change.
+
+    Args:
+        game_path: The RotWK installation directory.
+        cache: The startup cache as returned by load_startup_cache.
+
+    Returns:
+        A dictionary with 'game_path', 'status', 'version' and 'fingerprint' keys.
+    """
+    fingerprint = compute_install_fingerprint(game_path)
+    cached_version = cached_installed_version(game_path, cache, fingerprint)
+
+    if cached_version:
+        logger.debug(f"Install fingerprint unchanged ({fingerprint}), reusing cached mod version: {cached_version}")
+        return {"game_path": game_path, "status": MOD_VERSION_OK, "version": cached_version, "fingerprint": fingerprint}
+
+    status, version = read_installed_mod_version(game_path)
+    return {"game_path": game_path, "status": status, "version": version, "fingerprint": fingerprint}
+
+
+def cache_values_for_result(task_name: str, result: Any) -> dict[str, str | None]:
+    """
+    Maps the result of a startup task to the cache values that should be persisted.
+
+    Args:
+        task_name: One of the STARTUP_TASK_* names.
+        result: The value returned by the task.
+
+    Returns:
+        The cache values to save, empty if the result must not be cached.
+    """
+    if task_name == STARTUP_TASK_INSTALL_PATH and result:
+        return {CACHED_INSTALL_PATH_KEY: str(result)}
+    if task_name == STARTUP_TASK_LATEST_MOD and result:
+        return {CACHED_LATEST_TAG_KEY: result}
+    if task_name == STARTUP_TASK_INSTALLED_VERSION and result:
+        if result["status"] == MOD_VERSION_OK:
+            return {CACHED_INSTALLED_VERSION_KEY: result["version"], CACHED_INSTALL_FINGERPRINT_KEY: result["fingerprint"]}
+        # Forget stale values so the next startup does not paint a version that is gone
+        return {CACHED_INSTALLED_VERSION_KEY: None, CACHED_INSTALL_FINGERPRINT_KEY: None}
+    return {}
+
+
+def _dispatch_result(task_name: str, future: Future, on_result: Callable[[str, Any, BaseException | None], None]) -> None:
+    """Forwards the outcome of a finished startup task to the result callback."""
+    error = future.exception()
+    result = None if error else future.result()
+    if error:
+        logger.error(f"Startup task '{task_name}' failed: {error}", exc_info=error)
+    try:
+        on_result(task_name, result, error)
+    except Exception as e:
+        logger.error(f"Error handling the result of startup task '{task_name}': {e}", exc_info=True)
+
+
+def run_startup_tasks(
+    tasks: dict[str, Callable[[], Any]],
+    on_result: Callable[[str, Any, BaseException | None], None],
+) -> ThreadPoolExecutor:
+    """
+    Runs the startup tasks concurrently and reports each result as soon as it is available.
+
+    The function returns immediately, so the caller can paint cached values and enter its
+    main loop while the tasks are still running.
+
+    Args:
+        tasks: A dictionary mapping the task name to a callable without arguments.
+        on_result: Called as on_result(task_name, result, error) for every task, from the
+                   worker thread that ran it. GUI callers must hand the result over to their
+                   main thread themselves.
+
+    Returns:
+        The executor running the tasks (already shut down for new submissions).
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, len(tasks)), thread_name_prefix="startup")
+    for task_name, func in tasks.items():
+        logger.debug(f"Starting startup task '{task_name}'")
+        future = executor.submit(func)
+        future.add_done_callback(lambda f, name=task_name: _dispatch_result(name, f, on_result))
+    # Do not wait: tasks keep running in the background
+    executor.shutdown(wait=False)
+    return executor
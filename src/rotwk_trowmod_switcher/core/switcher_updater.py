@@ -18,6 +18,7 @@ from packaging import version  # For robust version comparison
 from rotwk_trowmod_switcher.config import (
     __APP_NAME__,
     __APP_VERSION__,
+    GITHUB_API_URL,
     UPDATER_GITHUB_REPO,
 )
 
@@ -29,14 +30,14 @@ def check_for_updates():
     Checks GitHub for the latest release of this application.
 
     Returns:
-        tuple: (is_update_available: bool, latest_version: str | None, download_url: str | None)
-               Returns (False, None, None) on errors or if up-to-date.
+        tuple: (is_update_available: bool, latest_version: str | None, download_url: str | None, release_notes: str | None)
+               Returns (False, None, None, None) on errors or if up-to-date.
     """
     if not UPDATER_GITHUB_REPO or "/" not in UPDATER_GITHUB_REPO:
         logger.error("UPDATER_GITHUB_REPO is not configured correctly in config.py.")
-        return False, None, None
+        return False, None, None, None
 
-    api_url = f"https://api.github.com/repos/{UPDATER_GITHUB_REPO}/releases/latest"
+    api_url = f"{GITHUB_API_URL}/repos/{UPDATER_GITHUB_REPO}/releases/latest"
     logger.info(f"Checking for application updates at: {api_url}")
     try:
         # Set a User-Agent header, as GitHub API requires it
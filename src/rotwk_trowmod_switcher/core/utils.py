@@ -8,6 +8,9 @@ import sys
 log_format = "%(asctime)s - %(levelname)s - %(message)s"
 logger = logging.getLogger(__name__)
 
+# Values of a setting read as enabled (case-insensitive)
+TRUE_VALUES = ("1", "true", "yes", "on")
+
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -90,6 +93,54 @@ def save_config(config_file_path, section, key, value):
     print(f"Parameter '{key}' saved with value '{value}' in section '{section}' of '{config_file_path}'")
 
 
+def save_config_values(config_file_path, section, values):
+    """
+    Saves several configuration values of one section with a single write.
+
+    Args:
+        config_file_path (str): The path to the configuration file.
+        section (str): The section within the configuration file.
+        values (dict[str, str]): The keys and values to save. None values remove the key.
+    """
+    config = configparser.ConfigParser()
+    if os.path.exists(config_file_path):
+        config.read(config_file_path)
+
+    if not config.has_section(section):
+        config.add_section(section)
+
+    for key, value in values.items():
+        if value is None:
+            config.remove_option(section, key)
+        else:
+            config.set(section, key, str(value))
+
+    os.makedirs(os.path.dirname(config_file_path), exist_ok=True)
+
+    with open(config_file_path, "w") as configfile:
+        config.write(configfile)
+    logger.debug(f"Saved {len(values)} parameter(s) in section '{section}' of '{config_file_path}'")
+
+
+def load_config_section(config_file_path, section):
+    """
+    Loads all the values of a section from an INI file.
+
+    Args:
+        config_file_path (str): The path to the configuration file.
+        section (str): The section within the configuration file.
+
+    Returns:
+        dict[str, str]: The section values, empty if the file or section does not exist.
+    """
+    config = configparser.ConfigParser()
+    if os.path.exists(config_file_path):
+        config.read(config_file_path)
+        if config.has_section(section):
+            return dict(config.items(section))
+    return {}
+
+
 def load_config(config_file_path, section, key, default=None):
     """
     Loads a configuration value from an INI file.
@@ -109,3 +160,27 @@ def load_config(config_file_path, section, key, default=None):
         if config.has_section(section) and config.has_option(section, key):
             return config.get(section, key)
     return default
+
+
+def load_setting(config_file_path, section, key, env_var=None, default=None):
+    """
+    Loads a setting that can be overridden by an environment variable.
+
+    Args:
+        config_file_path (str): The path to the configuration file.
+        section (str): The section within the configuration file.
+        key (str): The key of the parameter to load.
+        env_var (str, optional): Environment variable that wins over the configuration file.
+        default (str, optional): The value returned if the setting is not set anywhere.
+
+    Returns:
+        str or None: The stripped value of the setting or the default value.
+    """
+    if env_var and os.getenv(env_var) is not None:
+        return os.getenv(env_var).strip()
+    try:
+        value = load_config(config_file_path, section, key)
+    except configparser.Error as e:
+        logger.warning(f"Could not read '{key}' from '{config_file_path}': {e}")
+        return default
+    return value.strip() if value is not None else default
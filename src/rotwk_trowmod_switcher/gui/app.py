@@ -3,9 +3,6 @@ import json
 import logging
 import os
 import subprocess
-import sys
-import threading
-import tkinter
 from tkinter import filedialog, messagebox, scrolledtext
 
 import customtkinter as ctk
@@ -17,10 +14,13 @@ from rotwk_trowmod_switcher.config import (  # Import app name if used in paths/
     __APP_NAME__,
     __APP_VERSION__,
     APPDATA_FOLDER,
+    CACHED_INSTALL_PATH_KEY,
+    CACHED_LATEST_TAG_KEY,
     CONFIG_FILE_NAME,
     CONFIG_PATH_SECTION,
     GAME_EXE_NAME,
     GAME_PROCESS_NAMES,
+    JOB_HISTORY_FILE_NAME,
     LOCAL_CONTENT_KEY,
     REGISTRY_PATHS_ROTWK,
     REPO_NAME,
@@ -34,8 +34,39 @@ from rotwk_trowmod_switcher.config import (  # Import app name if used in paths/
 from rotwk_trowmod_switcher.core.big_archiver.archiver import (
     create_big_archives,
 )
-from rotwk_trowmod_switcher.core.mod_manager import remove_mod_files
+from rotwk_trowmod_switcher.core.job_runner import (
+    CONFLICT_REJECT,
+    JOB_CANCELLED,
+    JOB_SUCCEEDED,
+    RESOURCE_GAME_INSTALL,
+    JobConflictError,
+    JobRunner,
+)
+from rotwk_trowmod_switcher.core.jobs import format_progress
+from rotwk_trowmod_switcher.core.logging_setup import attach_handler
+from rotwk_trowmod_switcher.core.metrics import BuildMetrics
+from rotwk_trowmod_switcher.core.mod_manager import (
+    MOD_VERSION_CORRUPT,
+    MOD_VERSION_ERROR,
+    MOD_VERSION_INVALID_PATH,
+    MOD_VERSION_MISSING,
+    MOD_VERSION_OK,
+    read_installed_mod_version,
+    remove_mod_files,
+)
 from rotwk_trowmod_switcher.core.mod_retriever import get_latest_release_tag, update_rotwk_with_latest_mod
+from rotwk_trowmod_switcher.core.startup import (
+    STARTUP_TASK_APP_UPDATE,
+    STARTUP_TASK_INSTALL_PATH,
+    STARTUP_TASK_INSTALLED_VERSION,
+    STARTUP_TASK_LATEST_MOD,
+    cache_values_for_result,
+    cached_installed_version,
+    load_startup_cache,
+    read_installed_version_with_cache,
+    run_startup_tasks,
+    save_startup_cache,
+)
 from rotwk_trowmod_switcher.core.switcher_updater import (
     check_for_updates,
     download_update,
@@ -53,6 +84,8 @@ from rotwk_trowmod_switcher.core.windows_utils import (
 )
 
 # --- GUI Theme/Constants Import ---
+from .event_bus import ButtonsStateEvent, ProgressEvent, StatusEvent, UIEventBus, VersionInfoEvent
+from .log_console import LogConsole, QueueLogSink
 from .theme import (
     APP_TITLE,
     BG_IMG_FILE_PATH,
@@ -79,8 +112,10 @@ from .theme import (
 logger = logging.getLogger(__name__)
 log_format = "%(asctime)s - %(levelname)s - %(message)s"  # Define format needed for handler
 
-# Global variable for the root window - necessary for schedule_gui_update
+# Global variable for the root window
 root = None
+# Thread-safe bridge to the main thread: worker threads never call Tk directly
+ui_bus = UIEventBus()
 # Global vars for widgets that need updating from callbacks/threads
 log_console = None
 log_filter_var = None
@@ -94,9 +129,32 @@ browse_button_remote = None
 browse_button_local = None
 rotwk_path_entry = None
 local_path_entry = None
+progress_bar = None
+progress_label = None
+cancel_button = None
+
+# Owns every long-running operation, created in run_gui (importing the module starts nothing)
+job_runner: JobRunner | None = None
+
+# Kinds of the jobs submitted by the GUI, used in logs and in the duration history
+JOB_KIND_REMOTE_UPDATE = "remote_update"
+JOB_KIND_LOCAL_UPDATE = "local_update"
+JOB_KIND_REMOVE_MOD = "remove_mod"
+JOB_KIND_APP_UPDATE = "app_update"
 
-# Global message history
-log_history: list[tuple[str, str]] = []  # (msg, level)
+# Queue-backed log console (history, filter and batched drain)
+log_console_controller: LogConsole | None = None
+
+# Last-known startup values, loaded once in run_gui
+startup_cache: dict[str, str] = {}
+
+# Text and colour of the installed mod version label for each non-OK status
+MOD_VERSION_DISPLAY = {
+    MOD_VERSION_MISSING: ("Unknown (Update Mod?)", "orange"),
+    MOD_VERSION_INVALID_PATH: ("N/A (Set RoTWK Path)", "orange"),
+    MOD_VERSION_CORRUPT: ("Error: Corrupt File", "red"),
+    MOD_VERSION_ERROR: ("Error: Read Failed", "red"),
+}
 
 
 def show_changelog_if_exists():
@@ -120,21 +178,21 @@ def show_changelog_if_exists():
             message = f"Successfully updated to version {version}!\n\n--- Changelog ---\n\n{notes}"
 
             # Schedule the messagebox call to run after the main window is ready
-            # Using schedule_gui_update ensures it runs in the main GUI thread
-            schedule_gui_update(messagebox.showinfo, title, message)
+            # The UI bus runs it in the main GUI thread once the main loop is running
+            ui_bus.call(messagebox.showinfo, title, message)
 
         except FileNotFoundError:
             logger.warning("Update info file existed but disappeared before reading.")
         except json.JSONDecodeError:
             logger.error("Update info file was corrupted (not valid JSON).")
-            schedule_gui_update(
+            ui_bus.call(
                 messagebox.showerror,
                 "Changelog Error",
                 f"Could not read update notes for version {version}.\nThe update info file was corrupted.",
             )
         except Exception as e:
             logger.error(f"Failed to read, parse or display update info file: {e}", exc_info=True)
-            schedule_gui_update(
+            ui_bus.call(
                 messagebox.showerror,
                 "Changelog Error",
                 f"Could not display update notes for version {version}.\nError: {e}",
@@ -149,36 +207,41 @@ def show_changelog_if_exists():
                     logger.error(f"Failed to remove update info file '{update_info_path}': {e}")
 
 
-# --- Helper Function for GUI Updates from Threads ---
-def schedule_gui_update(callback, *args, **kwargs):
-    """
-    Schedules a function to run safely in the main GUI thread using root.after(),
-    passing both positional and keyword arguments. Includes error handling for
-    calls made after the main loop has stopped.
-
-    Args:
-        callback: The function to call in the main thread.
-        *args: Positional arguments for the callback.
-        **kwargs: Keyword arguments for the callback.
-    """
-    if root and root.winfo_exists():
-        try:
-            # Pass *args and **kwargs to the callback via root.after
-            root.after(0, lambda: callback(*args, **kwargs))
-        except tkinter.TclError as e:
-            # This likely means the main loop is stopping or has stopped.
-            # Log to stderr or a file logger instead of the GUI console.
-            if "application has been destroyed" in str(e).lower() or "main thread is not in main loop" in str(e).lower():  # Check common TclError messages
-                print(f"Debug: Suppressed GUI update after main loop exit for {callback.__name__}", file=sys.stderr)
-            else:
-                # Log other unexpected TclErrors
-                logger.warning(f"TclError scheduling GUI update for {callback.__name__}: {e}", exc_info=False)  # exc_info=False to avoid recursive logging loop
-        except Exception as e:
-            # Catch any other unexpected errors during scheduling
-            logger.error(f"Unexpected error scheduling GUI update for {callback.__name__}: {e}", exc_info=False)
-    else:
-        # Use f-string for logging
-        logger.debug(f"Debug: GUI update ignored as root window no longer exists. Callback: {callback.__name__}")
+# --- Helpers for GUI Updates from Threads ---
+def set_status(text, color):
+    """Updates the status flag label. Safe from any thread; only the latest status per frame is drawn."""
+    ui_bus.publish(StatusEvent(text, color))
+
+
+def _apply_status(event):
+    if flag_label:
+        flag_label.configure(text=event.text, text_color=event.color)
+
+
+def _apply_version_info(event):
+    label = mod_version_label if event.target == "installed" else latest_mod_available_label
+    if label:
+        label.configure(text=event.text, text_color=event.color)
+
+
+def _apply_buttons_state(event):
+    set_buttons_state(event.state)
+
+
+def _apply_progress(event):
+    if progress_bar:
+        progress_bar.set(event.fraction or 0.0)
+    if progress_label:
+        progress_label.configure(text=event.text)
+
+
+def publish_job_progress(job, update):
+    """Job progress callback: runs in the worker threads, only publishes the latest progress."""
+    text = format_progress(update)
+    queued = len(job_runner.queued_jobs())
+    if queued:
+        text += f" (+{queued} queued)"
+    ui_bus.publish(ProgressEvent(update.fraction, text))
 
 
 # --- GUI Update Functions ---
@@ -187,11 +250,11 @@ def update_flag(success):
     if not flag_label:
         return  # Guard against missing widget
     if success:
-        schedule_gui_update(flag_label.configure, text="Update completed!", text_color="green")
+        set_status("Update completed!", "green")
         # Run notification in a separate thread to avoid blocking
         windows_notify("Update completed!", "You can now launch the game")
     else:
-        schedule_gui_update(flag_label.configure, text="ERROR!! Please, see the logs below!", text_color="red")
+        set_status("ERROR!! Please, see the logs below!", "red")
 
 
 def set_buttons_state(new_state):
@@ -209,60 +272,78 @@ def set_buttons_state(new_state):
         if widget:  # Check if widget exists
             widget.configure(state=new_state)
 
+    # Cancel is only available while a cancellable job is running
+    if cancel_button:
+        cancel_button.configure(state="normal" if new_state == "disabled" and job_runner.is_busy() else "disabled")
+
 
 def clear_log():
     """Clears the content of the log console."""
-    if not log_console:
+    if not log_console_controller:
         return
-    log_console.configure(state="normal")
-    log_console.delete("1.0", ctk.END)
-    log_console.configure(state="disabled")
+    log_console_controller.clear()
 
 
-def _perform_update_download_and_restart(url, latest_v, release_notes):
-    """Handles the download and restart process."""
-    logger.info("Starting update download...")
-    schedule_gui_update(flag_label.configure, text="Downloading update...", text_color="yellow")  # Optional status update
+def _apply_downloaded_update(downloaded_path, latest_v, release_notes):
+    """Saves the update info and restarts into the downloaded executable. Runs in the main thread."""
+    logger.info("Download complete. Saving update info...")
 
-    downloaded_path = download_update(url)
+    # --- Save update info for the new version ---
+    update_info_path = os.path.join(APPDATA_FOLDER, UPDATE_INFO_FILE_NAME)
+    update_data = {"version": latest_v, "notes": release_notes}
+    try:
+        # Ensure the directory exists
+        os.makedirs(APPDATA_FOLDER, exist_ok=True)
+        with open(update_info_path, "w", encoding="utf-8") as f:
+            json.dump(update_data, f, ensure_ascii=False, indent=2)
+        logger.info(f"Update info saved to {update_info_path}")
+    except Exception as e:
+        logger.error(f"Failed to save update info: {e}", exc_info=True)
 
-    if downloaded_path:
-        logger.info("Download complete. Saving update info...")
+    # Exits the application on success, so it must not run in a worker thread
+    if not trigger_update_restart(downloaded_path):
+        # If triggering fails, clean up the update info file too
+        if os.path.exists(update_info_path):
+            try:
+                os.remove(update_info_path)
+            except OSError:
+                pass
+        set_buttons_state("normal")
+        messagebox.showerror(
+            "Update Error",
+            "Failed to start the update process. The downloaded file might be removed. Please try updating manually or restarting the application.",
+        )
 
-        # --- Save update info for the new version ---
-        update_info_path = os.path.join(APPDATA_FOLDER, UPDATE_INFO_FILE_NAME)
-        update_data = {"version": latest_v, "notes": release_notes}
-        try:
-            # Ensure the directory exists
-            os.makedirs(APPDATA_FOLDER, exist_ok=True)
-            with open(update_info_path, "w", encoding="utf-8") as f:
-                json.dump(update_data, f, ensure_ascii=False, indent=2)
-            logger.info(f"Update info saved to {update_info_path}")
-        except Exception as e:
-            logger.error(f"Failed to save update info: {e}", exc_info=True)
 
-        if not trigger_update_restart(downloaded_path):
-            # If triggering fails, clean up the update info file too
-            if os.path.exists(update_info_path):
-                try:
-                    os.remove(update_info_path)
-                except OSError:
-                    pass
-            schedule_gui_update(set_buttons_state, "normal")
-            schedule_gui_update(
-                messagebox.showerror,
-                "Update Error",
-                "Failed to start the update process. The downloaded file might be removed. Please try updating manually or restarting the application.",
-            )
-    else:
-        schedule_gui_update(set_buttons_state, "normal")
-        schedule_gui_update(
+def _on_app_update_job_done(job, latest_v, release_notes):
+    """Completion callback of the application update download (runs in the worker thread)."""
+    if job.status == JOB_SUCCEEDED and job.result:
+        ui_bus.call(_apply_downloaded_update, job.result, latest_v, release_notes)
+        return
+
+    ui_bus.publish(ButtonsStateEvent("normal"))
+    if job.status != JOB_CANCELLED:
+        ui_bus.call(
             messagebox.showerror,
             "Update Error",
             "Failed to download the update file. Please check your internet connection and permissions, then try again.",
         )
 
 
+def _perform_update_download_and_restart(url, latest_v, release_notes):
+    """Downloads the update in a job, then restarts the application from the main thread."""
+    logger.info("Starting update download...")
+    set_status("Downloading update...", "yellow")  # Optional status update
+
+    job_runner.submit(
+        JOB_KIND_APP_UPDATE,
+        lambda progress, cancel_token: download_update(url),
+        resources=(JOB_KIND_APP_UPDATE,),
+        conflict_policy=CONFLICT_REJECT,
+        on_done=lambda job: _on_app_update_job_done(job, latest_v, release_notes),
+    )
+
+
 def ask_user_to_update(latest_v, url, release_notes):
     """Asks the user (in the main thread) if they want to update."""
     if not root or not root.winfo_exists():
@@ -279,93 +360,125 @@ def ask_user_to_update(latest_v, url, release_notes):
 
     if confirm:
         logger.info("User confirmed update. Preparing download.")
+        try:
+            _perform_update_download_and_restart(url, latest_v, release_notes)
+        except JobConflictError as e:
+            logger.warning(str(e))
+            return
         set_buttons_state("disabled")
-        _perform_update_download_and_restart(url, latest_v, release_notes)
     else:
         logger.info("User declined update.")
 
 
+def handle_update_check_result(result, show_no_update_message=False):
+    """Prompts the user if the result of check_for_updates reports a new version."""
+    is_update, latest_v, url, release_notes = result
+
+    if is_update and url:
+        logger.info(f"Update available: Version {latest_v}")
+        ui_bus.call(ask_user_to_update, latest_v, url, release_notes)
+    elif is_update and not url:
+        logger.warning("Update check found a new version, but no download URL for the .exe asset.")
+        if show_no_update_message:
+            ui_bus.call(
+                messagebox.showinfo,
+                "Update Info",
+                f"A new version ({latest_v}) is available, but the download asset could not be found in the release.",
+            )
+    elif show_no_update_message:
+        logger.info("No update required or check failed.")
+        ui_bus.call(
+            messagebox.showinfo,
+            "Up-to-Date",
+            f"You are running the latest version ({__APP_VERSION__}).",
+        )
+    else:
+        logger.info("No update required or check failed (silent).")
+
+
 def perform_update_check(show_no_update_message=False):
     """Checks for updates and prompts the user if one is found."""
+    logger.info("Running update check...")
+    try:
+        # Pass the correct repo for the *application itself*
+        handle_update_check_result(check_for_updates(), show_no_update_message)  # Uses UPDATER_GITHUB_REPO from config
+    except Exception as e:
+        logger.error(f"Error during update check: {e}", exc_info=True)
 
-    def check_thread_target():
-        logger.info("Running update check...")
-        try:
-            # Pass the correct repo for the *application itself*
-            is_update, latest_v, url, release_notes = check_for_updates()  # Uses UPDATER_GITHUB_REPO from config
-
-            if is_update and url:
-                logger.info(f"Update available: Version {latest_v}")
-                schedule_gui_update(ask_user_to_update, latest_v, url, release_notes)
-            elif is_update and not url:
-                logger.warning("Update check found a new version, but no download URL for the .exe asset.")
-                if show_no_update_message:
-                    schedule_gui_update(
-                        messagebox.showinfo,
-                        "Update Info",
-                        f"A new version ({latest_v}) is available, but the download asset could not be found in the release.",
-                    )
-            elif show_no_update_message:
-                logger.info("No update required or check failed.")
-                schedule_gui_update(
-                    messagebox.showinfo,
-                    "Up-to-Date",
-                    f"You are running the latest version ({__APP_VERSION__}).",
-                )
-            else:
-                logger.info("No update required or check failed (silent).")
 
-        except Exception as e:
-            logger.error(f"Error during update check thread: {e}", exc_info=True)
-
-    check_thread_target()
+def submit_game_job(kind, func, on_done):
+    """
+    Submits a job writing to the game directory. Runs in the main thread.
 
+    Jobs touching the game installation are rejected while another one is running or
+    queued (e.g. removing the mod during a build), instead of relying on disabled buttons.
 
-# --- Worker Thread Target Functions ---
-def _run_remote_update_thread(repo_full_name, game_path):
-    """Target function for the remote update worker thread."""
-    success = False
+    Returns:
+        The submitted job, or None if it was rejected.
+    """
     try:
-        logger.info(f"Starting remote update thread for {repo_full_name}...")
-        success = update_rotwk_with_latest_mod(repo_full_name=repo_full_name, game_path=game_path)
+        return job_runner.submit(
+            kind,
+            func,
+            resources=(RESOURCE_GAME_INSTALL,),
+            conflict_policy=CONFLICT_REJECT,
+            on_progress=publish_job_progress,
+            on_done=on_done,
+        )
+    except JobConflictError as e:
+        logger.warning(str(e))
+        messagebox.showwarning("Operation Running", f"{e}\nWait for it to finish or cancel it first.")
+        return None
+
+
+# --- Job Completion Callbacks (run in the worker thread) ---
+def _on_update_job_done(job, game_path, metrics):
+    """Shared epilogue of the build/download jobs. Shows where the time was spent."""
+    if job.status == JOB_CANCELLED:
+        logger.warning("Update cancelled by the user.")
+        set_status("Update cancelled. The game files were not modified.", "orange")
+        ui_bus.publish(ProgressEvent(0.0, "Cancelled"))
+    else:
+        success = job.status == JOB_SUCCEEDED
         if success:
-            logger.info("Remote update thread finished successfully.")
             update_mod_version_display(game_path)
-        else:
-            logger.error("Remote update thread failed.")
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred in remote update thread: {e}")
-        success = False
-    finally:
-        schedule_gui_update(update_flag, success)
-        schedule_gui_update(set_buttons_state, "normal")
+            average = job_runner.average_duration(job.kind)
+            if average is not None:
+                logger.info(f"Average duration of '{job.kind}': {average:.1f} seconds.")
+        update_flag(success)
+        # e.g. "Done in 42.1s: pack 20.3s, download 15.2s, ..."
+        ui_bus.publish(ProgressEvent(1.0 if success else 0.0, f"{'Done' if success else 'Failed'} in {metrics.summary()}"))
+    ui_bus.publish(ButtonsStateEvent("normal"))
+
+
+def _on_remove_mod_job_done(job, rotwk_path):
+    """Epilogue of the remove mod job."""
+    if job.status == JOB_SUCCEEDED:
+        set_status("Mod removed successfully!", "green")
+        update_mod_version_display(rotwk_path)
+        ui_bus.call(windows_notify, "Mod Removed", f"The mod has been removed from {os.path.basename(rotwk_path)}.")
+    elif job.error is not None:
+        set_status("FATAL ERROR removing mod! See logs.", "red")
+        ui_bus.call(messagebox.showerror, "Removal Error", f"An unexpected error occurred: {job.error}")
+    else:
+        logger.error("Mod removal failed (core function returned False). Check logs.")
+        set_status("ERROR removing mod! See logs.", "red")
+        ui_bus.call(messagebox.showerror, "Removal Error", "An error occurred while removing the mod files. Please check the logs.")
+    ui_bus.publish(ButtonsStateEvent("normal"))
 
 
-def _run_local_update_thread(source_dir_path, output_dir_path):
-    """Target function for the local update worker thread."""
-    try:
-        logger.info(f"Starting local update thread from {source_dir_path}...")
-        success = create_big_archives(
-            source_content_path=source_dir_path,
-            game_path=output_dir_path,
-            logger=logger,
-            mod_version="LOCAL",
-        )
-
-        if success:
-            logger.info("Local update thread finished successfully.")
-            update_mod_version_display(output_dir_path)
-        else:
-            logger.error("Local update thread failed.")
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred in local update thread: {e}")
-        success = False
-    finally:
-        schedule_gui_update(update_flag, success)
-        schedule_gui_update(set_buttons_state, "normal")
+# --- GUI Event Handlers ---
+def on_cancel_click():
+    """Requests the cancellation of the running and queued jobs."""
+    if not job_runner.is_busy():
+        return
+    logger.warning("Cancellation requested, stopping at the next safe point...")
+    job_runner.cancel_all()
+    set_status("Cancelling...", "yellow")
+    if cancel_button:
+        cancel_button.configure(state="disabled")
 
 
-# --- GUI Event Handlers ---
 def on_remote_update_click():
     """Handles the click event for the remote update button."""
     if not rotwk_path_entry or not flag_label:
@@ -375,7 +488,7 @@ def on_remote_update_click():
     rotwk_path = rotwk_path_entry.get()
     if not rotwk_path or rotwk_path == "NOT FOUND!":
         logger.critical("Could not find RoTWK installation path. Update cannot continue.")
-        schedule_gui_update(flag_label.configure, text="Error: RoTWK Path Invalid", text_color="red")
+        set_status("Error: RoTWK Path Invalid", "red")
         return
 
     # Save the confirmed/entered path
@@ -386,12 +499,19 @@ def on_remote_update_click():
         rotwk_path,
     )
 
-    set_buttons_state("disabled")
-    schedule_gui_update(flag_label.configure, text="Update running...", text_color="yellow")  # Indicate running
-
     repo_full_name = f"{REPO_OWNER}/{REPO_NAME}"  # Mod repo
-    thread = threading.Thread(target=_run_remote_update_thread, args=(repo_full_name, rotwk_path), daemon=True)
-    thread.start()
+    metrics = BuildMetrics(JOB_KIND_REMOTE_UPDATE)
+    job = submit_game_job(
+        JOB_KIND_REMOTE_UPDATE,
+        lambda progress, cancel_token: update_rotwk_with_latest_mod(repo_full_name, rotwk_path, progress, cancel_token, metrics),
+        lambda job: _on_update_job_done(job, rotwk_path, metrics),
+    )
+    if job is None:
+        return
+
+    set_buttons_state("disabled")
+    set_status("Update running...", "yellow")  # Indicate running
+    ui_bus.publish(ProgressEvent(0.0, "Starting..."))
 
 
 def on_local_update_click():
@@ -403,13 +523,13 @@ def on_local_update_click():
     rotwk_path = rotwk_path_entry.get()
     if not rotwk_path or rotwk_path == "NOT FOUND!":
         logger.critical("Could not find RoTWK installation path. Update cannot continue.")
-        schedule_gui_update(flag_label.configure, text="Error: RoTWK installation path cannot be empty!", text_color="red")
+        set_status("Error: RoTWK installation path cannot be empty!", "red")
         return
 
     source_content_path = local_path_entry.get()
     if not source_content_path or source_content_path == "Insert DEV Mod folder path here" or not os.path.isdir(source_content_path):
         logger.error("Local content path is empty or invalid. Update cannot proceed.")
-        schedule_gui_update(flag_label.configure, text="Error: Local path cannot be empty or is invalid!", text_color="red")
+        set_status("Error: Local path cannot be empty or is invalid!", "red")
         return
 
     logger.info(f"Using local content path: {source_content_path}")
@@ -421,15 +541,26 @@ def on_local_update_click():
         source_content_path,
     )
 
-    set_buttons_state("disabled")
-    schedule_gui_update(flag_label.configure, text="Update running...", text_color="yellow")  # Indicate running
-
-    thread = threading.Thread(
-        target=_run_local_update_thread,
-        args=(source_content_path, rotwk_path),
-        daemon=True,
+    metrics = BuildMetrics(JOB_KIND_LOCAL_UPDATE)
+    job = submit_game_job(
+        JOB_KIND_LOCAL_UPDATE,
+        lambda progress, cancel_token: create_big_archives(
+            source_content_path=source_content_path,
+            game_path=rotwk_path,
+            logger=logger,
+            mod_version="LOCAL",
+            progress=progress,
+            cancel_token=cancel_token,
+            metrics=metrics,
+        ),
+        lambda job: _on_update_job_done(job, rotwk_path, metrics),
     )
-    thread.start()
+    if job is None:
+        return
+
+    set_buttons_state("disabled")
+    set_status("Update running...", "yellow")  # Indicate running
+    ui_bus.publish(ProgressEvent(0.0, "Starting..."))
 
 
 def browse_rotwk_path():
@@ -564,123 +695,110 @@ def on_kill_game_click():
 
 
 # --- Define Helper Function ---
-def update_mod_version_display(game_dir_path):
-    """Reads trowmod_version.json from game_dir_path and updates the GUI label."""
-    global mod_version_label
+def show_mod_version(status, version, cached=False):
+    """Updates the installed mod version label from a read_installed_mod_version result."""
     if not mod_version_label:  # Check if label widget exists
         logger.debug("mod_version_label widget not ready yet.")
         return
 
-    version = "Unknown"
-    color = BUTTON_TEXT_SECONDARY  # Default color (e.g., gray)
-    version_file_path = ""
-
-    if not game_dir_path or game_dir_path == "NOT FOUND!" or not os.path.isdir(game_dir_path):
-        logger.debug(f"Invalid game directory path for version check: {game_dir_path}")
-        version = "N/A (Set RoTWK Path)"
-        color = "orange"
+    if status == MOD_VERSION_OK:
+        text = f"{version} (cached)" if cached else version
+        color = "gray" if cached else TEXT_PRIMARY
     else:
-        try:
-            # Use the constant defined in mod_retriever (or define it here too)
-            # from core.mod_retriever import VERSION_MARKER_FILENAME # Option 1: Import
-            VERSION_MARKER_FILENAME = "trowmod_version.json"  # Option 2: Redefine
-
-            version_file_path = os.path.join(game_dir_path, VERSION_MARKER_FILENAME)
-            logger.debug(f"Checking for mod version file at: {version_file_path}")
-
-            if os.path.exists(version_file_path):
-                with open(version_file_path, encoding="utf-8") as f:
-                    data = json.load(f)
-                version = data.get("version", "Error: Key Missing")
-                if version != "Error: Key Missing":
-                    color = TEXT_PRIMARY  # Success color (e.g., main text color)
-                    logger.info(f"Found installed mod version: {version}")
-                else:
-                    color = "red"
-                    logger.error(f"'version' key missing in {version_file_path}")
+        text, color = MOD_VERSION_DISPLAY.get(status, ("Error", "red"))
 
-            else:
-                logger.info(f"Mod version file not found at {version_file_path}.")
-                version = "Unknown (Update Mod?)"
-                color = "orange"  # Indicate file not found
+    ui_bus.publish(VersionInfoEvent("installed", f"Installed Mod Version: {text}", color))
 
-        except json.JSONDecodeError:
-            logger.error(f"Error decoding JSON from {version_file_path}.", exc_info=True)
-            version = "Error: Corrupt File"
-            color = "red"
-        except OSError as e:
-            logger.error(f"Error reading version file {version_file_path}: {e}", exc_info=True)
-            version = "Error: Read Failed"
-            color = "red"
-        except Exception as e:
-            logger.error(f"Unexpected error checking mod version: {e}", exc_info=True)
-            version = "Error"
-            color = "red"
 
-    # Schedule GUI update for the label
-    schedule_gui_update(mod_version_label.configure, text=f"Installed Mod Version: {version}", text_color=color)
+def update_mod_version_display(game_dir_path):
+    """Reads trowmod_version.json from game_dir_path and updates the GUI label."""
+    try:
+        status, version = read_installed_mod_version(game_dir_path)
+    except Exception as e:
+        logger.error(f"Unexpected error checking mod version: {e}", exc_info=True)
+        status, version = MOD_VERSION_ERROR, None
+    show_mod_version(status, version)
 
 
-def fetch_and_display_latest_mod_version():
-    """Fetches the latest mod tag from GitHub and updates the GUI label."""
-    global latest_mod_available_label
+def show_latest_mod_version(latest_tag, cached=False):
+    """Updates the latest available mod version label, falling back to the cached tag when offline."""
     if not latest_mod_available_label:
         return  # Label not ready
 
-    logger.info("Checking for latest available mod version...")
-    schedule_gui_update(latest_mod_available_label.configure, text="Latest Available: Checking...")
-
-    mod_repo_full_name = f"{config.REPO_OWNER}/{config.REPO_NAME}"  # Get mod repo from config
-    latest_tag = None
-    error_msg = "Error checking"
-
-    try:
-        # This function handles the network request and basic error logging
-        latest_tag = get_latest_release_tag(mod_repo_full_name)
-    except Exception as e:
-        # Catch potential exceptions from the underlying function if needed,
-        # though get_latest_release_tag should handle basic network errors.
-        logger.error(f"Error calling get_latest_release_tag: {e}", exc_info=True)
-
-    # Update GUI based on result
+    cached_tag = startup_cache.get(CACHED_LATEST_TAG_KEY)
     if latest_tag:
-        logger.info(f"Latest available mod version found: {latest_tag}")
-        schedule_gui_update(latest_mod_available_label.configure, text=f"Latest Available: {latest_tag}", text_color=TEXT_PRIMARY)
+        text = f"{latest_tag} (cached)" if cached else latest_tag
+        color = "gray" if cached else TEXT_PRIMARY
+    elif cached_tag:
+        logger.warning("Could not determine latest available mod version, showing the last known one.")
+        text, color = f"{cached_tag} (offline)", "orange"
     else:
         logger.warning("Could not determine latest available mod version due to error. Check your internet connection or repository status.")
-        schedule_gui_update(latest_mod_available_label.configure, text=f"Latest Available: {error_msg}", text_color="orange")
+        text, color = "Error checking", "orange"
 
+    ui_bus.publish(VersionInfoEvent("latest", f"Latest Available: {text}", color))
 
-def start_fetch_latest_mod_version_thread():
-    """Starts the background thread to fetch the latest mod version."""
-    fetch_thread = threading.Thread(target=fetch_and_display_latest_mod_version, daemon=True)
-    fetch_thread.start()
 
+def show_cached_startup_values(game_path):
+    """
+    Paints the last-known values immediately, before the live startup checks complete.
+    The installed version is only painted if the install fingerprint (stat calls only) still matches.
+    """
+    cached_version = cached_installed_version(game_path, startup_cache)
+    if cached_version:
+        show_mod_version(MOD_VERSION_OK, cached_version, cached=True)
+    cached_tag = startup_cache.get(CACHED_LATEST_TAG_KEY)
+    if cached_tag:
+        show_latest_mod_version(cached_tag, cached=True)
+
+
+def _reconcile_startup_result(task_name, result, error):
+    """Applies a live startup result (in the main thread), replacing the cached value painted before."""
+    if task_name == STARTUP_TASK_INSTALL_PATH:
+        current_path = rotwk_path_entry.get() if rotwk_path_entry else None
+        if result and (not current_path or current_path == "NOT FOUND!"):
+            rotwk_path_entry.delete(0, ctk.END)
+            rotwk_path_entry.insert(0, str(result))
+            update_mod_version_display(str(result))
+    elif task_name == STARTUP_TASK_APP_UPDATE:
+        if not error:
+            handle_update_check_result(result, show_no_update_message=False)
+    elif task_name == STARTUP_TASK_INSTALLED_VERSION:
+        current_path = rotwk_path_entry.get() if rotwk_path_entry else None
+        if error:
+            show_mod_version(MOD_VERSION_ERROR, None)
+        elif result["game_path"] == current_path:
+            show_mod_version(result["status"], result["version"])
+        else:
+            # The path changed while the check was running, the result is stale
+            return
+    elif task_name == STARTUP_TASK_LATEST_MOD:
+        show_latest_mod_version(None if error else result)
+
+    cache_values = {} if error else cache_values_for_result(task_name, result)
+    if cache_values:
+        for key, value in cache_values.items():
+            if value is None:
+                startup_cache.pop(key, None)
+            else:
+                startup_cache[key] = value
+        save_startup_cache(APPDATA_FOLDER + CONFIG_FILE_NAME, cache_values)
 
-def _run_remove_mod_thread(rotwk_path):
-    """Target function for the remove mod worker thread."""
-    success = False
-    try:
-        success = remove_mod_files(rotwk_path, logger)
 
-        if success:
-            logger.info("Mod removal thread finished successfully.")
-            # Schedule GUI updates from the thread
-            schedule_gui_update(flag_label.configure, text="Mod removed successfully!", text_color="green")
-            schedule_gui_update(update_mod_version_display, rotwk_path)
-            schedule_gui_update(windows_notify, "Mod Removed", f"The mod has been removed from {os.path.basename(rotwk_path)}.")
-        else:
-            logger.error("Mod removal thread failed (core function returned False). Check logs.")
-            schedule_gui_update(flag_label.configure, text="ERROR removing mod! See logs.", text_color="red")
-            schedule_gui_update(messagebox.showerror, "Removal Error", "An error occurred while removing the mod files. Please check the logs.")
+def start_startup_sequence(game_path):
+    """Runs the registry lookup, app update check, installed version read and latest mod fetch concurrently."""
+    mod_repo_full_name = f"{config.REPO_OWNER}/{config.REPO_NAME}"  # Get mod repo from config
+    cache_snapshot = dict(startup_cache)
 
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred in remove mod thread: {e}")
-        success = False
-        schedule_gui_update(flag_label.configure, text="FATAL ERROR removing mod! See logs.", text_color="red")
-        schedule_gui_update(messagebox.showerror, "Removal Error", f"An unexpected error occurred: {e}")
-    finally:
-        schedule_gui_update(set_buttons_state, "normal")
+    tasks = {
+        STARTUP_TASK_INSTALL_PATH: lambda: find_rotwk_install_path(REGISTRY_PATHS_ROTWK),
+        STARTUP_TASK_APP_UPDATE: check_for_updates,
+        STARTUP_TASK_INSTALLED_VERSION: lambda: read_installed_version_with_cache(game_path, cache_snapshot),
+        STARTUP_TASK_LATEST_MOD: lambda: get_latest_release_tag(mod_repo_full_name),
+    }
+
+    # Results arrive in the worker threads, hand them over to the GUI thread
+    run_startup_tasks(tasks, lambda task_name, result, error: ui_bus.call(_reconcile_startup_result, task_name, result, error))
 
 
 def on_remove_mod_click():
@@ -696,7 +814,7 @@ def on_remove_mod_click():
     # 1. Validate Path
     if not rotwk_path or rotwk_path == "NOT FOUND!" or not os.path.isdir(rotwk_path):
         logger.error("Invalid RotWK path provided for removing mod.")
-        schedule_gui_update(flag_label.configure, text="Error: RoTWK Path Invalid", text_color="red")
+        set_status("Error: RoTWK Path Invalid", "red")
         messagebox.showerror(
             "Removal Error",
             "The Rise of the Witch-king installation path is invalid or not set. Cannot remove mod.",
@@ -718,90 +836,40 @@ def on_remove_mod_click():
         logger.info("User cancelled mod removal.")
         return
 
-    # 4. Start Background Thread if Confirmed
-    logger.info(f"User confirmed. Starting remove mod thread for: {rotwk_path}")
-    set_buttons_state("disabled")
-    schedule_gui_update(flag_label.configure, text="Removing mod...", text_color="yellow")
+    # 4. Submit the removal job if Confirmed
+    logger.info(f"User confirmed. Starting remove mod job for: {rotwk_path}")
+    job = submit_game_job(
+        JOB_KIND_REMOVE_MOD,
+        lambda progress, cancel_token: remove_mod_files(rotwk_path, logger, BuildMetrics(JOB_KIND_REMOVE_MOD)),
+        lambda job: _on_remove_mod_job_done(job, rotwk_path),
+    )
+    if job is None:
+        return
 
-    # Create and start the daemon thread
-    thread = threading.Thread(target=_run_remove_mod_thread, args=(rotwk_path,), daemon=True)
-    thread.start()
+    set_buttons_state("disabled")
+    set_status("Removing mod...", "yellow")
 
 
 # --- Logging Setup for GUI Console ---
-class TextHandler(logging.Handler):
-    TAG_COLORS = {
-        "DEBUG": "gray",
-        "INFO": "white",
-        "WARNING": "yellow",
-        "ERROR": "red",
-        "CRITICAL": "red",
-    }
-
-    def _configure_tags(self):
-        for level, color in self.TAG_COLORS.items():
-            log_console.tag_config(level, foreground=color)
-
-    def emit(self, record):
-        msg = self.format(record)
-        if log_console:
-            try:
-                schedule_gui_update(self._update_log_console, msg, record.levelname)
-            except Exception as e:
-                print(f"Error updating log console: {e}\nLog message: {msg}", file=sys.stderr)
-
-    def _update_log_console(self, msg, level):
-        if not log_console or not log_console.winfo_exists():
-            return
-
-        # Salva nello storico
-        log_history.append((msg, level))
-
-        self._configure_tags()
-
-        # Mostra solo se passa il filtro attivo
-        current_filter = log_filter_var.get()  # "ALL", "INFO", "WARNING", "ERROR"
-        if current_filter == "ALL" or level == current_filter:
-            original_state = log_console.cget("state")
-            log_console.configure(state="normal")
-            log_console.insert("end", msg + "\n", level)
-            log_console.configure(state=original_state)
-            log_console.see("end")
-
-
 def apply_log_filter(*args):
-    """Ridisegna il log console applicando il filtro selezionato."""
-    if not log_console or not log_console.winfo_exists():
+    """Redraws the log console applying the selected filter."""
+    if not log_console_controller:
         return
+    log_console_controller.apply_filter()
 
-    selected = log_filter_var.get()
 
-    log_console.configure(state="normal")
-    log_console.delete("1.0", "end")
-
-    for msg, level in log_history:
-        if selected == "ALL" or level == selected:
-            log_console.insert("end", msg + "\n", level)
+def setup_logging_to_text_widget():
+    """Sets up the queue-backed logging handler for the GUI Text widget and starts draining it."""
+    global log_console_controller
 
-    log_console.configure(state="disabled")
-    log_console.see("end")
+    # The sink only queues formatted lines, the Tk thread drains them in batches.
+    # It runs in the logging listener thread, never in the thread that logs
+    log_sink = QueueLogSink()
+    log_sink.setFormatter(logging.Formatter(log_format))
+    attach_handler(log_sink)
 
-
-def setup_logging_to_text_widget():
-    """Sets up the logging handler for the GUI Text widget."""
-    # Get the root logger
-    root_logger = logging.getLogger()
-    # Remove existing handlers if necessary to avoid duplicates (optional)
-    # for handler in root_logger.handlers[:]:
-    #    root_logger.removeHandler(handler)
-
-    # Add the custom TextHandler
-    text_handler = TextHandler()
-    text_handler.setFormatter(logging.Formatter(log_format))
-    root_logger.addHandler(text_handler)
-    # Ensure the root logger level is appropriate (e.g., INFO)
-    if not root_logger.hasHandlers():  # Set level only if no handlers exist (likely set in main.py now)
-        root_logger.setLevel(logging.INFO)
+    log_console_controller = LogConsole(log_console, log_filter_var, log_sink)
+    log_console_controller.start(root)
 
 
 # --- Main GUI Construction Function ---
@@ -809,8 +877,11 @@ def run_gui():
     """Creates and runs the main application window."""
     global root, log_console, log_filter_var, flag_label, remote_update_button, local_update_button
     global launch_game_button, kill_game_button, browse_button_remote, browse_button_local
-    global rotwk_path_entry, local_path_entry
-    global latest_mod_available_label, mod_version_label, remove_mod_button
+    global rotwk_path_entry, local_path_entry, progress_bar, progress_label, cancel_button
+    global latest_mod_available_label, mod_version_label, remove_mod_button, startup_cache, job_runner
+
+    # A single slot serializes the jobs touching the game
+    job_runner = JobRunner(worker_slots=1, history_path=APPDATA_FOLDER + JOB_HISTORY_FILE_NAME)
 
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("dark-blue")
@@ -874,7 +945,9 @@ def run_gui():
 
     rotwk_path_entry = ctk.CTkEntry(remote_frame, font=TEXT_FONT)
     rotwk_path_entry.grid(row=0, column=0, padx=(10, 5), pady=10, sticky="ew")
-    rotwk_default_path = find_rotwk_install_path(REGISTRY_PATHS_ROTWK) or "NOT FOUND!"
+    # The registry lookup runs in the startup sequence, start from the last path it found
+    startup_cache = load_startup_cache(APPDATA_FOLDER + CONFIG_FILE_NAME)
+    rotwk_default_path = startup_cache.get(CACHED_INSTALL_PATH_KEY) or "NOT FOUND!"
     loaded_rotwk_path = load_config(
         APPDATA_FOLDER + CONFIG_FILE_NAME,
         CONFIG_PATH_SECTION,
@@ -998,6 +1071,28 @@ def run_gui():
     )
     launch_game_button.grid(row=0, column=2, padx=(0, 10), pady=5, sticky="e")  # Column 2
 
+    # --- Job progress and Cancel button --- # (Row 1)
+    progress_bar = ctk.CTkProgressBar(flag_frame, mode="determinate", progress_color=BUTTON_PRIMARY_BORDER)
+    progress_bar.set(0.0)
+    progress_bar.grid(row=1, column=0, padx=10, pady=(0, 2), sticky="ew")
+
+    progress_label = ctk.CTkLabel(flag_frame, text="", font=("Arial", 12))
+    progress_label.grid(row=2, column=0, padx=10, pady=(0, 5), sticky="w")
+
+    cancel_button = ctk.CTkButton(
+        flag_frame,
+        text="Cancel",
+        font=TERTIARY_BUTTON_FONT,
+        command=on_cancel_click,
+        state="disabled",
+        fg_color=BUTTON_TERTIARY_BG,
+        hover_color=BUTTON_PRIMARY_HOVER,
+        border_color=BUTTON_PRIMARY_BORDER,
+        border_width=1,
+        width=120,
+    )
+    cancel_button.grid(row=1, column=1, rowspan=2, columnspan=2, padx=(5, 10), pady=(0, 5), sticky="e")
+
     # --- LOG CONSOLE ---
     log_frame = ctk.CTkFrame(main_frame)
     log_frame.grid(row=6, column=0, padx=10, pady=(10, 10), sticky="nsew")
@@ -1063,6 +1158,13 @@ def run_gui():
     clear_log_button.grid(row=2, column=0, pady=(5, 10), padx=10, sticky="e")
 
     # --- Final Setup ---
+    # Start applying UI events published by worker threads
+    ui_bus.subscribe(StatusEvent, _apply_status)
+    ui_bus.subscribe(VersionInfoEvent, _apply_version_info)
+    ui_bus.subscribe(ButtonsStateEvent, _apply_buttons_state)
+    ui_bus.subscribe(ProgressEvent, _apply_progress)
+    ui_bus.start(root)
+
     setup_logging_to_text_widget()  # Connect logger to the GUI console
 
     # Log initial status messages *after* logger is connected to GUI
@@ -1075,11 +1177,10 @@ def run_gui():
     # Display changelog if exits
     show_changelog_if_exists()
 
-    # Perform initial update check (silent unless update found)
-    perform_update_check(show_no_update_message=False)
-
-    update_mod_version_display(loaded_rotwk_path)
-    start_fetch_latest_mod_version_thread()
+    # Paint the last-known values now, the startup sequence reconciles them as live results arrive
+    # (the app update check stays silent unless an update is found)
+    show_cached_startup_values(loaded_rotwk_path)
+    start_startup_sequence(loaded_rotwk_path)
 
     root.mainloop()
 
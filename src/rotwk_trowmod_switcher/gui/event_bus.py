@@ -0,0 +1,129 @@
+# src/gui/event_bus.py
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .theme import UI_FRAME_INTERVAL_MS
+
+logger = logging.getLogger(__name__)
+
+
+# --- Typed UI Events ---
+# Every event has a key: only the latest event per key is applied at each frame.
+@dataclass(frozen=True)
+class StatusEvent:
+    """Text and colour of the status flag label."""
+
+    text: str
+    color: str
+
+    @property
+    def key(self) -> str:
+        return "status"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Progress of the running operation. fraction is None for indeterminate progress."""
+
+    fraction: float | None
+    text: str = ""
+
+    @property
+    def key(self) -> str:
+        return "progress"
+
+
+@dataclass(frozen=True)
+class VersionInfoEvent:
+    """Text and colour of a version label ('installed' or 'latest')."""
+
+    target: str
+    text: str
+    color: str
+
+    @property
+    def key(self) -> str:
+        return f"version:{self.target}"
+
+
+@dataclass(frozen=True)
+class ButtonsStateEvent:
+    """State ('normal' or 'disabled') of the buttons that start operations."""
+
+    state: str
+
+    @property
+    def key(self) -> str:
+        return "buttons"
+
+
+class UIEventBus:
+    """
+    Thread-safe bridge between worker threads and the Tk main thread.
+
+    Worker threads publish typed events or one-shot calls; nothing touches Tk outside
+    the main thread. The main thread polls the bus at a fixed frame rate, keeping only
+    the latest event per key, so a label updated many times per second is redrawn once
+    per frame.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, object] = {}
+        self._calls: deque[tuple[Callable, tuple, dict]] = deque()
+        self._handlers: dict[type, Callable[[object], None]] = {}
+        self._root = None
+
+    def subscribe(self, event_type: type, handler: Callable[[object], None]) -> None:
+        """Registers the main-thread handler applying events of the given type."""
+        self._handlers[event_type] = handler
+
+    def publish(self, event) -> None:
+        """Queues an event, replacing any pending event with the same key. Safe from any thread."""
+        with self._lock:
+            self._pending[event.key] = event
+
+    def call(self, callback: Callable, *args, **kwargs) -> None:
+        """Queues a one-shot call (e.g. a messagebox) for the main thread. Calls are never coalesced."""
+        with self._lock:
+            self._calls.append((callback, args, kwargs))
+
+    def start(self, root, interval_ms: int = UI_FRAME_INTERVAL_MS) -> None:
+        """Starts polling the bus. Must be called from the Tk main thread."""
+        self._root = root
+        self._interval_ms = interval_ms
+        self._root.after(self._interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        try:
+            self.pump()
+        finally:
+            if self._root is not None and self._root.winfo_exists():
+                self._root.after(self._interval_ms, self._tick)
+
+    def pump(self) -> None:
+        """Applies the pending events then the queued calls. Runs in the main thread."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            calls, self._calls = self._calls, deque()
+
+        for event in pending.values():
+            handler = self._handlers.get(type(event))
+            if handler is None:
+                logger.debug(f"No handler registered for UI event {event!r}")
+                continue
+            self._run(handler, (event,), {})
+
+        for callback, args, kwargs in calls:
+            self._run(callback, args, kwargs)
+
+    def _run(self, callback: Callable, args: tuple, kwargs: dict) -> None:
+        try:
+            callback(*args, **kwargs)
+        except Exception as e:
+            name = getattr(callback, "__name__", repr(callback))
+            # Logging here is safe: the log console drains on its own timer
+            logger.error(f"Error applying UI update {name}: {e}", exc_info=False)
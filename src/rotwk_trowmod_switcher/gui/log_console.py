@@ -0,0 +1,195 @@
+# src/gui/log_console.py
+import itertools
+import logging
+import queue
+import sys
+import threading
+from collections import deque
+
+from .theme import LOG_CONSOLE_MAX_LINES, LOG_DRAIN_INTERVAL_MS, LOG_DRAIN_MAX_BATCH, LOG_HISTORY_MAX_RECORDS, LOG_QUEUE_MAX_RECORDS
+
+LOG_FILTER_ALL = "ALL"
+
+
+class LogHistory:
+    """
+    Bounded history of formatted log lines, with a per-level index.
+
+    Every level has its own deque, so the lines shown for a filter are read directly
+    instead of scanning the whole history. The levels share the max_records budget: the
+    line evicted from the history is the oldest of its level too, so it is popped from
+    the left of that level's deque, and the index never holds more than the history.
+    """
+
+    def __init__(self, max_records: int = LOG_HISTORY_MAX_RECORDS):
+        self.max_records = max_records
+        self._all: deque[tuple[str, str]] = deque()
+        self._by_level: dict[str, deque[str]] = {}
+
+    def append(self, msg: str, level: str) -> None:
+        if len(self._all) >= self.max_records:
+            _, evicted_level = self._all.popleft()
+            self._by_level[evicted_level].popleft()
+        self._all.append((msg, level))
+        level_lines = self._by_level.get(level)
+        if level_lines is None:
+            level_lines = self._by_level[level] = deque()
+        level_lines.append(msg)
+
+    def tail(self, level_filter: str, count: int) -> list[tuple[str, str]]:
+        """Returns the last `count` (msg, level) entries matching the filter, oldest first."""
+        if level_filter == LOG_FILTER_ALL:
+            entries = list(itertools.islice(reversed(self._all), count))
+        else:
+            level_lines = self._by_level.get(level_filter, ())
+            entries = [(msg, level_filter) for msg in itertools.islice(reversed(level_lines), count)]
+        entries.reverse()
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+
+class QueueLogSink(logging.Handler):
+    """
+    Logging handler that only formats the record and queues it.
+
+    It never touches Tk, so it is safe and cheap to call from any thread.
+    The LogConsole drains the queue from the Tk thread. The queue is bounded: when it
+    is full (a burst while the console is not draining) the oldest line is dropped and
+    counted, so the latest lines are the ones shown.
+    """
+
+    def __init__(self, level=logging.NOTSET, max_records: int = LOG_QUEUE_MAX_RECORDS):
+        super().__init__(level)
+        self.queue: queue.Queue[tuple[str, str]] = queue.Queue(maxsize=max_records)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def emit(self, record):
+        try:
+            entry = (self.format(record), record.levelname)
+            while True:
+                try:
+                    self.queue.put_nowait(entry)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                    except queue.Empty:
+                        continue  # Drained meanwhile, there is room now
+                    with self._dropped_lock:
+                        self._dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def take_dropped(self) -> int:
+        """Number of lines dropped since the last call."""
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+
+class LogConsole:
+    """
+    Drains a QueueLogSink into a Tk Text widget on a timer.
+
+    Each tick inserts the whole batch with a single Text.insert call and trims the
+    widget to LOG_CONSOLE_MAX_LINES lines.
+    """
+
+    TAG_COLORS = {
+        "DEBUG": "gray",
+        "INFO": "white",
+        "WARNING": "yellow",
+        "ERROR": "red",
+        "CRITICAL": "red",
+    }
+
+    def __init__(self, text_widget, filter_var, sink: QueueLogSink, history: LogHistory | None = None):
+        self.text_widget = text_widget
+        self.filter_var = filter_var
+        self.sink = sink
+        self.history = history or LogHistory()
+        self._after_id = None
+
+        # Tag colours never change, configure them once
+        for level, color in self.TAG_COLORS.items():
+            self.text_widget.tag_config(level, foreground=color)
+
+    def start(self, root) -> None:
+        """Starts the drain timer. Must be called from the Tk thread."""
+        self._schedule(root)
+
+    def _schedule(self, root) -> None:
+        self._after_id = root.after(LOG_DRAIN_INTERVAL_MS, self._tick, root)
+
+    def _tick(self, root) -> None:
+        try:
+            self.drain()
+        except Exception as e:
+            # Never log from here: the record would come back to this console
+            print(f"Error draining log console: {e}", file=sys.stderr)
+        if self.text_widget.winfo_exists():
+            self._schedule(root)
+
+    def drain(self) -> int:
+        """Moves up to LOG_DRAIN_MAX_BATCH queued lines to the history and the widget."""
+        batch = []
+        try:
+            for _ in range(LOG_DRAIN_MAX_BATCH):
+                batch.append(self.sink.queue.get_nowait())
+        except queue.Empty:
+            pass
+        dropped = self.sink.take_dropped()
+        if dropped:
+            batch.insert(0, (f"... {dropped} log lines dropped (see the run log file for all of them)", "WARNING"))
+        if not batch:
+            return 0
+
+        current_filter = self.filter_var.get()
+        visible = []
+        for msg, level in batch:
+            self.history.append(msg, level)
+            if current_filter == LOG_FILTER_ALL or level == current_filter:
+                visible.append((msg, level))
+
+        if visible and self.text_widget.winfo_exists():
+            self._insert(visible)
+        return len(batch)
+
+    def apply_filter(self) -> None:
+        """Redraws the widget with the last lines matching the selected filter."""
+        if not self.text_widget.winfo_exists():
+            return
+        self.text_widget.configure(state="normal")
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.configure(state="disabled")
+        self._insert(self.history.tail(self.filter_var.get(), LOG_CONSOLE_MAX_LINES))
+
+    def clear(self) -> None:
+        """Clears the widget (the history is kept, so changing filter shows it again)."""
+        self.text_widget.configure(state="normal")
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.configure(state="disabled")
+
+    def _insert(self, entries: list[tuple[str, str]]) -> None:
+        if not entries:
+            return
+
+        # Group consecutive lines of the same level: Text.insert accepts chars/tags pairs
+        insert_args = []
+        for level, group in itertools.groupby(entries, key=lambda entry: entry[1]):
+            insert_args.append("".join(msg + "\n" for msg, _ in group))
+            insert_args.append((level,))
+
+        self.text_widget.configure(state="normal")
+        self.text_widget.insert("end", *insert_args)
+
+        # Trim the oldest lines ("end-1c" is on the empty line after the last newline)
+        line_count = int(self.text_widget.index("end-1c").split(".")[0]) - 1
+        if line_count > LOG_CONSOLE_MAX_LINES:
+            self.text_widget.delete("1.0", f"{line_count - LOG_CONSOLE_MAX_LINES + 1}.0")
+
+        self.text_widget.configure(state="disabled")
+        self.text_widget.see("end")
@@ -5,6 +5,16 @@ ICON_FILE_PATH = "src/rotwk_trowmod_switcher/assets/app_icon.ico"
 BG_IMG_FILE_PATH = "src/rotwk_trowmod_switcher/assets/bg_ai_gen.jpeg"
 GAME_IMG_FILE_PATH = "src/rotwk_trowmod_switcher/assets/game_icon.png"
 
+# --- UI Event Bus Settings ---
+UI_FRAME_INTERVAL_MS = 33  # Pending UI events are applied at ~30 frames per second
+
+# --- Log Console Settings ---
+LOG_DRAIN_INTERVAL_MS = 100  # How often the Tk thread drains queued log lines
+LOG_DRAIN_MAX_BATCH = 500  # Max lines moved to the console per drain
+LOG_QUEUE_MAX_RECORDS = 10000  # Lines waiting for a drain, the oldest are dropped beyond it
+LOG_HISTORY_MAX_RECORDS = 20000  # Lines kept in memory for the level filter
+LOG_CONSOLE_MAX_LINES = 2000  # Lines kept in the Text widget, older ones are trimmed
+
 # LORD OF THE RINGS THEMED COLORS
 TEXT_PRIMARY = "#b99767"
 TEXT_SECONDARY = "#D3D3D3"
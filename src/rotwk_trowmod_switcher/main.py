@@ -1,28 +1,35 @@
 # src/main.py
 import logging
+import multiprocessing
 import sys
 
-# --- Import the GUI application runner ---
-try:
-    from rotwk_trowmod_switcher.config import __APP_NAME__  # Get app name for logger
-    from rotwk_trowmod_switcher.gui.app import run_gui
-except ImportError as e:
-    # Basic fallback if imports fail (e.g., structure not created yet)
-    print(
-        "Error: Could not import application components. Check project structure and paths.",
-        file=sys.stderr,
-    )
-    print(f"Details: {e}", file=sys.stderr)
-    sys.exit(1)
-
-# --- Basic Logging Setup (before GUI starts) ---
-# Configure basic console logging until the GUI handler takes over
-log_format = "%(asctime)s - %(levelname)s - [%(name)s] %(message)s"
-logging.basicConfig(level=logging.INFO, format=log_format)
-logger = logging.getLogger(__APP_NAME__)  # Use app name for root logger
-
 # --- Entry Point ---
+# Everything runs under the guard: a process started with spawn (or by the frozen exe) imports
+# this module again, and must not configure logging (a new run log that tidies away the live
+# one) or load the GUI
 if __name__ == "__main__":
+    # Lets the frozen exe start process pool workers, before anything else runs
+    multiprocessing.freeze_support()
+
+    # --- Import the GUI application runner ---
+    try:
+        from rotwk_trowmod_switcher.config import __APP_NAME__  # Get app name for logger
+        from rotwk_trowmod_switcher.core.logging_setup import configure_logging
+        from rotwk_trowmod_switcher.gui.app import run_gui
+    except ImportError as e:
+        # Basic fallback if imports fail (e.g., structure not created yet)
+        print(
+            "Error: Could not import application components. Check project structure and paths.",
+            file=sys.stderr,
+        )
+        print(f"Details: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # --- Logging Setup (before GUI starts) ---
+    # Queue-based pipeline: console, per-run log files and JSON-lines records. The GUI console attaches to it later
+    configure_logging(level=logging.INFO)
+    logger = logging.getLogger(__APP_NAME__)  # Use app name for root logger
+
     logger.info("Starting application entry point...")
     try:
         run_gui()  # Call the function that builds and runs the GUI
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from rotwk_trowmod_switcher.core.big_archiver.writer import write_big_archive
+
+
+@pytest.fixture
+def make_big_archive(tmp_path):
+    """Factory writing a BIG archive at a path from {entry name: bytes}, through the real writer."""
+    sources = tmp_path / "big-sources"
+
+    def make(archive_path, entries: dict[str, bytes], deduplicate: bool = True):
+        files = []
+        for index, (name, data) in enumerate(entries.items()):
+            source = sources / f"{os.path.basename(archive_path)}-{index}"
+            source.parent.mkdir(parents=True, exist_ok=True)
+            source.write_bytes(data)
+            files.append((str(source), name))
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        return write_big_archive(files, str(archive_path), deduplicate=deduplicate)
+
+    return make
@@ -0,0 +1,33 @@
+import struct
+
+import pytest
+
+from rotwk_trowmod_switcher.core.big_archiver.reader import BIG_HEADER_SIZE, BigArchive, BigFormatError
+
+
+def big_bytes(entries: dict[str, bytes]) -> bytes:
+    """A BIGF archive with the entries, bodies right after the index."""
+    position = BIG_HEADER_SIZE + sum(8 + len(name) + 1 for name in entries)
+    index = b""
+    for name, data in entries.items():
+        index += struct.pack(">II", position, len(data)) + name.encode("latin-1") + b"\0"
+        position += len(data)
+    return struct.pack(">4sIII", b"BIGF", position, len(entries), BIG_HEADER_SIZE + len(index)) + index + b"".join(entries.values())
+
+
+def test_reads_entries(tmp_path):
+    path = tmp_path / "a.big"
+    path.write_bytes(big_bytes({"data\\ini\\gamedata.ini": b"#define A 1\n", "data\\ini\\b.ini": b"x"}))
+
+    with BigArchive(str(path)) as archive:
+        assert list(archive.names()) == ["data\\ini\\gamedata.ini", "data\\ini\\b.ini"]
+        assert bytes(archive.read("DATA/INI/B.INI")) == b"x"
+
+
+@pytest.mark.parametrize("length", [BIG_HEADER_SIZE, BIG_HEADER_SIZE + 3, BIG_HEADER_SIZE + 12])
+def test_truncated_index_raises_big_format_error(tmp_path, length):
+    path = tmp_path / "truncated.big"
+    path.write_bytes(big_bytes({"data\\ini\\gamedata.ini": b"#define A 1\n", "data\\ini\\b.ini": b"x"})[:length])
+
+    with pytest.raises(BigFormatError):
+        BigArchive(str(path))
@@ -0,0 +1,65 @@
+import os
+import random
+
+import pytest
+
+from rotwk_trowmod_switcher.core.big_archiver.archiver import collect_archive_files
+from rotwk_trowmod_switcher.core.big_archiver.reader import BigArchive
+from rotwk_trowmod_switcher.core.big_archiver.writer import BigWriteError, write_big_archive
+
+TREE = {
+    "ini/gamedata.ini": b"#define HERO_COST 1000\n",
+    "ini/object/goodfaction/units/gondor/boromir.ini": b"Object GondorBoromir\nEnd\n",
+    "ini/object/evilfaction/units/mordor/fellbeast.ini": b"Object MordorFellBeast\nEnd\n",
+    "ini/object/evilfaction/units/mordor/orc.ini": b"Object MordorOrc\nEnd\n",
+    "lang/lotr.str": b'OBJECT:Boromir\n"Boromir"\nEND\n',
+    "textures/empty.tga": b"",
+}
+
+
+def write_tree(root, files, seed=None):
+    """Creates the files, in a shuffled order if a seed is given, so the directory listing order differs."""
+    paths = list(files)
+    if seed is not None:
+        random.Random(seed).shuffle(paths)
+    for relative_path in paths:
+        path = os.path.join(root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(files[relative_path])
+
+
+def test_same_tree_created_in_different_orders_gives_identical_archives(tmp_path):
+    archives = []
+    for seed in (None, 1, 2):
+        root = tmp_path / f"tree-{seed}"
+        write_tree(root, TREE, seed)
+        archive = tmp_path / f"tree-{seed}.big"
+        write_big_archive(collect_archive_files(str(root), "data"), str(archive))
+        archives.append(archive.read_bytes())
+
+    assert archives[0] == archives[1] == archives[2]
+
+
+def test_names_differing_only_by_case_or_separator_collide(tmp_path):
+    write_tree(tmp_path, {"a/Gamedata.ini": b"1", "b/gamedata.INI": b"2"})
+    files = [(str(tmp_path / "a" / "Gamedata.ini"), "data\\ini\\Gamedata.ini"), (str(tmp_path / "b" / "gamedata.INI"), "data/ini/gamedata.INI")]
+
+    with pytest.raises(BigWriteError, match="both packed as"):
+        write_big_archive(files, str(tmp_path / "out.big"))
+
+
+def test_identical_bodies_are_stored_once(tmp_path, make_big_archive):
+    body = b"Object GondorSoldier\n  BuildCost = 100\nEnd\n"
+    entries = {"data\\ini\\a.ini": body, "data\\ini\\b.ini": body, "data\\ini\\c.ini": b"Object Other\nEnd\n"}
+
+    full = make_big_archive(tmp_path / "full.big", entries, deduplicate=False)
+    deduplicated = make_big_archive(tmp_path / "deduplicated.big", entries)
+
+    assert (deduplicated.duplicate_entries, deduplicated.duplicate_bytes) == (1, len(body))
+    assert deduplicated.archive_size == full.archive_size - len(body) == os.path.getsize(tmp_path / "deduplicated.big")
+    with BigArchive(str(tmp_path / "deduplicated.big")) as archive:
+        offsets = {entry.name: entry.offset for entry in archive.entries()}
+        assert offsets["data\\ini\\a.ini"] == offsets["data\\ini\\b.ini"] != offsets["data\\ini\\c.ini"]
+        for name, data in entries.items():
+            assert bytes(archive.read(name)) == data
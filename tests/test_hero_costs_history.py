@@ -0,0 +1,72 @@
+import os
+
+from hero_costs_history import cost_curves, faction_stats, load_history
+from heroes_build_report import append_report_history
+
+FINGERPRINT_A = "aaaa1111" + "0" * 24
+FINGERPRINT_B = "bbbb2222" + "0" * 24
+FINGERPRINT_C = "cccc3333" + "0" * 24
+
+
+def hero(faction, name, buildcost, buildtime=45, command_points=10):
+    return {
+        "faction": faction,
+        "name": name,
+        "buildcost": buildcost,
+        "buildtime": buildtime,
+        "command_points_value": command_points,
+        "buildcost_define": None,
+        "buildtime_define": None,
+    }
+
+
+def test_runs_sharing_a_version_are_told_apart_by_fingerprint(tmp_path):
+    append_report_history([hero("gondor", "Boromir", 1500)], tmp_path, "unknown", FINGERPRINT_A)
+    append_report_history([hero("gondor", "Boromir", 1800)], tmp_path, "unknown", FINGERPRINT_B)
+    append_report_history([hero("gondor", "Boromir", 2000)], tmp_path, "1.3.0", FINGERPRINT_C)
+
+    history = load_history(tmp_path)
+
+    assert list(history["run"].cat.categories) == ["unknown (aaaa1111)", "unknown (bbbb2222)", "1.3.0"]
+    assert dict(zip(history["run"].astype(str), history["buildcost"])) == {
+        "unknown (aaaa1111)": 1500,
+        "unknown (bbbb2222)": 1800,
+        "1.3.0": 2000,
+    }
+
+
+def test_same_fingerprint_replaces_the_previous_run(tmp_path):
+    append_report_history([hero("gondor", "Boromir", 1500), hero("gondor", "Faramir", 1200)], tmp_path, "unknown", FINGERPRINT_A)
+    append_report_history([hero("gondor", "Boromir", 1600)], tmp_path, "unknown", FINGERPRINT_A)
+
+    assert os.listdir(tmp_path) == [f"{FINGERPRINT_A}.parquet"]
+    history = load_history(tmp_path)
+    assert list(history["run"].cat.categories) == ["unknown"]
+    assert history[["hero", "buildcost"]].astype({"hero": str}).values.tolist() == [["Boromir", 1600]]
+
+
+def test_cost_curves_pivot_one_column_per_run(tmp_path):
+    append_report_history(
+        [hero("gondor", "Boromir", 1500), hero("gondor", "Faramir", 1100), hero("mordor", "Gothmog", 1400)],
+        tmp_path,
+        "1.2.0",
+        FINGERPRINT_A,
+    )
+    append_report_history(
+        [hero("gondor", "Boromir", 1700), hero("gondor", "Faramir", 1300), hero("rohan", "Eomer", 1200)],
+        tmp_path,
+        "1.3.0",
+        FINGERPRINT_B,
+    )
+    history = load_history(tmp_path)
+
+    curves = cost_curves(history, "buildcost", "mean")
+    assert list(curves.columns) == ["1.2.0", "1.3.0"]
+    assert list(curves.index) == ["gondor", "mordor", "rohan"]
+    assert curves.loc["gondor"].tolist() == [1300, 1500]
+    assert curves.loc["mordor", "1.2.0"] == 1400 and curves.loc["rohan", "1.3.0"] == 1200
+    assert curves.loc["mordor"].isna().tolist() == [False, True]
+
+    assert cost_curves(history, "buildcost", "max", factions=["GONDOR"]).to_dict("index") == {"gondor": {"1.2.0": 1500, "1.3.0": 1700}}
+    stats = faction_stats(history)
+    assert stats.loc[("1.3.0", "gondor"), "buildcost_count"] == 2
@@ -0,0 +1,37 @@
+import pandas as pd
+from heroes_costs_updater import hero_balance_table
+
+
+def sheet_frames(heroes, tiers):
+    heroes_df = pd.DataFrame(heroes, columns=["Hero Code Name", "HeroTier", "fell_beast_name"])
+    tier_df = pd.DataFrame(tiers, columns=["Tier", "Cost", "Time", "Points"])
+    return heroes_df, tier_df
+
+
+def test_balance_table_with_duplicates_and_missing_tiers(capsys):
+    heroes_df, tier_df = sheet_frames(
+        [
+            ["GondorBoromir", 2, None],
+            ["MordorWitchKing", 3, "MordorFellBeast_WitchKing"],
+            ["GondorBoromir", 1, None],  # duplicate hero: the first row wins
+            ["RohanTheoden", 9, None],  # tier not in the tier table
+        ],
+        [
+            [1, 1000, 30, 10],
+            [2, 1500, 45, 15],
+            [3, 2999, 61, 20],
+            [2, 9900, 99, 99],  # duplicate tier: the first row wins
+        ],
+    )
+
+    table = hero_balance_table(heroes_df, tier_df)
+
+    assert list(table.index) == ["GondorBoromir", "MordorWitchKing"]
+    assert "tier 9 of RohanTheoden is not in the tier table" in capsys.readouterr().out
+    boromir = table.loc["GondorBoromir"]
+    # 75% rounded down to the nearest 100: 1500 -> 1125 -> 1100, 45 s -> 33750 ms -> 33700 ms
+    assert (boromir["tier"], boromir["cost"], boromir["time"], boromir["points"]) == (2, 1500, 45, 15)
+    assert (boromir["respawn_cost"], boromir["respawn_time"]) == (1100, 33700)
+    witch_king = table.loc["MordorWitchKing"]
+    assert (witch_king["respawn_cost"], witch_king["respawn_time"]) == (2200, 45700)
+    assert witch_king["fell_beast_name"] == "MordorFellBeast_WitchKing"
@@ -0,0 +1,72 @@
+from ini_semantic_diff import semantic_diff
+
+GAMEDATA = "#define HERO_COST {cost}\n"
+KNIGHT = "Object GondorKnight\n  KindOf = CAVALRY\n  BuildCost = {cost}\n  BuildTime = 30\nEnd\n"
+CAPTAIN = "ChildObject GondorKnightCaptain GondorKnight\n  KindOf = CAVALRY HERO\nEnd\n"
+HEROES = "Object GondorBoromir\n  KindOf = HERO\n  BuildCost = HERO_COST\n{extra}End\n"
+UNCHANGED = "Object GondorSoldier\n  BuildCost = 100\nEnd\n"
+
+
+def write_ini_tree(root, files):
+    for relative_path, text in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="cp1252")
+    return root
+
+
+def test_added_removed_changed_and_inherited_fields(tmp_path, capsys):
+    old_root = write_ini_tree(
+        tmp_path / "old",
+        {
+            "gamedata.ini": GAMEDATA.format(cost=1500),
+            "object/gondor/knight.ini": KNIGHT.format(cost=1000),
+            "object/gondor/captain.ini": CAPTAIN,
+            "object/gondor/heroes.ini": HEROES.format(extra="  CommandPoints = 10\n"),
+            "object/gondor/soldier.ini": UNCHANGED,
+            "object/rohan/eomer.ini": "Object RohanEomer\n  BuildCost = 1200\nEnd\n",
+        },
+    )
+    new_root = write_ini_tree(
+        tmp_path / "new",
+        {
+            "gamedata.ini": GAMEDATA.format(cost=1800),
+            "object/gondor/knight.ini": KNIGHT.format(cost=1100),
+            "object/gondor/captain.ini": CAPTAIN,  # identical: parsed for the parent's change
+            "object/gondor/heroes.ini": HEROES.format(extra="  BuildTime = 45\n"),
+            "object/gondor/soldier.ini": UNCHANGED,
+            "object/mordor/gothmog.ini": "Object MordorGothmog\n  BuildCost = 1300\nEnd\n",
+        },
+    )
+
+    rows, compared, total = semantic_diff(str(old_root), str(new_root))
+
+    changes = {(row["Object"], row["Field"]): (row["Change"], row["Old Resolved"], row["New Resolved"]) for row in rows}
+    assert changes == {
+        ("GondorBoromir", "BuildCost"): ("changed", "1500", "1800"),  # through the define
+        ("GondorBoromir", "BuildTime"): ("added", "", "45"),
+        ("GondorBoromir", "CommandPoints"): ("removed", "10", ""),
+        ("GondorKnight", "BuildCost"): ("changed", "1000", "1100"),
+        ("GondorKnightCaptain", "BuildCost"): ("inherited", "1000", "1100"),
+        ("MordorGothmog", "BuildCost"): ("added", "", "1300"),
+        ("RohanEomer", "BuildCost"): ("removed", "1200", ""),
+    }
+    captain = next(row for row in rows if row["Object"] == "GondorKnightCaptain")
+    assert (captain["Faction"], captain["Kind"], captain["Old Value"], captain["New Value"]) == ("gondor", "ChildObject", "1000", "1100")
+    # soldier.ini is never parsed
+    assert (compared, total) == (6, 7)
+    assert capsys.readouterr().err == ""
+
+
+def test_unchanged_parent_is_parsed_for_the_inherited_values(tmp_path):
+    knight = KNIGHT.format(cost=1000)
+    old_root = write_ini_tree(tmp_path / "old", {"knight.ini": knight, "captain.ini": CAPTAIN.replace("End\n", "  BuildCost = 1400\nEnd\n"), "soldier.ini": UNCHANGED})
+    new_root = write_ini_tree(tmp_path / "new", {"knight.ini": knight, "captain.ini": CAPTAIN, "soldier.ini": UNCHANGED})
+
+    rows, compared, total = semantic_diff(str(old_root), str(new_root))
+
+    # The captain no longer sets its cost: it inherits the knight's instead of losing it
+    assert [(row["Object"], row["Field"], row["Change"], row["Old Resolved"], row["New Resolved"]) for row in rows] == [
+        ("GondorKnightCaptain", "BuildCost", "changed", "1400", "1000"),
+    ]
+    assert (compared, total) == (2, 3)
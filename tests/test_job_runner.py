@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from rotwk_trowmod_switcher.core.job_runner import (
+    CONFLICT_QUEUE,
+    CONFLICT_REJECT,
+    CONFLICT_REPLACE,
+    JOB_CANCELLED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JobConflictError,
+    JobRunner,
+)
+
+TIMEOUT = 5  # seconds
+
+
+def waiting_job(started, release, order=None, name=None):
+    """Job that waits for the release event, checking its cancellation token meanwhile."""
+
+    def func(progress, cancel_token):
+        started.set()
+        while not release.wait(0.01):
+            cancel_token.raise_if_cancelled()
+        if order is not None:
+            order.append(name)
+        return True
+
+    return func
+
+
+def submit(runner, kind, func, resources=(), conflict_policy=CONFLICT_QUEUE):
+    """Submits a job, returning it with an event set once it is done."""
+    done = threading.Event()
+    job = runner.submit(kind, func, resources, conflict_policy, on_done=lambda job: done.set())
+    return job, done
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = JobRunner(worker_slots=2, history_path=str(tmp_path / "job_history.json"))
+    yield runner
+    runner.shutdown(wait=True)
+
+
+def test_reject_policy_refuses_a_conflicting_job(runner):
+    started, release = threading.Event(), threading.Event()
+    build, build_done = submit(runner, "build", waiting_job(started, release), ["game"])
+    assert started.wait(TIMEOUT)
+
+    with pytest.raises(JobConflictError, match="build #1"):
+        runner.submit("remove", waiting_job(threading.Event(), release), ["game"], CONFLICT_REJECT)
+    # Jobs without a shared resource are accepted
+    other, other_done = submit(runner, "check", lambda progress, cancel_token: True, ["network"], CONFLICT_REJECT)
+
+    release.set()
+    assert build_done.wait(TIMEOUT) and other_done.wait(TIMEOUT)
+    assert (build.status, other.status) == (JOB_SUCCEEDED, JOB_SUCCEEDED)
+
+
+def test_queue_policy_runs_conflicting_jobs_one_after_the_other(runner):
+    order = []
+    build_started, build_release = threading.Event(), threading.Event()
+    remove_started, remove_release = threading.Event(), threading.Event()
+    build, build_done = submit(runner, "build", waiting_job(build_started, build_release, order, "build"), ["game"])
+    assert build_started.wait(TIMEOUT)
+    remove, remove_done = submit(runner, "remove", waiting_job(remove_started, remove_release, order, "remove"), ["game"])
+
+    # A worker slot is free, the shared resource keeps the second job queued
+    assert not remove_started.wait(0.1)
+    assert remove.status == JOB_QUEUED
+    assert [info.job_id for info in runner.queued_jobs()] == [remove.job_id]
+
+    build_release.set()
+    remove_release.set()
+    assert build_done.wait(TIMEOUT) and remove_done.wait(TIMEOUT)
+    assert order == ["build", "remove"]
+
+
+def test_replace_policy_cancels_the_running_and_queued_conflicting_jobs(runner):
+    started, release = threading.Event(), threading.Event()
+    build, build_done = submit(runner, "build", waiting_job(started, release), ["game"])
+    assert started.wait(TIMEOUT)
+    queued, queued_done = submit(runner, "remove", waiting_job(threading.Event(), release), ["game"])
+
+    replacement, replacement_done = submit(runner, "build", lambda progress, cancel_token: True, ["game"], CONFLICT_REPLACE)
+
+    # The queued job is dropped at once, the running one stops at its next check
+    assert queued_done.is_set() and queued.status == JOB_CANCELLED
+    assert build_done.wait(TIMEOUT) and build.status == JOB_CANCELLED
+    assert replacement_done.wait(TIMEOUT) and replacement.status == JOB_SUCCEEDED
+    assert not release.is_set()
+
+
+def test_single_worker_slot_serializes_unrelated_jobs():
+    runner = JobRunner(worker_slots=1)
+    try:
+        first_started, first_release = threading.Event(), threading.Event()
+        second_started, second_release = threading.Event(), threading.Event()
+        first, first_done = submit(runner, "download", waiting_job(first_started, first_release), ["network"])
+        second, second_done = submit(runner, "extract", waiting_job(second_started, second_release), ["disk"])
+        assert first_started.wait(TIMEOUT)
+
+        assert not second_started.wait(0.1)
+        assert (first.status, second.status) == (JOB_RUNNING, JOB_QUEUED)
+
+        first_release.set()
+        assert second_started.wait(TIMEOUT)
+        second_release.set()
+        assert first_done.wait(TIMEOUT) and second_done.wait(TIMEOUT)
+    finally:
+        runner.shutdown(wait=True)
+
+
+def test_duration_history_is_persisted(tmp_path, runner):
+    job, done = submit(runner, "build", lambda progress, cancel_token: True)
+    assert done.wait(TIMEOUT)
+    runner.shutdown(wait=True)
+
+    reloaded = JobRunner(history_path=str(tmp_path / "job_history.json"))
+    records = reloaded.duration_history("build")
+    assert [(record.kind, record.status) for record in records] == [("build", JOB_SUCCEEDED)]
+    assert records[0].duration >= 0
+    assert reloaded.average_duration("build") == records[0].duration
+    assert reloaded.average_duration("remove") is None
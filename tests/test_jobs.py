@@ -0,0 +1,83 @@
+import types
+
+import pytest
+
+from rotwk_trowmod_switcher.core import jobs
+from rotwk_trowmod_switcher.core.jobs import CancellationToken, JobCancelledError, ProgressReporter, raise_if_cancelled
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(jobs, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def test_progress_callbacks_are_throttled(clock):
+    updates = []
+    reporter = ProgressReporter(updates.append)
+    reporter.add_stage("extract", 1.0, "members")
+    reporter.set_total("extract", 100)  # forced
+    assert len(updates) == 1
+
+    reporter.advance("extract")
+    clock.now += jobs.PROGRESS_MIN_INTERVAL / 2
+    reporter.advance("extract")
+    assert len(updates) == 1
+
+    clock.now += jobs.PROGRESS_MIN_INTERVAL
+    reporter.advance("extract")
+    assert len(updates) == 2
+    assert updates[-1].done == 3
+
+    reporter.advance("extract")
+    reporter.finish("extract")  # forced, even right after another update
+    assert len(updates) == 3
+    assert updates[-1].fraction == 1.0
+
+
+def test_eta_extrapolates_the_elapsed_time_over_the_weighted_stages(clock):
+    updates = []
+    reporter = ProgressReporter(updates.append)
+    reporter.add_stage("download", 3.0, "bytes")
+    reporter.add_stage("extract", 1.0, "members")
+    reporter.set_total("download", 1000)
+    assert updates[-1].eta_seconds is None  # nothing done yet
+
+    clock.now += 30
+    reporter.advance("download", 500)
+
+    # Half of the download is 3/8 of the job, done in 30 s: 50 s remaining
+    assert updates[-1].fraction == pytest.approx(0.375)
+    assert updates[-1].eta_seconds == pytest.approx(50.0)
+
+    reporter.finish("download")
+    reporter.finish("extract")
+    assert updates[-1].eta_seconds is None
+
+
+def test_cancel_raises_at_the_next_checkpoint():
+    token = CancellationToken()
+    processed = []
+
+    with pytest.raises(JobCancelledError):
+        for item in range(10):
+            raise_if_cancelled(token)
+            processed.append(item)
+            if item == 3:
+                token.cancel()
+
+    assert token.cancelled
+    assert processed == [0, 1, 2, 3]
+
+
+def test_no_token_never_cancels():
+    raise_if_cancelled(None)
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from rotwk_trowmod_switcher.core.big_archiver.load_order import analyze_load_order, list_game_archives
+
+
+@pytest.fixture
+def game(tmp_path, make_big_archive):
+    game_path = tmp_path / "game"
+    # "!!" sorts before "!TROWMOD", "ini.big" after it
+    make_big_archive(game_path / "!!patch.big", {"data\\ini\\shadowed.ini": b"patch"})
+    make_big_archive(game_path / "!TROWMOD_INI.big", {"data\\ini\\shadowed.ini": b"mod", "data\\ini\\Override.ini": b"mod", "data\\ini\\only_mod.ini": b"mod"})
+    make_big_archive(game_path / "ini.big", {"data\\ini\\override.ini": b"base", "data\\ini\\base.ini": b"base"})
+    make_big_archive(game_path / "lang" / "English.big", {"data\\lotr.str": b"base"})
+    return game_path
+
+
+def test_archives_are_listed_in_load_order(game):
+    assert list_game_archives(str(game)) == ["!!patch.big", "!TROWMOD_INI.big", "lang/English.big", "ini.big"]
+
+
+def test_first_archive_providing_a_path_wins(game):
+    report = analyze_load_order(str(game))
+
+    assert report.mod_archives == ["!TROWMOD_INI.big"]
+    assert report.providers["data\\ini\\shadowed.ini"] == ["!!patch.big", "!TROWMOD_INI.big"]
+    assert report.providers["data\\ini\\override.ini"] == ["!TROWMOD_INI.big", "ini.big"]
+    assert report.shadowed == {"data\\ini\\shadowed.ini": "!!patch.big"}
+    assert report.overrides == {"data\\ini\\override.ini": ["ini.big"]}
+
+
+def test_cached_entry_lists_are_reread_when_an_archive_changes(tmp_path, game, make_big_archive):
+    index_path = str(tmp_path / "load_order_index.json")
+    assert analyze_load_order(str(game), index_path=index_path).reindexed == 4
+    assert analyze_load_order(str(game), index_path=index_path).reindexed == 0
+
+    # Size change
+    make_big_archive(game / "ini.big", {"data\\ini\\override.ini": b"base", "data\\ini\\base.ini": b"base", "data\\ini\\new.ini": b"new"})
+    report = analyze_load_order(str(game), index_path=index_path)
+    assert report.reindexed == 1
+    assert report.providers["data\\ini\\new.ini"] == ["ini.big"]
+
+    # Same size, newer mtime
+    patch = game / "!!patch.big"
+    stat = os.stat(patch)
+    os.utime(patch, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert analyze_load_order(str(game), index_path=index_path).reindexed == 1
+    assert analyze_load_order(str(game), index_path=index_path).reindexed == 0
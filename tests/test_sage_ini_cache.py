@@ -0,0 +1,75 @@
+import os
+
+import pytest
+from sage_ini import cache as cache_module
+from sage_ini.cache import ParseCache, load_summaries
+
+SOLDIER = b"Object GondorSoldier\n  BuildCost = 100\nEnd\n"
+
+
+@pytest.fixture
+def ini_file(tmp_path):
+    path = tmp_path / "soldier.ini"
+    path.write_bytes(SOLDIER)
+    return str(path)
+
+
+def cached_lookup(db_path, path):
+    """(hits, misses) of a fresh ParseCache on the database, then fills it like a scan would."""
+    with ParseCache(db_path) as cache:
+        summaries = load_summaries([path], cache)
+        assert [o.name for o in summaries[path].objects] == ["GondorSoldier"]
+        return cache.hits, cache.misses
+
+
+def touch(path, ns=1_000_000_000):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + ns))
+
+
+def test_unchanged_file_is_a_hit(tmp_path, ini_file):
+    db_path = str(tmp_path / "cache.sqlite")
+
+    assert cached_lookup(db_path, ini_file) == (0, 1)
+    assert cached_lookup(db_path, ini_file) == (1, 0)
+
+
+def test_new_mtime_with_the_same_content_is_a_hit_through_the_digest(tmp_path, ini_file):
+    db_path = str(tmp_path / "cache.sqlite")
+    cached_lookup(db_path, ini_file)
+
+    touch(ini_file)
+    assert cached_lookup(db_path, ini_file) == (1, 0)
+    # The new mtime was recorded: no digest needed next time
+    with ParseCache(db_path) as cache:
+        assert cache.connection.execute("SELECT mtime_ns FROM files").fetchone()[0] == os.stat(ini_file).st_mtime_ns
+
+
+@pytest.mark.parametrize(
+    "build_cost",
+    [
+        pytest.param("1000", id="size"),
+        pytest.param("200", id="mtime"),
+    ],
+)
+def test_changed_file_is_a_miss(tmp_path, ini_file, build_cost):
+    db_path = str(tmp_path / "cache.sqlite")
+    cached_lookup(db_path, ini_file)
+
+    with open(ini_file, "wb") as f:
+        f.write(SOLDIER.replace(b"100", build_cost.encode()))
+    touch(ini_file)
+    assert cached_lookup(db_path, ini_file) == (0, 1)
+
+    with ParseCache(db_path) as cache:
+        hits, _ = cache.lookup([ini_file])
+        assert hits[ini_file].objects[0].first("BuildCost") == build_cost
+
+
+def test_schema_version_change_drops_the_entries(tmp_path, ini_file, monkeypatch):
+    db_path = str(tmp_path / "cache.sqlite")
+    cached_lookup(db_path, ini_file)
+
+    monkeypatch.setattr(cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1)
+    assert cached_lookup(db_path, ini_file) == (0, 1)
+    assert cached_lookup(db_path, ini_file) == (1, 0)
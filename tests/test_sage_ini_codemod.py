@@ -0,0 +1,86 @@
+import os
+
+import pytest
+from sage_ini import codemod as codemod_module
+from sage_ini.codemod import Codemod, CodemodError
+
+HERO = "Object Hero\n  BuildCost = 1000\n  BuildTime = 30\nEnd\n"
+
+
+@pytest.fixture
+def hero_files(tmp_path):
+    paths = []
+    for name in ("a_hero.ini", "b_hero.ini", "c_hero.ini"):
+        path = tmp_path / name
+        path.write_text(HERO, encoding="cp1252")
+        paths.append(str(path))
+    return paths
+
+
+def field_span(ini, key):
+    return ini.objects[0].get(key).value_span
+
+
+def test_conflicting_replacements_are_rejected(hero_files):
+    codemod = Codemod()
+    span = field_span(codemod.load(hero_files[0]), "BuildCost")
+    codemod.replace(hero_files[0], span, "TIER_1_HERO_BUILDCOST")
+    codemod.replace(hero_files[0], span, "TIER_1_HERO_BUILDCOST")  # the same edit twice is fine
+
+    with pytest.raises(CodemodError, match="conflicting edits"):
+        codemod.replace(hero_files[0], span, "TIER_2_HERO_BUILDCOST")
+
+
+def test_file_changed_on_disk_after_load_is_not_written(hero_files):
+    codemod = Codemod()
+    for path in hero_files:
+        codemod.replace(path, field_span(codemod.load(path), "BuildCost"), "2000")
+    with open(hero_files[1], "a", encoding="cp1252") as f:
+        f.write("; edited meanwhile\n")
+
+    with pytest.raises(CodemodError, match="changed on disk"):
+        codemod.commit()
+    assert [open(path, encoding="cp1252").read() for path in (hero_files[0], hero_files[2])] == [HERO, HERO]
+
+
+def test_failed_rename_restores_the_replaced_files(hero_files, monkeypatch):
+    codemod = Codemod()
+    for path in hero_files:
+        codemod.replace(path, field_span(codemod.load(path), "BuildCost"), "2000")
+
+    real_replace = os.replace
+    renames = []
+
+    def failing_replace(source, destination):
+        # The third file's rename fails after the first two originals were replaced
+        if destination == hero_files[2] and source.endswith(".tmp"):
+            raise PermissionError("file in use")
+        renames.append(destination)
+        real_replace(source, destination)
+
+    monkeypatch.setattr(codemod_module.os, "replace", failing_replace)
+    with pytest.raises(PermissionError):
+        codemod.commit()
+
+    assert renames[:2] == hero_files[:2]
+    assert [open(path, encoding="cp1252").read() for path in hero_files] == [HERO, HERO, HERO]
+    assert [name for name in os.listdir(os.path.dirname(hero_files[0])) if name.endswith(".tmp")] == []
+
+
+def test_commit_forgets_every_edited_file(hero_files):
+    codemod = Codemod()
+    changed, unchanged = hero_files[:2]
+    codemod.replace(changed, field_span(codemod.load(changed), "BuildCost"), "2000")
+    # Replaces a value by the same text: no change to write
+    codemod.replace(unchanged, field_span(codemod.load(unchanged), "BuildCost"), "1000")
+
+    assert codemod.commit() == [changed]
+    assert "BuildCost = 2000" in open(changed, encoding="cp1252").read()
+
+    # Both files were edited outside the codemod since: later edits start from the new text
+    for path in (changed, unchanged):
+        with open(path, "a", encoding="cp1252") as f:
+            f.write("; edited after the commit\n")
+    codemod.replace(unchanged, field_span(codemod.load(unchanged), "BuildTime"), "45")
+    assert codemod.commit() == [unchanged]
+    assert open(unchanged, encoding="cp1252").read() == HERO.replace("30", "45") + "; edited after the commit\n"
@@ -0,0 +1,76 @@
+import pytest
+from sage_ini.defines import DefineError, DefineResolver
+
+
+def write_ini_tree(root, files):
+    for relative_path, text in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="cp1252")
+
+
+def test_define_chain_across_an_include(tmp_path):
+    write_ini_tree(
+        tmp_path,
+        {
+            "gamedata.ini": '#include "includes\\costs.inc"\n#define HERO_TIER_2_COST #MULTIPLY( HERO_BASE_COST 1.5 )\n',
+            "includes/costs.inc": "#define HERO_BASE_COST 1000\n",
+            "object/hero.ini": "#define HERO_TIER_2_REVIVE #SUBTRACT( HERO_TIER_2_COST #DIVIDE( HERO_BASE_COST 4 ) )\nObject Hero\nEnd\n",
+        },
+    )
+    resolver = DefineResolver.from_tree(tmp_path)
+
+    assert resolver.errors == []
+    assert resolver.value("HERO_TIER_2_REVIVE") == 1250
+    assert resolver.origin("HERO_BASE_COST") == str(tmp_path / "includes" / "costs.inc")
+    assert str(tmp_path / "includes" / "costs.inc") in resolver.files
+
+
+@pytest.mark.parametrize(
+    "defines",
+    [
+        pytest.param("#define A #ADD( B 1 )\n#define B #ADD( A 1 )\n", id="two-defines"),
+        pytest.param("#define A #ADD( A 1 )\n", id="self-reference"),
+    ],
+)
+def test_define_cycle_is_a_define_error(tmp_path, defines):
+    write_ini_tree(tmp_path, {"gamedata.ini": defines})
+    resolver = DefineResolver.from_tree(tmp_path)
+
+    with pytest.raises(DefineError, match="Define cycle: A -> "):
+        resolver.value("A")
+    assert resolver.warm_up()
+
+
+def test_include_cycle_is_reported(tmp_path):
+    write_ini_tree(tmp_path, {"gamedata.ini": '#include "other.inc"\n#define A 1\n', "other.inc": '#include "gamedata.ini"\n#define B 2\n'})
+    resolver = DefineResolver.from_tree(tmp_path)
+
+    assert resolver.errors == [f"{tmp_path / 'gamedata.ini'}: #include cycle"]
+    assert (resolver.value("A"), resolver.value("B")) == (1, 2)
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [
+        ("#ADD( BASE 250 )", 1250),
+        ("#SUBTRACT( BASE 250 )", 750),
+        ("#MULTIPLY( BASE 1.5 )", 1500),
+        ("#DIVIDE( BASE 8 )", 125),
+    ],
+)
+def test_macros(tmp_path, expression, expected):
+    write_ini_tree(tmp_path, {"gamedata.ini": f"#define BASE 1000\n#define VALUE {expression}\n"})
+    resolver = DefineResolver.from_tree(tmp_path)
+
+    assert resolver.value("VALUE") == expected
+    assert resolver.evaluate(expression) == expected
+
+
+def test_malformed_macros_are_define_errors(tmp_path):
+    write_ini_tree(tmp_path, {"gamedata.ini": "#define BASE 1000\n"})
+    resolver = DefineResolver.from_tree(tmp_path)
+
+    for expression, message in [("#DIVIDE( BASE 0 )", "Division by zero"), ("#ADD( BASE )", "takes 2 arguments"), ("#POWER( BASE 2 )", "Unknown macro")]:
+        with pytest.raises(DefineError, match=message):
+            resolver.evaluate(expression)
@@ -0,0 +1,79 @@
+from sage_ini.objects import ObjectGraph
+from sage_ini.parser import parse_ini_text
+from sage_ini.summary import summarize_ini
+
+UNITS = """\
+Object GondorKnight
+  KindOf = CAVALRY
+  BuildCost = 1000
+  BuildTime = 30
+End
+
+ChildObject GondorKnightCaptain GondorKnight
+  KindOf = CAVALRY HERO
+  BuildCost = 1500
+End
+
+ObjectReskin GondorKnightWinter GondorKnightCaptain
+End
+
+ChildObject GondorKnightVeteran GondorKnight
+  BuildTime = 45
+End
+"""
+
+BROKEN = """\
+ChildObject Orphan MissingParent
+  BuildCost = 10
+End
+
+ChildObject LoopA LoopB
+End
+
+ChildObject LoopB LoopA
+  BuildTime = 5
+End
+"""
+
+
+def object_graph(files):
+    return ObjectGraph({path: summarize_ini(parse_ini_text(text, path)) for path, text in files.items()})
+
+
+def test_fields_are_inherited_through_child_objects_and_reskins():
+    graph = object_graph({"units.ini": UNITS})
+
+    assert graph.errors == []
+    assert graph.effective_first("GondorKnightWinter", "BuildCost") == "1500"
+    assert graph.effective_field("GondorKnightWinter", "BuildCost").owner.name == "GondorKnightCaptain"
+    assert graph.effective_first("GondorKnightWinter", "BuildTime") == "30"
+    assert graph.effective_first("GondorKnightVeteran", "BuildTime") == "45"
+    assert graph.effective_field("GondorKnightWinter", "RespawnRules") is None
+    assert [graph.is_hero(name) for name in ("GondorKnight", "GondorKnightCaptain", "GondorKnightWinter")] == [False, True, True]
+    assert [ref.name for ref in graph.ancestors("GondorKnightWinter")] == ["GondorKnightCaptain", "GondorKnight"]
+    assert [ref.name for ref in graph.descendants("GondorKnight")] == ["GondorKnightCaptain", "GondorKnightWinter", "GondorKnightVeteran"]
+
+
+def test_resolutions_are_memoized_and_shared_with_the_parent():
+    graph = object_graph({"units.ini": UNITS})
+
+    build_time = graph.effective_field("GondorKnightWinter", "BuildTime")
+    # The child resolved through the parent's own entry: every object gets the same result
+    assert graph.effective_field("GondorKnightCaptain", "BuildTime") is build_time
+    assert graph.effective_field("GondorKnight", "BuildTime") is build_time
+    assert graph.effective_field("GondorKnightWinter", "BuildTime") is build_time
+
+
+def test_missing_parents_and_parent_cycles_are_reported():
+    graph = object_graph({"units.ini": UNITS, "broken.ini": BROKEN})
+
+    assert graph.errors == [
+        "broken.ini:1: parent MissingParent of Orphan not found",
+        "broken.ini:5: parent cycle LoopA -> LoopB -> LoopA",
+        "broken.ini:8: parent cycle LoopB -> LoopA -> LoopB",
+    ]
+    assert graph.effective_first("Orphan", "BuildCost") == "10"
+    assert graph.effective_field("Orphan", "BuildTime") is None
+    assert graph.effective_first("LoopA", "BuildTime") == "5"
+    assert graph.effective_field("LoopA", "BuildCost") is None
+    assert list(graph.ancestors("LoopA")) == [graph.get("LoopB")]
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from sage_ini.parser import parse_ini_file, parse_ini_text
+from sage_ini.summary import summarize_ini
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ini"
+BOROMIR = FIXTURES / "object" / "goodfaction" / "units" / "gondor" / "boromir.ini"
+
+
+def ini_text(block):
+    return BOROMIR.read_text(encoding="cp1252")[block.span[0] : block.span[1]]
+
+
+def test_scripted_model_draw_hero_parses_without_errors():
+    ini = parse_ini_file(BOROMIR)
+
+    assert ini.errors == []
+    assert [block.name for block in ini.objects] == ["GondorBoromir"]
+    hero = ini.objects[0]
+    assert hero.get("BuildCost").value == "TIER_2_HERO_BUILDCOST"
+    assert hero.get("KindOf").tokens[-1] == "HERO"
+    assert hero.find_field("RespawnRules") is not None
+
+
+def test_animation_blocks_and_scripts_stay_inside_the_draw_module():
+    hero = parse_ini_file(BOROMIR).objects[0]
+    draw = next(hero.find_blocks("Draw", "W3DScriptedModelDraw"))
+
+    assert [block.kind for block in draw.blocks] == ["DefaultModelConditionState", "IdleAnimationState", "AnimationState", "AnimationState"]
+    idle = draw.blocks[1]
+    assert [block.args for block in idle.find_blocks("Animation")] == [["Idle01"], ["Idle02"]]
+    assert idle.get("StateName").value == "STATE_Idle"
+    # The Lua lines are not fields, and their `end`s close nothing
+    script = next(idle.find_blocks("BeginScript"))
+    assert script.fields == [] and script.blocks == []
+    assert ini_text(script).rstrip().endswith("EndScript")
+
+
+def test_summary_keeps_the_hero_fields():
+    summary = summarize_ini(parse_ini_file(BOROMIR))
+
+    (hero,) = summary.objects
+    assert summary.errors == []
+    assert hero.is_hero
+    assert hero.first("BuildCost") == "TIER_2_HERO_BUILDCOST"
+    assert hero.first("CommandPoints") == "10"
+    assert hero.respawn_rules
+
+
+def test_unclosed_script_is_reported():
+    ini = parse_ini_text("Object A\n  Draw = W3DScriptedModelDraw ModuleTag_Draw\n    BeginScript\n      x = 1\n  End\nEnd\n", "a.ini")
+
+    assert any("EndScript" in error for error in ini.errors)
@@ -0,0 +1,65 @@
+import pytest
+from sage_ini.defines import DIRECTIVE_BYTES
+from sage_ini.heroes import HERO_BYTES, RESPAWN_RULES_BYTES
+from sage_ini.parser import iter_ini_files
+from sage_ini.scanner import scan_ini_files
+
+HERO_PREFILTERS = (HERO_BYTES, RESPAWN_RULES_BYTES)
+
+
+def hero_files(summaries):
+    """Files where the full parser finds a hero with respawn rules, as heroes_build_report selects them."""
+    return {path for path, summary in summaries.items() if any(obj.is_hero and obj.respawn_rules for obj in summary.objects)}
+
+
+def directive_files(summaries):
+    return {path for path, summary in summaries.items() if summary.defines or summary.includes}
+
+
+def scan_with_and_without(tmp_path, files, prefilters):
+    for name, data in files.items():
+        (tmp_path / name).write_bytes(data)
+    paths = iter_ini_files(tmp_path)
+    return scan_ini_files(paths, workers=1), scan_ini_files(paths, workers=1, prefilters=prefilters)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"Object A\n  KindOf = INFANTRY hero\n  respawnrules = AUTO_BY_LEVEL:1 1000\nEnd\n", id="other-case"),
+        pytest.param(b"Object A\n  KindOf = HERO\n  RespawnRules = DEFAULT\n  DisplayName = OBJECT:Th\xe9oden\n  Body = X \x81\x8d\nEnd\n", id="not-utf8"),
+        pytest.param(b"Object A\n\tKindOf\t=\tHERO\t; RespawnRules in a comment\n\tRespawnRules=DEFAULT\nEnd\n", id="tabs-and-comment"),
+    ],
+)
+def test_hero_prefilters_keep_every_hero_file(tmp_path, data):
+    full, prefiltered = scan_with_and_without(tmp_path, {"hero.ini": data}, HERO_PREFILTERS)
+
+    assert hero_files(full) == {str(tmp_path / "hero.ini")}
+    assert hero_files(full) <= set(prefiltered)
+
+
+def test_keywords_only_in_comments_are_kept_by_the_prefilter_and_dropped_by_the_parser(tmp_path):
+    # The prefilter only has to be a superset: the parser sees the comments are not fields
+    files = {"comment.ini": b"Object A\n  KindOf = INFANTRY ; was a HERO\n  ; RespawnRules = DEFAULT\nEnd\n"}
+    full, prefiltered = scan_with_and_without(tmp_path, files, HERO_PREFILTERS)
+
+    assert set(prefiltered) == {str(tmp_path / "comment.ini")}
+    assert hero_files(full) == hero_files(prefiltered) == set()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"#DEFINE HERO_COST 1000\n", id="other-case"),
+        pytest.param(b"  \t#define HERO_COST 1000\n", id="indented"),
+        pytest.param(b"# define HERO_COST 1000\n", id="space-after-hash"),
+        pytest.param(b"\xa0#\xa0define HERO_COST 1000\n", id="no-break-space"),
+        pytest.param(b'#include "costs.inc"\n', id="include"),
+        pytest.param(b"; \xe9\xe8\x81\n#define HERO_COST 1000\n", id="not-utf8"),
+    ],
+)
+def test_directive_prefilter_keeps_every_define_file(tmp_path, data):
+    full, prefiltered = scan_with_and_without(tmp_path, {"gamedata.ini": data}, (DIRECTIVE_BYTES,))
+
+    assert directive_files(full) == {str(tmp_path / "gamedata.ini")}
+    assert directive_files(full) <= set(prefiltered)
@@ -0,0 +1,33 @@
+from sage_ini import scanner
+from sage_ini.parser import iter_ini_files
+from sage_ini.scanner import scan_ini_files
+
+
+def write_units(root, count):
+    for index in range(count):
+        folder = root / f"faction{index % 3}"
+        folder.mkdir(exist_ok=True)
+        (folder / f"unit{index:02d}.ini").write_text(
+            f"Object Unit{index}\n  KindOf = INFANTRY{' HERO' if index % 4 == 0 else ''}\n  BuildCost = {100 + index}\nEnd\n"
+            + ("Object Broken\n  BuildCost = 1\n" if index == 5 else ""),
+            encoding="cp1252",
+        )
+
+
+def as_dicts(summaries):
+    return {path: summary.as_dict() for path, summary in summaries.items()}
+
+
+def test_process_pool_and_serial_scans_give_the_same_summaries(tmp_path, monkeypatch):
+    write_units(tmp_path, 20)
+    paths = iter_ini_files(tmp_path)
+    # Start the pool for a small tree, with several batches per worker
+    monkeypatch.setattr(scanner, "PROCESS_POOL_MIN_FILES", 1)
+
+    serial = scan_ini_files(paths, workers=1, batch_size=3)
+    pooled = scan_ini_files(paths, workers=2, batch_size=3)
+
+    assert list(pooled) == list(serial) == paths
+    assert as_dicts(pooled) == as_dicts(serial)
+    # The unterminated object of unit05.ini is reported the same way
+    assert [path for path, summary in serial.items() if summary.errors] == [str(tmp_path / "faction2" / "unit05.ini")]
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from rotwk_trowmod_switcher.core.big_archiver.load_order import analyze_load_order
+from rotwk_trowmod_switcher.core.big_archiver.vanilla_index import VanillaIndex
+
+
+@pytest.fixture
+def game(tmp_path, make_big_archive):
+    game_path = tmp_path / "game"
+    make_big_archive(game_path / "ini.big", {"data\\ini\\same.ini": b"Object A\nEnd\n", "data\\ini\\changed.ini": b"Object B\nEnd\n"})
+    make_big_archive(game_path / "!TROWMOD_INI.big", {"data\\ini\\same.ini": b"Object A\nEnd\n"})
+    return game_path
+
+
+@pytest.fixture
+def mod_files(tmp_path):
+    files = {"same.ini": b"Object A\nEnd\n", "changed.ini": b"Object C\nEnd\n", "new.ini": b"Object N\nEnd\n"}
+    mod_dir = tmp_path / "mod"
+    mod_dir.mkdir()
+    for name, data in files.items():
+        (mod_dir / name).write_bytes(data)
+    return [(str(mod_dir / name), f"data\\ini\\{name}") for name in files]
+
+
+def test_only_files_identical_to_the_base_game_are_skipped(game, mod_files):
+    index = VanillaIndex(str(game))
+    try:
+        kept = index.filter_files(mod_files)
+    finally:
+        index.close()
+
+    # changed.ini has the size of the base game entry but other bytes, new.ini is not in the base game
+    assert [name for _, name in kept] == ["data\\ini\\changed.ini", "data\\ini\\new.ini"]
+
+
+def test_vanilla_index_leaves_the_load_order_index_alone(tmp_path, game, mod_files):
+    load_order_index = tmp_path / "load_order_index.json"
+    analyze_load_order(str(game), index_path=str(load_order_index))
+    before = json.loads(load_order_index.read_text())
+
+    index = VanillaIndex(str(game), index_path=str(tmp_path / "vanilla_archive_index.json"))
+    index.close()
+
+    assert json.loads(load_order_index.read_text()) == before
+    assert any(key.endswith("!trowmod_ini.big") for key in before["archives"])
+    assert analyze_load_order(str(game), index_path=str(load_order_index)).reindexed == 0